@@ -18,6 +18,9 @@ echo "Starting up Gunicorn server for Django"
 cd /dcsp/app/dcsp
 gunicorn -c gunicorn_config_dev.py &
 
+echo "Starting up the build worker"
+python3 manage.py build_worker &
+
 echo "Gunicorn running. PID_1.sh on loop"
 
 while :
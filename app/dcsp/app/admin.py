@@ -5,18 +5,27 @@
 # mypy: disable-error-code="type-arg"
 # TODO - need to type these
 
+from typing import Any
+
 from django.contrib import admin
 from .models import (
     UserProfile,
     Project,
     ProjectGroup,
     UserProjectAttribute,
+    BuildJob,
+    BuildRun,
+    BuildRunStatus,
+    ProjectAccess,
 )
 from django.contrib.auth.admin import (
     UserAdmin as BaseUserAdmin,
 )
 from django.contrib.auth.models import User
 from django import forms
+from django.db.models import Avg, Count, Max, Q, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.utils.html import format_html
 from django.forms.widgets import TextInput
 
 admin.site.unregister(User)  # Necessary
@@ -46,3 +55,124 @@ admin.site.register(Project, ProjectAdmin)
 admin.site.register(ProjectGroup)
 
 admin.site.register(UserProjectAttribute)
+
+admin.site.register(BuildJob)
+
+
+@admin.register(ProjectAccess)
+class ProjectAccessAdmin(admin.ModelAdmin):
+    """Derived from projects and groups, so read only"""
+
+    list_display = ("user", "project", "via")
+    list_filter = ("via",)
+    search_fields = ("user__username", "project__name")
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: object = None
+    ) -> bool:
+        return False
+
+    def has_delete_permission(
+        self, request: HttpRequest, obj: object = None
+    ) -> bool:
+        return False
+
+
+@admin.register(BuildRun)
+class BuildRunAdmin(admin.ModelAdmin):
+    """Build runs, with build time trends per project
+
+    The change list is headed by a summary per project of the runs shown, so
+    filtering (eg by date) shows how a project's builds are trending.
+    """
+
+    list_display = [
+        "project",
+        "started",
+        "status",
+        "incremental",
+        "total_seconds",
+        "docstrings_seconds",
+        "preprocessor_seconds",
+        "mkdocs_seconds",
+        "publish_seconds",
+        "files_scanned",
+        "pages_written",
+        "peak_rss_kb",
+    ]
+    list_filter = ["status", "incremental", "project"]
+    date_hierarchy = "started"
+    exclude = ["log_compressed"]
+    readonly_fields = [
+        "project",
+        "started",
+        "status",
+        "incremental",
+        "total_seconds",
+        "docstrings_seconds",
+        "preprocessor_seconds",
+        "mkdocs_seconds",
+        "publish_seconds",
+        "files_scanned",
+        "pages_written",
+        "peak_rss_kb",
+        "log",
+    ]
+
+    def log(self, build_run: BuildRun) -> str:
+        return format_html("<pre>{}</pre>", build_run.log_get())
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def trends(
+        self, build_runs: QuerySet[BuildRun]
+    ) -> QuerySet[BuildRun, dict[str, Any]]:
+        """Summarises build runs per project, slowest first
+
+        Args:
+            build_runs (QuerySet[BuildRun]): the build runs to summarise.
+
+        Returns:
+            QuerySet[BuildRun, dict[str, Any]]: a row of averages and maximums
+                                                per project.
+        """
+        trends: QuerySet[BuildRun, dict[str, Any]] = (
+            build_runs.order_by()
+            .values("project__id", "project__name")
+            .annotate(
+                runs=Count("id"),
+                failures=Count(
+                    "id", filter=~Q(status=BuildRunStatus.SUCCEEDED)
+                ),
+                total_average=Avg("total_seconds"),
+                total_maximum=Max("total_seconds"),
+                docstrings_average=Avg("docstrings_seconds"),
+                preprocessor_average=Avg("preprocessor_seconds"),
+                mkdocs_average=Avg("mkdocs_seconds"),
+                publish_average=Avg("publish_seconds"),
+                pages_average=Avg("pages_written"),
+                peak_rss_maximum=Max("peak_rss_kb"),
+            )
+            .order_by("-total_average")
+        )
+
+        return trends
+
+    def changelist_view(
+        self, request: HttpRequest, extra_context: dict | None = None
+    ) -> HttpResponse:
+        response = super().changelist_view(request, extra_context)
+
+        # Not a TemplateResponse if redirected, eg after a bulk action
+        if hasattr(response, "context_data") and "cl" in (
+            response.context_data or {}
+        ):
+            response.context_data["trends"] = self.trends(
+                response.context_data["cl"].queryset
+            )
+
+        return response
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):  # type: ignore[no-redef]
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self) -> None:
+        import app.signals  # noqa: F401
+
+        return
@@ -3,7 +3,7 @@ Decorators for views.
 """
 
 from fnmatch import fnmatch
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 from functools import wraps
 from pathlib import Path
 
@@ -21,6 +21,7 @@ from .models import (
 )
 
 from app.functions.project_builder import ProjectBuilder
+from app.functions.access_control import can_access
 import app.functions.constants as c
 import app.views as views
 
@@ -30,7 +31,7 @@ def _project_access(
 ) -> tuple[bool, HttpResponse, int, int]:
     """Wrapper around page views"""
     project_id_int: int = 0
-    projects: list[dict[str, Any]] = []
+    project: Optional[Project] = None
     context: dict[str, Any] = {}
     project_builder: ProjectBuilder
     project_config: dict[str, Any] = {}
@@ -55,7 +56,9 @@ def _project_access(
 
     project_id_int = int(project_id)
 
-    if not Project.objects.filter(id=project_id_int).exists():
+    project = Project.objects.filter(id=project_id_int).first()
+
+    if project is None:
         messages.error(request, f"'Project { project_id }' does not exist")
         return (
             False,
@@ -64,9 +67,7 @@ def _project_access(
             0,
         )
 
-    projects = views.user_accessible_projects(request)
-
-    if not any(project["doc_id"] == project_id_int for project in projects):
+    if not can_access(request.user, project):
         messages.error(request, "You do not have access to this project!")
         return (
             False,
@@ -75,6 +76,9 @@ def _project_access(
             0,
         )
 
+    # So the view need not load it again (see request_project)
+    request.project = project  # type: ignore[attr-defined]
+
     project_builder = ProjectBuilder(project_id_int)
     project_config = project_builder.configuration_get()
     setup_step = project_config["setup_step"]
@@ -105,6 +109,24 @@ def _project_access(
     )
 
 
+def request_project(request: HttpRequest, project_id: int) -> Project:
+    """Returns the project of a view decorated with project_access
+
+    Args:
+        request (HttpRequest): the request
+        project_id (int): database primary key for project.
+
+    Returns:
+        Project: the project loaded by project_access, else from the database.
+    """
+    project: Optional[Project] = getattr(request, "project", None)
+
+    if project is None or project.id != project_id:
+        project = Project.objects.get(id=project_id)
+
+    return project
+
+
 # Rest of the code...
 def project_access(
     func: (
@@ -0,0 +1,116 @@
+"""Access of users to projects
+
+Resolves if a user may see and edit a project from the ProjectAccess table,
+in a single index lookup. The table is updated by signals (see app.signals)
+when an owner, member or group changes. Answers are only cached on the user
+object, so for the request it belongs to (as Django caches permissions), as
+there is no cache shared by all the processes that could be invalidated when
+access changes.
+
+functions:
+    can_access: checks if a user is the owner or a member of a project, or a
+                member of a group with access to it.
+    access_table_refresh: rebuilds the ProjectAccess rows of projects.
+"""
+
+from typing import Any, Iterable, Optional
+
+from django.db import transaction
+
+from app.models import AccessVia, Project, ProjectAccess, ProjectGroup
+
+
+def can_access(user: Any, project: Project) -> bool:
+    """Checks if a user has access to a project
+
+    Args:
+        user (Any): the user, which may be anonymous.
+        project (Project): the project.
+
+    Returns:
+        bool: True if the user is the owner or a member of the project, or a
+              member of a group with access to it.
+    """
+    answers: dict[int, bool] = {}
+    allowed: Optional[bool] = None
+
+    if not user.is_authenticated:
+        return False
+
+    if project.owner_id == user.id:
+        return True
+
+    if not hasattr(user, "_can_access_cache"):
+        user._can_access_cache = {}
+    answers = user._can_access_cache
+    allowed = answers.get(project.id)
+
+    if allowed is None:
+        allowed = ProjectAccess.objects.filter(
+            user_id=user.id, project_id=project.id
+        ).exists()
+        answers[project.id] = allowed
+
+    return allowed
+
+
+def access_table_refresh(project_ids: Optional[Iterable[int]] = None) -> int:
+    """Rebuilds the ProjectAccess rows of projects
+
+    Args:
+        project_ids (Optional[Iterable[int]]): primary keys of the projects.
+                                               None rebuilds the whole table.
+
+    Returns:
+        int: the number of rows written.
+    """
+    ids: list[int] = []
+    rows: set[tuple[int, int, str]] = set()
+    group_projects: dict[int, list[int]] = {}
+    user_id: int = 0
+    project_id: int = 0
+    group_id: int = 0
+
+    if project_ids is None:
+        ids = list(Project.objects.values_list("id", flat=True))
+    else:
+        ids = sorted(set(project_ids))
+
+    for user_id, project_id in Project.objects.filter(id__in=ids).values_list(
+        "owner_id", "id"
+    ):
+        rows.add((user_id, project_id, AccessVia.OWNER))
+
+    for user_id, project_id in Project.member.through.objects.filter(
+        project_id__in=ids
+    ).values_list("user_id", "project_id"):
+        rows.add((user_id, project_id, AccessVia.MEMBER))
+
+    for (
+        group_id,
+        project_id,
+    ) in ProjectGroup.project_access.through.objects.filter(
+        project_id__in=ids
+    ).values_list(
+        "projectgroup_id", "project_id"
+    ):
+        group_projects.setdefault(group_id, []).append(project_id)
+
+    for group_id, user_id in ProjectGroup.member.through.objects.filter(
+        projectgroup_id__in=group_projects
+    ).values_list("projectgroup_id", "user_id"):
+        for project_id in group_projects[group_id]:
+            rows.add((user_id, project_id, AccessVia.GROUP))
+
+    with transaction.atomic():
+        if project_ids is None:
+            ProjectAccess.objects.all().delete()
+        else:
+            ProjectAccess.objects.filter(project_id__in=ids).delete()
+
+        ProjectAccess.objects.bulk_create(
+            ProjectAccess(user_id=user_id, project_id=project_id, via=via)
+            for user_id, project_id, via in sorted(rows)
+        )
+
+    return len(rows)
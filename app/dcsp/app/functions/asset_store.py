@@ -0,0 +1,173 @@
+"""Content-addressed store of files shared between built sites
+
+Every project's site includes the same theme CSS, JavaScript, fonts and
+icons. After a build, each such file is hardlinked to a single copy in a
+store keyed by its sha256 hash, so identical files take disk space (and page
+cache) once across all projects.
+
+Sites are always built into a fresh staging folder (see SitePublisher), and
+incremental builds start from a copy of the live site, so a build never
+writes into a linked file. The store must be on the same file system as the
+sites, as hardlinks cannot cross file systems.
+
+Classes:
+    AssetStore: links identical files of built sites to a shared copy.
+"""
+
+import os
+import errno
+import hashlib
+from pathlib import Path
+
+import app.functions.constants as c
+
+
+class AssetStore:
+    """Links identical files of built sites to a shared copy
+
+    functions:
+        deduplicate: links the shareable files of a site to the store.
+        collect: deletes store files no longer used by any site.
+    """
+
+    def __init__(
+        self,
+        store_path: str = f"{ c.DOCUMENTATION_PAGES }/{ c.ASSET_STORE_FOLDER }/",
+    ) -> None:
+        """Initialises the AssetStore class
+
+        Args:
+            store_path (str): the folder of the store.
+        """
+        self.store_path: str = store_path
+        return
+
+    def deduplicate(self, site_path: str) -> int:
+        """Links the shareable files of a site to the store
+
+        A file not yet in the store is added to it. The store is left
+        unchanged if it is on another file system.
+
+        Args:
+            site_path (str): the folder of the built site.
+
+        Returns:
+            int: the number of files linked to a copy already in the store.
+        """
+        linked: int = 0
+        file_path: str = ""
+        stored_path: str = ""
+
+        for path, _, files in os.walk(site_path):
+            for name in files:
+                file_path = os.path.join(path, name)
+
+                if not self._shareable(file_path):
+                    continue
+
+                stored_path = self._stored_path(file_path)
+
+                try:
+                    if self._link(stored_path, file_path):
+                        linked += 1
+                except OSError as error:
+                    if error.errno == errno.EXDEV:
+                        return linked
+                    raise
+
+        return linked
+
+    def collect(self) -> int:
+        """Deletes store files no longer used by any site
+
+        A store file with no other hardlink is only referenced by the store,
+        eg after the site generations using it were pruned.
+
+        Returns:
+            int: the number of store files deleted.
+        """
+        removed: int = 0
+
+        if not Path(self.store_path).is_dir():
+            return 0
+
+        for path, _, files in os.walk(self.store_path):
+            for name in files:
+                file_path = os.path.join(path, name)
+                if os.stat(file_path).st_nlink == 1:
+                    os.remove(file_path)
+                    removed += 1
+
+        return removed
+
+    def _shareable(self, file_path: str) -> bool:
+        """Checks if a file is likely to be shared by other sites
+
+        Args:
+            file_path (str): path of the file.
+
+        Returns:
+            bool: True for theme and static files (and their precompressed
+                  siblings) of at least c.ASSET_STORE_MIN_SIZE bytes.
+        """
+        suffix: str = Path(file_path).suffix
+
+        if suffix in (".gz", ".br"):
+            suffix = Path(file_path[: -len(suffix)]).suffix
+
+        if suffix not in c.ASSET_STORE_EXTENSIONS:
+            return False
+
+        if os.path.islink(file_path):
+            return False
+
+        return os.stat(file_path).st_size >= c.ASSET_STORE_MIN_SIZE
+
+    def _stored_path(self, file_path: str) -> str:
+        """Returns the path in the store for a file's content
+
+        Args:
+            file_path (str): path of the file.
+
+        Returns:
+            str: the store path, named by hash and keeping the file's suffix.
+        """
+        file_hash: str = ""
+
+        with open(file_path, "rb") as file:
+            file_hash = hashlib.sha256(file.read()).hexdigest()
+
+        return (
+            f"{ self.store_path }{ file_hash[:2] }/{ file_hash[2:] }"
+            f"{ ''.join(Path(file_path).suffixes[-2:]) }"
+        )
+
+    def _link(self, stored_path: str, file_path: str) -> bool:
+        """Links a file to its copy in the store, adding it if needed
+
+        Args:
+            stored_path (str): the store path for the file's content.
+            file_path (str): path of the file.
+
+        Returns:
+            bool: True if the file was replaced by a link to a stored copy.
+        """
+        temporary_path: str = f"{ file_path }.{ os.getpid() }.tmp"
+
+        Path(stored_path).parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            if os.path.samefile(stored_path, file_path):
+                return False
+            os.link(stored_path, temporary_path)
+        except FileNotFoundError:
+            # Not stored yet, or just collected, so this file becomes the copy
+            try:
+                os.link(file_path, stored_path)
+            except FileExistsError:
+                # Stored by another build in the meantime
+                return self._link(stored_path, file_path)
+            return False
+
+        os.replace(temporary_path, file_path)
+        return True
@@ -0,0 +1,142 @@
+"""Per-project build lock shared between processes
+
+A build rewrites the project's entries (preprocessor) and its static site, so
+two builds of the same project must never run at once. The gunicorn workers
+and build workers all see the same build state folder, so an exclusive fcntl
+lock on a file in that folder serialises builds across processes. The lock is
+released by the operating system if the holding process dies.
+
+Classes:
+    BuildLock: exclusive lock on a project's builds.
+"""
+
+import os
+import fcntl
+import time as t
+from pathlib import Path
+from types import TracebackType
+from typing import Optional
+
+import app.functions.constants as c
+
+
+class BuildLock:
+    """Exclusive lock on a project's builds
+
+    Used as a context manager:
+
+        with BuildLock(project_id):
+            ...
+
+    functions:
+        acquire: waits for, then takes, the lock.
+        release: releases the lock.
+        locked: checks if another process holds the lock.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        build_state_folder: str = c.BUILD_STATE_FOLDER,
+        timeout: float = c.BUILD_LOCK_TIMEOUT,
+    ) -> None:
+        """Initialises the BuildLock class
+
+        Args:
+            project_id (int): the primary key of the project.
+            build_state_folder (str): the folder holding build state for all
+                                      projects.
+            timeout (float): seconds to wait for the lock.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        self.lock_path: str = ""
+        self.timeout: float = timeout
+        self.file_descriptor: Optional[int] = None
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        self.lock_path = (
+            f"{ build_state_folder }project_{ project_id }/"
+            f"{ c.BUILD_LOCK_FILE }"
+        )
+        return
+
+    def acquire(self) -> None:
+        """Waits for, then takes, the lock
+
+        Raises:
+            TimeoutError: if the lock is not released within the timeout.
+        """
+        deadline: float = t.monotonic() + self.timeout
+        file_descriptor: int = 0
+
+        Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor = os.open(self.lock_path, os.O_RDWR | os.O_CREAT)
+
+        while True:
+            try:
+                fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                if t.monotonic() >= deadline:
+                    os.close(file_descriptor)
+                    raise TimeoutError(
+                        f"Timed out waiting for the build lock "
+                        f"'{ self.lock_path }'"
+                    )
+                t.sleep(c.TIME_INTERVAL)
+            else:
+                break
+
+        self.file_descriptor = file_descriptor
+        return
+
+    def release(self) -> None:
+        """Releases the lock"""
+        if self.file_descriptor is None:
+            return
+
+        fcntl.flock(self.file_descriptor, fcntl.LOCK_UN)
+        os.close(self.file_descriptor)
+        self.file_descriptor = None
+        return
+
+    def locked(self) -> bool:
+        """Checks if another process holds the lock
+
+        Returns:
+            bool: True if a build of the project is running elsewhere.
+        """
+        file_descriptor: int = 0
+
+        if self.file_descriptor is not None:
+            return False
+
+        try:
+            file_descriptor = os.open(self.lock_path, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(file_descriptor)
+
+        return False
+
+    def __enter__(self) -> "BuildLock":
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.release()
+        return
@@ -0,0 +1,540 @@
+"""Content digest of the inputs to a project's static site build
+
+The digest of the clinical safety folder is stored after each build, so that
+the build freshness check can compare content rather than timestamps. This
+means that writes made by the build pipeline itself (for example the
+preprocessor rewriting entries) do not make the site look out of date.
+
+The manifest also records the inputs of each page (the page itself, included
+files and snippets, placeholders and the code behind ':::' references), so
+that only pages whose inputs changed need to be rendered again.
+
+Classes:
+    BuildManifest: stores and compares the digest of the build inputs.
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Optional
+from datetime import datetime
+
+from django.utils import timezone
+
+import app.functions.constants as c
+
+INCLUDE_REGEX = re.compile(r"\{%\s*include(?:-markdown)?\s+(['\"])(.+?)\1")
+SNIPPET_REGEX = re.compile(
+    r"^[ \t]*-+8<-+[ \t]+(['\"])(.+?)\1", flags=re.MULTILINE
+)
+SNIPPET_BLOCK_REGEX = re.compile(
+    r"^[ \t]*-+8<-+[ \t]*$(.*?)^[ \t]*-+8<-+[ \t]*$",
+    flags=re.MULTILINE | re.DOTALL,
+)
+MKDOCSTRINGS_REGEX = re.compile(r"^:::[ \t]+([\w.]+)", flags=re.MULTILINE)
+MACROS_REGEX = re.compile(r"\{\{|\{%")
+
+
+class BuildManifest:
+    """Stores and compares the digest of the build inputs
+
+    The manifest is a json file in the build state folder. As well as the
+    overall digest, it keeps the size, modification time and hash of each
+    input file, so unchanged files do not need to be read again to recompute
+    the digest.
+
+    functions:
+        read: reads the stored manifest.
+        files_hashed: hashes the input files.
+        digest: calculates the digest of the input files.
+        changed: checks if the inputs have changed since the last save.
+        verified: returns when the inputs were last confirmed unchanged.
+        verify: records that the inputs have been confirmed unchanged.
+        snapshot: records the current inputs, for a later save.
+        save: stores the digest of the inputs snapshot.
+        dependencies: finds the files a page includes or references.
+        pages_hashed: hashes the inputs of each page.
+        pages_changed: lists the pages whose inputs have changed.
+        titles: returns the page titles from the last build.
+        pages_clear: forgets the inputs and titles of each page.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        projects_folder: str = c.PROJECTS_FOLDER,
+        build_state_folder: str = c.BUILD_STATE_FOLDER,
+    ) -> None:
+        """Initialises the BuildManifest class
+
+        Args:
+            project_id (int): the primary key of the project.
+            projects_folder (str): the folder holding all projects.
+            build_state_folder (str): the folder holding build state for all
+                                      projects.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        self.project_id: int = 0
+        self.project_folder: str = ""
+        self.inputs_directory: str = ""
+        self.manifest_path: str = ""
+        self.files: dict[str, dict[str, Any]] = {}
+        self.pages: dict[str, dict[str, Optional[str]]] = {}
+        self.snapshot_digest: str = ""
+        self.snapshot_config: Optional[str] = None
+        self.snapshot_verified: str = ""
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        self.project_id = project_id
+        self.project_folder = f"{ projects_folder }project_{ project_id }/"
+        self.inputs_directory = (
+            f"{ self.project_folder }{ c.CLINICAL_SAFETY_FOLDER }"
+        )
+        self.manifest_path = (
+            f"{ build_state_folder }project_{ project_id }/"
+            f"{ c.BUILD_MANIFEST_FILE }"
+        )
+        return
+
+    def read(self) -> dict[str, Any]:
+        """Reads the stored manifest
+
+        Returns:
+            dict[str, Any]: the manifest, or an empty dictionary if there is no
+                            valid manifest stored.
+        """
+        manifest: dict[str, Any] = {}
+
+        try:
+            with open(self.manifest_path, "r") as file:
+                manifest = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        if not isinstance(manifest, dict):
+            return {}
+
+        return manifest
+
+    def files_hashed(self) -> dict[str, dict[str, Any]]:
+        """Hashes the input files
+
+        Files whose size and modification time match the stored manifest reuse
+        the stored hash. Hidden files and folders are ignored.
+
+        Returns:
+            dict[str, dict[str, Any]]: size, modification time and sha256 hash,
+                                       keyed by path relative to the clinical
+                                       safety folder.
+        """
+        stored_files: dict[str, dict[str, Any]] = self.read().get("files", {})
+        files: dict[str, dict[str, Any]] = {}
+        relative_path: str = ""
+        stat: os.stat_result
+        stored: Optional[dict[str, Any]] = None
+
+        for path, directories, names in os.walk(self.inputs_directory):
+            directories[:] = sorted(
+                directory
+                for directory in directories
+                if not directory.startswith(".")
+            )
+
+            for name in sorted(names):
+                if name.startswith("."):
+                    continue
+
+                file_path = os.path.join(path, name)
+                relative_path = os.path.relpath(
+                    file_path, self.inputs_directory
+                )
+                stat = os.stat(file_path)
+                stored = stored_files.get(relative_path)
+
+                if (
+                    stored is not None
+                    and stored.get("size") == stat.st_size
+                    and stored.get("mtime_ns") == stat.st_mtime_ns
+                ):
+                    files[relative_path] = stored
+                    continue
+
+                with open(file_path, "rb") as file:
+                    file_hash = hashlib.sha256(file.read()).hexdigest()
+
+                files[relative_path] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": file_hash,
+                }
+
+        self.files = files
+        return files
+
+    def digest(self) -> str:
+        """Calculates the digest of the input files
+
+        The digest covers the path and content of every input file, so it
+        changes if files are added, removed, renamed or edited.
+
+        Returns:
+            str: the sha256 digest of the inputs.
+        """
+        files: dict[str, dict[str, Any]] = self.files_hashed()
+        digest = hashlib.sha256()
+
+        for relative_path in sorted(files):
+            digest.update(relative_path.encode())
+            digest.update(b"\0")
+            digest.update(files[relative_path]["sha256"].encode())
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def changed(self) -> bool:
+        """Checks if the inputs have changed since the last save
+
+        Returns:
+            bool: True if the inputs (including files referenced from outside
+                  the clinical safety folder) differ from the stored manifest,
+                  or if there is no stored manifest.
+        """
+        stored: dict[str, Any] = self.read()
+        stored_digest: Optional[str] = stored.get("digest")
+        inputs: dict[str, Optional[str]] = {}
+
+        if stored_digest is None:
+            return True
+
+        if self.digest() != stored_digest:
+            return True
+
+        # Code behind ':::' references lives outside the clinical safety folder
+        for inputs in stored.get("pages", {}).values():
+            for input_path, input_hash in inputs.items():
+                if input_path.startswith("..") and (
+                    self._hash(input_path) != input_hash
+                ):
+                    return True
+
+        return False
+
+    def verified(self) -> Optional[datetime]:
+        """Returns when the inputs were last confirmed unchanged
+
+        Returns:
+            Optional[datetime]: time of the last save or verify, or None if
+                                not known.
+        """
+        verified: Optional[str] = self.read().get("verified")
+
+        if verified is None:
+            return None
+
+        try:
+            return datetime.fromisoformat(verified)
+        except ValueError:
+            return None
+
+    def verify(self) -> None:
+        """Records that the inputs have been confirmed unchanged
+
+        Saves the time of the check, so later freshness checks can be done on
+        timestamps alone.
+        """
+        manifest: dict[str, Any] = self.read()
+
+        if self.files:
+            manifest["files"] = self.files
+
+        manifest["verified"] = timezone.now().isoformat()
+        self._write(manifest)
+        return
+
+    def snapshot(self) -> str:
+        """Records the current inputs, for a later save
+
+        Taken once the build inputs are final (after the preprocessor), so that
+        a save after the build stores the inputs that were built. An edit
+        made while mkdocs runs then still shows as a change.
+
+        Returns:
+            str: the digest of the inputs.
+        """
+        self.snapshot_verified = timezone.now().isoformat()
+        self.snapshot_digest = self.digest()
+        self.snapshot_config = self._hash(c.MKDOCS_CONFIG_FILE)
+        self.pages_hashed()
+        return self.snapshot_digest
+
+    def save(self, titles: Optional[dict[str, str]] = None) -> str:
+        """Stores the digest of the inputs snapshot
+
+        A snapshot of the current inputs is taken first if there is none.
+
+        Args:
+            titles (Optional[dict[str, str]]): titles of the pages built. If
+                                               None (eg the build failed), the
+                                               inputs of each page are not
+                                               stored, so the next build
+                                               renders every page.
+
+        Returns:
+            str: the digest stored.
+        """
+        manifest: dict[str, Any] = {}
+
+        if not self.snapshot_verified:
+            self.snapshot()
+
+        manifest = {
+            "digest": self.snapshot_digest,
+            "verified": self.snapshot_verified,
+            "files": self.files,
+        }
+
+        if titles is not None:
+            manifest["config"] = self.snapshot_config
+            manifest["pages"] = self.pages
+            manifest["titles"] = titles
+
+        self._write(manifest)
+        return self.snapshot_digest
+
+    def dependencies(self, page_path: str) -> list[str]:
+        """Finds the files a page includes or references
+
+        Looks for include-markdown includes, snippets, mkdocstrings ':::'
+        references and macros (which depend on the placeholders).
+
+        Args:
+            page_path (str): path of the page, relative to the clinical safety
+                             folder.
+
+        Returns:
+            list[str]: paths of the dependencies, relative to the clinical
+                       safety folder. A dependency that cannot be resolved
+                       is given as the reference prefixed with '?'.
+        """
+        dependencies: list[str] = []
+        page_directory: str = os.path.dirname(page_path)
+        text: str = ""
+        match: re.Match[str]
+        line: str = ""
+
+        with open(
+            os.path.join(self.inputs_directory, page_path),
+            "r",
+            encoding="utf-8",
+            errors="replace",
+        ) as file:
+            text = file.read()
+
+        for match in INCLUDE_REGEX.finditer(text):
+            dependencies.append(self._relative(match.group(2), page_directory))
+
+        for match in SNIPPET_REGEX.finditer(text):
+            dependencies.append(self._relative(match.group(2), ""))
+
+        for match in SNIPPET_BLOCK_REGEX.finditer(text):
+            for line in match.group(1).splitlines():
+                line = line.strip()
+                if line and not line.startswith(";"):
+                    dependencies.append(self._relative(line, ""))
+
+        for match in MKDOCSTRINGS_REGEX.finditer(text):
+            dependencies.append(self._module(match.group(1)))
+
+        if MACROS_REGEX.search(text):
+            dependencies.append(c.MKDOCS_PLACEHOLDERS_FILE)
+
+        return sorted(set(dependencies))
+
+    def pages_hashed(self) -> dict[str, dict[str, Optional[str]]]:
+        """Hashes the inputs of each page
+
+        Returns:
+            dict[str, dict[str, Optional[str]]]: for each page (keyed by path
+                                                 relative to the docs folder),
+                                                 the sha256 hash of each of its
+                                                 inputs. The hash is None if
+                                                 the input was not found.
+        """
+        files: dict[str, dict[str, Any]] = self.files or self.files_hashed()
+        pages: dict[str, dict[str, Optional[str]]] = {}
+        docs_prefix: str = f"{ c.MKDOCS_DOCS_FOLDER }/"
+        relative_path: str = ""
+        dependency: str = ""
+
+        for relative_path in files:
+            if not relative_path.startswith(
+                docs_prefix
+            ) or not relative_path.endswith(".md"):
+                continue
+
+            page: dict[str, Optional[str]] = {
+                relative_path: files[relative_path]["sha256"]
+            }
+            for dependency in self.dependencies(relative_path):
+                page[dependency] = self._hash(dependency)
+
+            pages[relative_path[len(docs_prefix) :]] = page
+
+        self.pages = pages
+        return pages
+
+    def pages_changed(self) -> Optional[list[str]]:
+        """Lists the pages whose inputs have changed
+
+        All pages need rendering again (and None is returned) if there is no
+        record of the last build, if the mkdocs configuration has changed or
+        if pages have been added or removed, as the navigation of every page
+        would be out of date. The inputs of a snapshot are used, if taken.
+
+        Returns:
+            Optional[list[str]]: the pages to render, relative to the docs
+                                 folder, or None if all pages need rendering.
+        """
+        stored: dict[str, Any] = self.read()
+        stored_pages: Optional[dict[str, Any]] = stored.get("pages")
+        pages: dict[str, dict[str, Optional[str]]] = (
+            self.pages or self.pages_hashed()
+        )
+
+        if stored_pages is None or set(stored_pages) != set(pages):
+            return None
+
+        if stored.get("config") != self._hash(c.MKDOCS_CONFIG_FILE):
+            return None
+
+        return sorted(
+            page
+            for page, inputs in pages.items()
+            if inputs != stored_pages[page] or None in inputs.values()
+        )
+
+    def titles(self) -> dict[str, str]:
+        """Returns the page titles from the last build
+
+        Returns:
+            dict[str, str]: titles keyed by page path, relative to the docs
+                            folder.
+        """
+        titles: dict[str, str] = self.read().get("titles", {})
+
+        return titles
+
+    def pages_clear(self) -> None:
+        """Forgets the inputs and titles of each page
+
+        The next build then renders every page, eg after the live site has
+        been rolled back to a generation the stored pages do not describe.
+        The digest is kept, so this does not by itself make a build required.
+        """
+        manifest: dict[str, Any] = self.read()
+
+        if not manifest:
+            return
+
+        for key in ("pages", "titles", "config"):
+            manifest.pop(key, None)
+
+        self._write(manifest)
+        return
+
+    def _relative(self, reference: str, directory: str) -> str:
+        """Resolves a file reference from a page
+
+        Args:
+            reference (str): the reference, relative to directory.
+            directory (str): folder the reference is relative to, itself
+                             relative to the clinical safety folder.
+
+        Returns:
+            str: path relative to the clinical safety folder, or the reference
+                 prefixed with '?' if it is a url or a glob.
+        """
+        # Snippets can select lines, eg "file.md:2:10"
+        reference = re.sub(r"(:\d*)+$", "", reference)
+
+        if "://" in reference or any(char in reference for char in "*?["):
+            return f"?{ reference }"
+
+        return os.path.normpath(os.path.join(directory, reference))
+
+    def _module(self, identifier: str) -> str:
+        """Resolves a mkdocstrings identifier to its source file
+
+        The longest leading part of the identifier that matches a module, in
+        either the clinical safety folder or the project folder, is used.
+
+        Args:
+            identifier (str): dotted identifier, eg 'app.functions.constants'.
+
+        Returns:
+            str: path relative to the clinical safety folder, or the
+                 identifier prefixed with '?' if no module was found.
+        """
+        parts: list[str] = identifier.split(".")
+        root: str = ""
+        candidate: str = ""
+
+        for length in range(len(parts), 0, -1):
+            for root in (self.inputs_directory, self.project_folder):
+                for candidate in (
+                    os.path.join(root, *parts[:length]) + ".py",
+                    os.path.join(root, *parts[:length], "__init__.py"),
+                ):
+                    if os.path.isfile(candidate):
+                        return os.path.relpath(
+                            candidate, self.inputs_directory
+                        )
+
+        return f"?{ identifier }"
+
+    def _hash(self, relative_path: str) -> Optional[str]:
+        """Hashes an input file
+
+        Args:
+            relative_path (str): path relative to the clinical safety folder.
+
+        Returns:
+            Optional[str]: the sha256 hash, or None if the file is not found.
+        """
+        file_path: str = os.path.join(self.inputs_directory, relative_path)
+        file_hash: Optional[str] = None
+
+        if relative_path in self.files:
+            file_hash = self.files[relative_path]["sha256"]
+            return file_hash
+
+        if relative_path.startswith("?") or not os.path.isfile(file_path):
+            return None
+
+        with open(file_path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def _write(self, manifest: dict[str, Any]) -> None:
+        """Writes the manifest
+
+        Written to a temporary file and then renamed, so a reader never sees a
+        partly written manifest.
+
+        Args:
+            manifest (dict[str, Any]): the manifest to write.
+        """
+        temporary_path: str = f"{ self.manifest_path }.{ os.getpid() }.tmp"
+
+        Path(self.manifest_path).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temporary_path, "w") as file:
+            json.dump(manifest, file)
+
+        os.replace(temporary_path, self.manifest_path)
+        return
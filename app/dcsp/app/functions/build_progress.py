@@ -0,0 +1,161 @@
+"""Live progress of a queued build
+
+A build runs in the build worker, detached from the web request that queued
+it. As it runs, its output is appended line by line to a progress file in the
+build state folder, together with markers for each phase of the build. The
+web page that queued the build polls for new lines (see the
+'project_build_progress' view), reading on from where it last stopped.
+
+Classes:
+    BuildProgress: writes and reads the progress of a build.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Any
+
+import app.functions.constants as c
+
+
+class BuildProgress:
+    """Writes and reads the progress of a build
+
+    The progress file is plain text, one line of output per line. Lines
+    starting with c.BUILD_PROGRESS_PHASE_PREFIX mark the start of a phase.
+    The object can be used as a stream, eg for a logging handler.
+
+    functions:
+        start: creates an empty progress file.
+        phase: marks the start of a phase.
+        write: appends output.
+        flush: no-op, each write is flushed.
+        handler: returns a logging handler writing to the progress.
+        read: returns the progress after a given offset.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        job_id: int,
+        build_state_folder: str = c.BUILD_STATE_FOLDER,
+    ) -> None:
+        """Initialises the BuildProgress class
+
+        Args:
+            project_id (int): the primary key of the project.
+            job_id (int): the primary key of the build job.
+            build_state_folder (str): the folder holding build state for all
+                                      projects.
+
+        Raises:
+            TypeError: if project_id or job_id is not an integer.
+        """
+        self.progress_folder: str = ""
+        self.progress_path: str = ""
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        if not isinstance(job_id, int):
+            raise TypeError(f"'job_id' '{ job_id }' is not an integer")
+
+        self.progress_folder = (
+            f"{ build_state_folder }project_{ project_id }/"
+            f"{ c.BUILD_PROGRESS_FOLDER }"
+        )
+        self.progress_path = f"{ self.progress_folder }{ job_id }.log"
+        return
+
+    def start(self) -> None:
+        """Creates an empty progress file
+
+        The progress of earlier builds of the project is deleted, as only the
+        latest build is followed.
+        """
+        Path(self.progress_folder).mkdir(parents=True, exist_ok=True)
+
+        for entry in os.scandir(self.progress_folder):
+            if entry.path != self.progress_path:
+                os.remove(entry.path)
+
+        open(self.progress_path, "w").close()
+        return
+
+    def phase(self, name: str) -> None:
+        """Marks the start of a phase
+
+        Args:
+            name (str): name of the phase, eg 'preprocessor'.
+        """
+        self.write(f"{ c.BUILD_PROGRESS_PHASE_PREFIX }{ name }\n")
+        return
+
+    def write(self, text: str) -> int:
+        """Appends output
+
+        Args:
+            text (str): the output.
+
+        Returns:
+            int: the number of characters written.
+        """
+        with open(self.progress_path, "a") as file:
+            file.write(text)
+
+        return len(text)
+
+    def flush(self) -> None:
+        """No-op, each write is flushed"""
+        return
+
+    def handler(self) -> logging.Handler:
+        """Returns a logging handler writing to the progress
+
+        Returns:
+            logging.Handler: the handler, using the mkdocs log format.
+        """
+        handler: logging.Handler = logging.StreamHandler(self)
+
+        handler.setFormatter(
+            logging.Formatter("%(levelname)-8s-  %(message)s")
+        )
+        return handler
+
+    def read(self, offset: int = 0) -> tuple[list[dict[str, Any]], int]:
+        """Returns the progress after a given offset
+
+        Only complete lines are returned, so a line being written is returned
+        by a later read.
+
+        Args:
+            offset (int): the offset returned by the previous read.
+
+        Returns:
+            tuple[list[dict[str, Any]], int]: the new lines, each either
+                                              {"phase": name} or
+                                              {"line": text}, and the
+                                              offset to read on from.
+        """
+        content: bytes = b""
+        events: list[dict[str, Any]] = []
+        end: int = 0
+
+        try:
+            with open(self.progress_path, "rb") as file:
+                file.seek(offset)
+                content = file.read()
+        except FileNotFoundError:
+            return [], offset
+
+        end = content.rfind(b"\n") + 1
+
+        for line in content[:end].decode("utf-8", "replace").splitlines():
+            if line.startswith(c.BUILD_PROGRESS_PHASE_PREFIX):
+                events.append(
+                    {"phase": line[len(c.BUILD_PROGRESS_PHASE_PREFIX) :]}
+                )
+            else:
+                events.append({"line": line})
+
+        return events, offset + end
@@ -0,0 +1,259 @@
+"""Persistent queue of static site builds
+
+Builds are slow (preprocessor plus mkdocs), so they are queued in the database
+and run by a separate worker process (see the 'build_worker' management
+command) rather than inside a web request.
+
+Classes:
+    BuildQueue: add, claim and run queued builds.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from app.models import BuildJob, BuildStatus, Project
+
+import app.functions.constants as c
+
+from app.functions.mkdocs_control import MkdocsControl
+from app.functions.build_progress import BuildProgress
+
+
+class BuildQueue:
+    """Add, claim and run queued builds
+
+    Requests for the same project are coalesced, so there is never more than
+    one queued build for a project. A build can be delayed, and is then
+    debounced: each further delayed request restarts the delay, up to
+    c.BUILD_DEBOUNCE_MAX_SECONDS after the first request.
+
+    functions:
+        add: queues a build for a project.
+        schedule: queues a debounced build after an edit.
+        is_queued: checks if a project has a build waiting.
+        claim: takes the oldest queued build and marks it as running.
+        recover: fails and queues again builds left running by a worker.
+        run: runs a claimed build.
+        run_next: claims and runs the oldest queued build.
+    """
+
+    def add(
+        self, project_id: int, force: bool = False, delay: float = 0
+    ) -> BuildJob:
+        """Queues a build for a project
+
+        If the project already has a queued build, that build is returned
+        (and upgraded to a forced build if needed) rather than queuing another.
+        A build that is still being delayed is delayed again, or brought
+        forward to now if delay is 0. A build that is already due is not
+        delayed.
+
+        Args:
+            project_id (int): the primary key of the project.
+            force (bool): build even if the documents have not been modified.
+            delay (float): seconds to wait before building.
+
+        Returns:
+            BuildJob: the queued build.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        job: Optional[BuildJob] = None
+        time_now: datetime = timezone.now()
+        run_after: datetime = time_now + timedelta(seconds=delay)
+        update_fields: list[str] = []
+        attempts: int = 0
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        while job is None:
+            try:
+                with transaction.atomic():
+                    job = (
+                        BuildJob.objects.select_for_update()
+                        .filter(
+                            project_id=project_id, status=BuildStatus.QUEUED
+                        )
+                        .first()
+                    )
+
+                    if job is None:
+                        return BuildJob.objects.create(
+                            project=Project.objects.get(id=project_id),
+                            force=force,
+                            requested=time_now,
+                            run_after=run_after,
+                        )
+            except IntegrityError:
+                # Another process queued a build between the check and the
+                # create. Look again, as a worker may have claimed it since
+                attempts += 1
+                if attempts >= c.BUILD_ADD_ATTEMPTS:
+                    raise
+
+        if force and not job.force:
+            job.force = True
+            update_fields.append("force")
+
+        run_after = min(
+            run_after,
+            job.requested + timedelta(seconds=c.BUILD_DEBOUNCE_MAX_SECONDS),
+        )
+        if job.run_after > time_now or run_after < job.run_after:
+            job.run_after = max(run_after, time_now)
+            update_fields.append("run_after")
+
+        if update_fields:
+            job.save(update_fields=update_fields)
+
+        return job
+
+    def schedule(self, project_id: int) -> BuildJob:
+        """Queues a debounced build after an edit
+
+        The build runs c.BUILD_DEBOUNCE_SECONDS after the last of a burst of
+        edits, so an editing session gives one build rather than one per save.
+
+        Args:
+            project_id (int): the primary key of the project.
+
+        Returns:
+            BuildJob: the queued build.
+        """
+        return self.add(project_id, delay=c.BUILD_DEBOUNCE_SECONDS)
+
+    def is_queued(self, project_id: int) -> bool:
+        """Checks if a project has a build waiting
+
+        Args:
+            project_id (int): the primary key of the project.
+
+        Returns:
+            bool: True if a build is queued for the project.
+        """
+        return BuildJob.objects.filter(
+            project_id=project_id, status=BuildStatus.QUEUED
+        ).exists()
+
+    def claim(self) -> Optional[BuildJob]:
+        """Takes the oldest due build and marks it as running
+
+        Rows locked by other workers are skipped, so several workers can share
+        the one queue. Builds still being delayed are left queued.
+
+        Returns:
+            Optional[BuildJob]: the claimed build, or None if no build is due.
+        """
+        job: Optional[BuildJob] = None
+
+        with transaction.atomic():
+            job = (
+                BuildJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=BuildStatus.QUEUED, run_after__lte=timezone.now()
+                )
+                .order_by("requested")
+                .first()
+            )
+
+            if job is None:
+                return None
+
+            job.status = BuildStatus.RUNNING
+            job.started = timezone.now()
+            job.save(update_fields=["status", "started"])
+
+        return job
+
+    def recover(
+        self, stale_seconds: float = c.BUILD_STALE_SECONDS
+    ) -> list[BuildJob]:
+        """Fails and queues again builds left running by a worker
+
+        A worker that stops part way through a build (eg killed or out of
+        memory) leaves its build running forever. Such builds are marked as
+        failed, and the project queued for a build again.
+
+        Args:
+            stale_seconds (float): seconds after which a running build is
+                                   taken to have been left by a worker.
+
+        Returns:
+            list[BuildJob]: the builds marked as failed.
+        """
+        jobs: list[BuildJob] = []
+        time_now: datetime = timezone.now()
+
+        with transaction.atomic():
+            jobs = list(
+                BuildJob.objects.select_for_update(skip_locked=True).filter(
+                    status=BuildStatus.RUNNING,
+                    started__lt=time_now - timedelta(seconds=stale_seconds),
+                )
+            )
+
+            for job in jobs:
+                job.status = BuildStatus.FAILED
+                job.output = (
+                    "<b>Build failed</b><br><hr>The build worker stopped "
+                    "before the build finished"
+                )
+                job.finished = time_now
+                job.save(update_fields=["status", "output", "finished"])
+
+        for job in jobs:
+            self.add(job.project_id, force=job.force)
+
+        return jobs
+
+    def run(self, job: BuildJob) -> BuildJob:
+        """Runs a claimed build
+
+        The output of the build is written to its BuildProgress as it runs,
+        ending with a 'complete' or 'failed' phase marker.
+
+        Args:
+            job (BuildJob): a build previously returned by claim.
+
+        Returns:
+            BuildJob: the build, marked as complete or failed.
+        """
+        progress: BuildProgress = BuildProgress(job.project_id, job.id)
+
+        progress.start()
+
+        try:
+            job.output = MkdocsControl(job.project_id).build_documents(
+                force=job.force, progress=progress
+            )
+        except Exception as error:
+            job.status = BuildStatus.FAILED
+            job.output = f"<b>Build failed</b><br><hr>{ error }"
+            progress.write(f"{ error }\n")
+        else:
+            job.status = BuildStatus.COMPLETE
+
+        progress.phase(job.status.label)
+
+        job.finished = timezone.now()
+        job.save(update_fields=["status", "output", "finished"])
+        return job
+
+    def run_next(self) -> Optional[BuildJob]:
+        """Claims and runs the oldest queued build
+
+        Returns:
+            Optional[BuildJob]: the finished build, or None if the queue is
+                                empty.
+        """
+        job: Optional[BuildJob] = self.claim()
+
+        if job is None:
+            return None
+
+        return self.run(job)
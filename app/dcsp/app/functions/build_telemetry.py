@@ -0,0 +1,155 @@
+"""Timings and counts of a static site build
+
+Collects how long each phase of a build takes, and what it processed, then
+records them as a BuildRun (see the BuildRun admin for trends per project).
+
+Classes:
+    BuildTelemetry: times the phases of a build and records the result.
+"""
+
+import time as t
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.utils import timezone
+
+import app.functions.constants as c
+from app.models import BuildRun, BuildRunStatus
+
+
+class BuildTelemetry:
+    """Times the phases of a build and records the result
+
+    Phases may be nested, eg the docstring scan runs within the
+    preprocessor. The time of a nested phase is not counted in the phase
+    around it, so the phase timings add up to the time of the build.
+
+    functions:
+        phase: times a phase of the build.
+        count: adds to a count, eg of pages written.
+        record: saves the build as a BuildRun.
+        peak_rss_reset: resets the peak RSS of the process.
+        peak_rss: returns the peak RSS of the process.
+    """
+
+    def __init__(self) -> None:
+        """Initialises the BuildTelemetry class"""
+        self.started = timezone.now()
+        self.started_counter: float = t.perf_counter()
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.nested: list[float] = []
+        self.peak_rss_measured: bool = False
+        self.peak_rss_reset()
+        return
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times a phase of the build
+
+        Args:
+            name (str): name of the phase, one of the BuildRun duration
+                        fields without the '_seconds' suffix.
+        """
+        start: float = t.perf_counter()
+        elapsed: float = 0
+
+        self.nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = t.perf_counter() - start
+            self.durations[name] = (
+                self.durations.get(name, 0.0) + elapsed - self.nested.pop()
+            )
+            if self.nested:
+                self.nested[-1] += elapsed
+
+        return
+
+    def count(self, name: str, number: int) -> None:
+        """Adds to a count
+
+        Args:
+            name (str): name of the count, eg 'pages_written'.
+            number (int): the number to add.
+        """
+        self.counts[name] = self.counts.get(name, 0) + number
+        return
+
+    def record(
+        self,
+        project_id: int,
+        status: BuildRunStatus,
+        log: str,
+        incremental: bool = False,
+    ) -> BuildRun:
+        """Saves the build as a BuildRun
+
+        Args:
+            project_id (int): the primary key of the project.
+            status (BuildRunStatus): how the build ended.
+            log (str): the full build output.
+            incremental (bool): if only changed pages were rendered.
+
+        Returns:
+            BuildRun: the saved record.
+        """
+        build_run: BuildRun = BuildRun(
+            project_id=project_id,
+            started=self.started,
+            status=status,
+            incremental=incremental,
+            total_seconds=t.perf_counter() - self.started_counter,
+            docstrings_seconds=self.durations.get("docstrings"),
+            preprocessor_seconds=self.durations.get("preprocessor"),
+            mkdocs_seconds=self.durations.get("mkdocs"),
+            publish_seconds=self.durations.get("publish"),
+            files_scanned=self.counts.get("files_scanned", 0),
+            pages_written=self.counts.get("pages_written", 0),
+            peak_rss_kb=self.peak_rss(),
+        )
+
+        build_run.log_set(log)
+        build_run.save()
+        return build_run
+
+    def peak_rss_reset(self) -> None:
+        """Resets the peak RSS of the process
+
+        A process builds one project at a time (the build worker, and the sync
+        gunicorn workers), so the peak from here on is that of this build
+        rather than of everything the process has done since it started. Only
+        possible on Linux, otherwise the peak is not measured.
+        """
+        try:
+            with open(c.PROC_CLEAR_REFS, "w") as file:
+                file.write("5")
+        except OSError:
+            self.peak_rss_measured = False
+            return
+
+        self.peak_rss_measured = True
+        return
+
+    def peak_rss(self) -> Optional[int]:
+        """Returns the peak RSS of the process
+
+        Returns:
+            Optional[int]: the peak RSS in kB since the reset, or None if it
+                           could not be measured.
+        """
+        line: str = ""
+
+        if not self.peak_rss_measured:
+            return None
+
+        try:
+            with open(c.PROC_STATUS, "r") as file:
+                for line in file:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+
+        return None
@@ -29,6 +29,98 @@ ENTRY_TEMPLATE_SUFFIX: str = "-template.md"
 TIME_INTERVAL: float = 0.1
 MAX_WAIT: int = 100
 
+# For build_queue
+BUILD_WORKER_POLL: float = 1.0
+BUILD_DEBOUNCE_SECONDS: float = 10.0
+BUILD_DEBOUNCE_MAX_SECONDS: float = 120.0
+# Running builds older than this were left by a worker that stopped. It must
+# be longer than BUILD_LOCK_TIMEOUT plus the slowest build
+BUILD_STALE_SECONDS: float = 3600.0
+BUILD_RECOVER_INTERVAL: float = 60.0
+BUILD_ADD_ATTEMPTS: int = 3
+
+# For build_manifest
+BUILD_STATE_FOLDER: str = f"{ PROJECTS_FOLDER }build-state/"
+BUILD_MANIFEST_FILE: str = "manifest.json"
+MKDOCS_CONFIG_FILE: str = "mkdocs.yml"
+MKDOCS_PLACEHOLDERS_FILE: str = "placeholders.yml"
+MKDOCS_DOCS_FOLDER: str = "docs"
+
+# For rebuild_projects
+REBUILD_WORKERS: int = 2
+REBUILD_CHECKPOINT_FILE: str = "rebuild-checkpoint.json"
+
+# For build_progress
+BUILD_PROGRESS_FOLDER: str = "progress/"
+BUILD_PROGRESS_PHASE_PREFIX: str = "@@phase "
+BUILD_PROGRESS_POLL_MS: int = 1000
+
+# For site_compressor
+PRECOMPRESS_STATE_FILE: str = "precompressed.json"
+PRECOMPRESS_EXTENSIONS: tuple[str, ...] = (
+    ".html",
+    ".css",
+    ".js",
+    ".json",
+    ".xml",
+    ".svg",
+)
+PRECOMPRESS_MIN_SIZE: int = 256
+
+# For asset_store
+ASSET_STORE_FOLDER: str = ".assets"
+ASSET_STORE_EXTENSIONS: tuple[str, ...] = (
+    ".css",
+    ".js",
+    ".map",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".eot",
+    ".svg",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".ico",
+)
+ASSET_STORE_MIN_SIZE: int = 1024
+
+# For site_chrome
+SITE_CHROME_TEMPLATE: str = "site_chrome.html"
+SITE_CHROME_START: str = "<!-- dcsp-chrome -->"
+SITE_CHROME_END: str = "<!-- /dcsp-chrome -->"
+
+# For build_lock
+BUILD_LOCK_FILE: str = "build.lock"
+BUILD_LOCK_TIMEOUT: float = 600.0
+
+# For build_telemetry, writing "5" to clear_refs resets VmHWM (peak RSS)
+PROC_CLEAR_REFS: str = "/proc/self/clear_refs"
+PROC_STATUS: str = "/proc/self/status"
+
+# For docstring_cache
+DOCSTRING_CACHE_FILE: str = "docstrings.json"
+DOCSTRING_CACHE_MAX_ENTRIES: int = 5000
+
+# For docstring_manipulation, folders never searched for source code
+SOURCE_IGNORE_DIRECTORIES: list[str] = [
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    "site-packages",
+    ".mypy_cache",
+    ".pytest_cache",
+    "build",
+    "dist",
+]
+
 
 # For mkDocs
 MKDOCS: str = f"{ MAIN_FOLDER }mkdocs/"
@@ -279,3 +371,9 @@ SELECT_STYLE: str = (
 
 
 DOCUMENTATION_PAGES: str = "/documentation-pages"
+SITE_GENERATIONS_FOLDER: str = ".generations"
+SITE_GENERATIONS_KEEP: int = 3
+PUBLIC_SITES_FOLDER: str = ".public"
+
+# For member_landing_page
+LANDING_PAGE_SIZE: int = 20
@@ -0,0 +1,245 @@
+"""Persistent cache of values extracted from source files
+
+Parsing the python files linked to the documents (see DocstringManipulation)
+is the slowest part of preprocessing for large code bases. The extracted
+docstrings and hazards are stored per project in the build state folder, and
+reused for as long as the source file is unchanged.
+
+Classes:
+    DocstringCache: stores values extracted from source files.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Optional
+
+import app.functions.constants as c
+
+
+class DocstringCache:
+    """Stores values extracted from source files
+
+    Each entry is keyed by the path of the source file, and records the size,
+    modification time and sha256 hash of the file it was extracted from. An
+    entry is reused if the size and modification time match, or failing that
+    if the content hash matches (eg after a git checkout rewrites unchanged
+    files). Otherwise only that file's entry is discarded.
+
+    The cache holds at most max_entries files. The least recently used entries
+    are evicted when the cache is saved. Using an entry does not by itself
+    mark the cache as modified, so a build that only reads the cache does not
+    rewrite it. The order of use is saved along with the next change.
+
+    functions:
+        get: returns a cached value for a source file.
+        set: caches a value for a source file.
+        save: writes the cache to disk.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        build_state_folder: str = c.BUILD_STATE_FOLDER,
+        max_entries: int = c.DOCSTRING_CACHE_MAX_ENTRIES,
+        persistent: bool = True,
+    ) -> None:
+        """Initialises the DocstringCache class
+
+        Args:
+            project_id (int): the primary key of the project.
+            build_state_folder (str): the folder holding build state for all
+                                      projects.
+            max_entries (int): the most source files to keep in the cache.
+            persistent (bool): if False, the cache starts empty and is never
+                               written to disk.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        self.cache_path: str = ""
+        self.max_entries: int = max_entries
+        self.entries: Optional[dict[str, dict[str, Any]]] = None
+        self.clock: int = 0
+        self.modified: bool = False
+        self.persistent: bool = persistent
+
+        if not persistent:
+            self.entries = {}
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        self.cache_path = (
+            f"{ build_state_folder }project_{ project_id }/"
+            f"{ c.DOCSTRING_CACHE_FILE }"
+        )
+        return
+
+    def get(self, file_path: str, key: str) -> Optional[Any]:
+        """Returns a cached value for a source file
+
+        Args:
+            file_path (str): path to the source file.
+            key (str): name of the value, eg 'docstrings'.
+
+        Returns:
+            Optional[Any]: the cached value, or None if there is no valid
+                           cached value.
+        """
+        entries: dict[str, dict[str, Any]] = self._entries()
+        entry: Optional[dict[str, Any]] = entries.get(file_path)
+        stat: Optional[os.stat_result] = self._stat(file_path)
+
+        if entry is None or stat is None or key not in entry:
+            return None
+
+        if entry["size"] != stat.st_size:
+            self._discard(file_path)
+            return None
+
+        if entry["mtime_ns"] != stat.st_mtime_ns:
+            if entry["sha256"] != self._hash(file_path):
+                self._discard(file_path)
+                return None
+            # Saved, so the file is not hashed again next time
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.modified = True
+
+        self._touch(entry)
+        return entry[key]
+
+    def set(self, file_path: str, key: str, value: Any) -> None:
+        """Caches a value for a source file
+
+        Args:
+            file_path (str): path to the source file.
+            key (str): name of the value, eg 'docstrings'.
+            value (Any): the value, which must be serialisable to json.
+        """
+        entries: dict[str, dict[str, Any]] = self._entries()
+        entry: Optional[dict[str, Any]] = entries.get(file_path)
+        stat: Optional[os.stat_result] = self._stat(file_path)
+        file_hash: Optional[str] = None
+
+        if stat is None:
+            return
+
+        file_hash = self._hash(file_path)
+        if file_hash is None:
+            return
+
+        if entry is None or entry["sha256"] != file_hash:
+            entry = {"sha256": file_hash}
+            entries[file_path] = entry
+
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        entry[key] = value
+        self._touch(entry)
+        self.modified = True
+        return
+
+    def save(self) -> None:
+        """Writes the cache to disk
+
+        Nothing is written if the cache has not been modified, or is not
+        persistent. The least recently used entries over max_entries are
+        evicted first.
+        """
+        entries: dict[str, dict[str, Any]] = self._entries()
+        temporary_path: str = f"{ self.cache_path }.{ os.getpid() }.tmp"
+        evict: list[str] = []
+
+        if not self.modified or not self.persistent:
+            return
+
+        if len(entries) > self.max_entries:
+            evict = sorted(entries, key=lambda path: entries[path]["used"])
+            for file_path in evict[: len(entries) - self.max_entries]:
+                del entries[file_path]
+
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temporary_path, "w") as file:
+            json.dump({"clock": self.clock, "entries": entries}, file)
+
+        os.replace(temporary_path, self.cache_path)
+        self.modified = False
+        return
+
+    def _entries(self) -> dict[str, dict[str, Any]]:
+        """Returns the cache entries, reading them from disk if needed
+
+        Returns:
+            dict[str, dict[str, Any]]: entries keyed by source file path.
+        """
+        stored: dict[str, Any] = {}
+
+        if self.entries is not None:
+            return self.entries
+
+        try:
+            with open(self.cache_path, "r") as file:
+                stored = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            stored = {}
+
+        if not isinstance(stored, dict):
+            stored = {}
+
+        self.entries = stored.get("entries", {})
+        self.clock = stored.get("clock", 0)
+        return self.entries
+
+    def _touch(self, entry: dict[str, Any]) -> None:
+        """Marks an entry as the most recently used
+
+        Args:
+            entry (dict[str, Any]): the cache entry.
+        """
+        self.clock += 1
+        entry["used"] = self.clock
+        return
+
+    def _discard(self, file_path: str) -> None:
+        """Removes the entry of a changed source file
+
+        Args:
+            file_path (str): path to the source file.
+        """
+        del self._entries()[file_path]
+        self.modified = True
+        return
+
+    def _stat(self, file_path: str) -> Optional[os.stat_result]:
+        """Returns the stat of a source file
+
+        Args:
+            file_path (str): path to the source file.
+
+        Returns:
+            Optional[os.stat_result]: the stat, or None if not a readable
+                                      file.
+        """
+        try:
+            return os.stat(file_path)
+        except (OSError, ValueError):
+            return None
+
+    def _hash(self, file_path: str) -> Optional[str]:
+        """Hashes a source file
+
+        Args:
+            file_path (str): path to the source file.
+
+        Returns:
+            Optional[str]: the sha256 hash, or None if the file cannot be
+                           read.
+        """
+        try:
+            with open(file_path, "rb") as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except (OSError, ValueError):
+            return None
@@ -4,12 +4,60 @@ class:
     DocstringManipulation: Extracts docstrings from Python files.
 """
 
+import os
 import ast
 import re
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Any, Tuple, Optional, TextIO, Generator
+from git import Repo
+from git.exc import GitError
+
+from django.conf import settings
 
 import app.functions.constants as c
+from app.functions.docstring_cache import DocstringCache
+
+# Set in each process of the extraction pool (see hazards_extracted)
+_pool_docstring: Optional["DocstringManipulation"] = None
+
+
+def _pool_initialise(project_id: int) -> None:
+    """Creates the DocstringManipulation used by a pool process
+
+    The pool processes keep their results in memory only. The calling
+    process stores them in the project's cache.
+
+    Args:
+        project_id (int): The project id.
+    """
+    global _pool_docstring
+
+    _pool_docstring = DocstringManipulation(
+        project_id,
+        cache=DocstringCache(project_id, persistent=False),
+        workers=1,
+    )
+    return
+
+
+def _pool_extract_hazards(file_path: str) -> list[dict[str, Any]]:
+    """Extracts hazards from a Python file in a pool process
+
+    Args:
+        file_path (str): The file path.
+
+    Returns:
+        list[dict[str, Any]]: As DocstringManipulation.extract_hazards.
+
+    Raises:
+        RuntimeError: if the pool process was not initialised.
+    """
+    if _pool_docstring is None:
+        raise RuntimeError("The pool process has not been initialised")
+
+    return _pool_docstring.extract_hazards(file_path)
 
 
 class DocstringManipulation:
@@ -19,12 +67,40 @@ class DocstringManipulation:
 
     functions:
         docstring_all: Matches hazards in markdown files with code files.
+        hazard_index: Indexes the code linked to each hazard number.
+        hazards_extracted: Extracts hazards from several Python files.
+        source_index: Indexes the Python files of a project by file name.
+        source_files_git: Lists the Python files tracked by git.
+        source_files_walk: Lists the Python files found by a pruned walk.
         extract_docstrings: Extracts docstrings from Python files.
         extract_hazards: Extracts hazards from Python files.
     """
 
-    def __init__(self, project_id: int) -> None:
+    def __init__(
+        self,
+        project_id: int,
+        cache: Optional[DocstringCache] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Initialises the DocstringManipulation class
+
+        Args:
+            project_id (int): The project id.
+            cache (Optional[DocstringCache]): cache of extracted docstrings and
+                                              hazards. Defaults to the
+                                              project's cache.
+            workers (Optional[int]): processes used to extract hazards. 0 or 1
+                                     extracts in this process. Defaults to
+                                     settings.DOCSTRING_WORKERS.
+        """
         self.project_id: int = project_id
+        self.cache: DocstringCache = cache or DocstringCache(project_id)
+        self.workers: int = 0
+        self.files_scanned: int = 0
+
+        if workers is None:
+            workers = getattr(settings, "DOCSTRING_WORKERS", 0)
+        self.workers = workers
         return
 
     def docstring_all(self) -> list[dict[str, Any]]:
@@ -44,11 +120,11 @@ class DocstringManipulation:
             f"{ c.PROJECTS_FOLDER }project_{ self.project_id }"
             f"/{ c.CLINICAL_SAFETY_FOLDER }docs/"
         )
-        markdown_files: Optional[Generator[Path, None, None]] = None
+        markdown_files: list[Path] = []
         project_folder: str = (
             f"{ c.PROJECTS_FOLDER }project_{ self.project_id }/"
         )
-        function_paths: list[Any] = []
+        source_index: dict[str, list[str]] = {}
         file_path: Optional[Path] = None
         lines: list[str] = []
         matching_lines: list[str] = []
@@ -56,8 +132,8 @@ class DocstringManipulation:
         index: int = 0
         function_info: dict[str, Any] = {}
         code_file: str = ""
-        code_file_path: Path
-        hazards: list[dict[str, Any]] = []
+        code_file_path: str = ""
+        hazards: dict[str, list[dict[str, Any]]] = {}
 
         if not Path(docs_folder).exists():
             return []
@@ -65,11 +141,10 @@ class DocstringManipulation:
         if not Path(project_folder).exists():
             return []
 
-        markdown_files = Path(docs_folder).rglob("*.md")
+        # Sorted, so the results are in the same order on every build
+        markdown_files = sorted(Path(docs_folder).rglob("*.md"))
 
-        # list used here as Path is a Generator, and cannot be called twice
-        # in later code.
-        function_paths = list(Path(project_folder).rglob("*.py"))
+        source_index = self.source_index(project_folder)
 
         for file_path in markdown_files:
             with open(file_path, "r") as file:
@@ -91,27 +166,345 @@ class DocstringManipulation:
                             }
                         )
 
+        hazards = self.hazards_extracted(
+            [
+                code_file_path
+                for function_info in hazard_docs_attributes
+                for code_file_path in source_index.get(
+                    function_info["code_file"], []
+                )
+            ]
+        )
+
         for index, function_info in enumerate(hazard_docs_attributes):
             code_file = function_info["code_file"]
-            for code_file_path in function_paths:
-                if code_file_path.name == code_file:
-                    hazard_docs_attributes[index]["code_file_path"] = str(
+            for code_file_path in source_index.get(code_file, []):
+                hazard_docs_attributes[index][
+                    "code_file_path"
+                ] = code_file_path
+                if hazards[code_file_path]:
+                    hazard_docs_attributes[index]["hazards"] = hazards[
                         code_file_path
-                    )
-                    hazards = self.extract_hazards(str(code_file_path))
-                    if hazards:
-                        hazard_docs_attributes[index]["hazards"] = hazards
+                    ]
 
         hazard_docs_attributes = [
             item for item in hazard_docs_attributes if "hazards" in item
         ]
 
+        self.files_scanned = len(markdown_files) + len(hazards)
+
+        self.cache.save()
+
         return hazard_docs_attributes
 
+    def hazard_index(
+        self, referenced_hazards: Optional[list[dict[str, Any]]] = None
+    ) -> dict[str, list[dict[str, str]]]:
+        """Indexes the code linked to each hazard number
+
+        Inverts the output of docstring_all, so the code linked to a hazard
+        can be looked up by hazard number rather than by searching every
+        function.
+
+        Args:
+            referenced_hazards (Optional[list[dict[str, Any]]]): output of
+                docstring_all. If None, docstring_all is called.
+
+        Returns:
+            dict[str, list[dict[str, str]]]: for each hazard number, the
+                                             sub_routine, code_file and
+                                             mk_file_path of each mention, in
+                                             the order of docstring_all.
+        """
+        index: dict[str, list[dict[str, str]]] = {}
+        function_info: dict[str, Any] = {}
+        hazard: dict[str, Any] = {}
+
+        if referenced_hazards is None:
+            referenced_hazards = self.docstring_all()
+
+        for function_info in referenced_hazards:
+            for hazard in function_info["hazards"]:
+                if hazard["hazard_number"] is None:
+                    continue
+
+                index.setdefault(hazard["hazard_number"], []).append(
+                    {
+                        "sub_routine": hazard["sub_routine"],
+                        "code_file": function_info["code_file"],
+                        "mk_file_path": function_info["mk_file_path"],
+                    }
+                )
+
+        return index
+
+    def hazards_extracted(
+        self, file_paths: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Extracts hazards from several Python files
+
+        With more than one worker (see __init__), files that are not already
+        cached are parsed by a pool of processes. The results are the same,
+        whichever way they are extracted.
+
+        Args:
+            file_paths (list[str]): The file paths. Duplicates are extracted
+                                    once.
+
+        Returns:
+            dict[str, list[dict[str, Any]]]: the hazards of each file, as
+                                             extract_hazards.
+        """
+        hazards: dict[str, list[dict[str, Any]]] = {}
+        to_parse: list[str] = []
+        cached: Optional[list[dict[str, Any]]] = None
+        file_path: str = ""
+        file_hazards: list[dict[str, Any]] = []
+
+        for file_path in dict.fromkeys(file_paths):
+            if self.workers <= 1:
+                hazards[file_path] = self.extract_hazards(file_path)
+                continue
+
+            cached = self.cache.get(file_path, "hazards")
+            if cached is not None:
+                hazards[file_path] = cached
+            else:
+                to_parse.append(file_path)
+
+        if len(to_parse) == 1:
+            hazards[to_parse[0]] = self.extract_hazards(to_parse[0])
+
+        elif to_parse:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(to_parse)),
+                initializer=_pool_initialise,
+                initargs=(self.project_id,),
+            ) as executor:
+                # map returns results in the order of to_parse
+                for file_path, file_hazards in zip(
+                    to_parse,
+                    executor.map(
+                        _pool_extract_hazards,
+                        to_parse,
+                        chunksize=max(1, len(to_parse) // (self.workers * 4)),
+                    ),
+                ):
+                    hazards[file_path] = file_hazards
+                    self.cache.set(file_path, "hazards", file_hazards)
+
+        return hazards
+
+    def source_index(self, project_folder: str) -> dict[str, list[str]]:
+        """Indexes the Python files of a project by file name
+
+        Uses git to list the files if the project is a git checkout, otherwise
+        walks the project folder. Either way, ignore-listed folders (see
+        c.SOURCE_IGNORE_DIRECTORIES) and git ignored files are skipped.
+
+        Args:
+            project_folder (str): The project folder.
+
+        Returns:
+            dict[str, list[str]]: sorted file paths, keyed by file name.
+        """
+        file_paths: Optional[list[str]] = None
+        index: dict[str, list[str]] = {}
+        file_path: str = ""
+
+        file_paths = self.source_files_git(project_folder)
+        if file_paths is None:
+            file_paths = self.source_files_walk(project_folder)
+
+        for file_path in sorted(file_paths):
+            index.setdefault(os.path.basename(file_path), []).append(file_path)
+
+        return index
+
+    def source_files_git(self, project_folder: str) -> Optional[list[str]]:
+        """Lists the Python files tracked by git
+
+        Includes untracked files that are not ignored, so new files are found
+        before they are committed.
+
+        Args:
+            project_folder (str): The project folder.
+
+        Returns:
+            Optional[list[str]]: The file paths, or None if the project folder
+                                 is not the root of a git checkout.
+        """
+        output: str = ""
+        relative_path: str = ""
+        file_paths: list[str] = []
+        directories: list[str] = []
+        virtual_environments: dict[str, bool] = {}
+
+        if not Path(f"{ project_folder }.git").exists():
+            return None
+
+        try:
+            output = Repo(project_folder).git.ls_files(
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                "-z",
+                "--",
+                "*.py",
+            )
+        except GitError:
+            return None
+
+        for relative_path in output.split("\0"):
+            directories = relative_path.split("/")[:-1]
+            if not relative_path or any(
+                part in c.SOURCE_IGNORE_DIRECTORIES for part in directories
+            ):
+                continue
+
+            # Untracked virtual environments are not always git ignored
+            if self._in_virtual_environment(
+                project_folder, directories, virtual_environments
+            ):
+                continue
+
+            if Path(f"{ project_folder }{ relative_path }").is_file():
+                file_paths.append(f"{ project_folder }{ relative_path }")
+
+        return file_paths
+
+    def source_files_walk(self, project_folder: str) -> list[str]:
+        """Lists the Python files found by a pruned walk
+
+        Folders in c.SOURCE_IGNORE_DIRECTORIES, virtual environments (any
+        folder with a pyvenv.cfg file) and paths matching the project's
+        .gitignore are not walked.
+
+        Args:
+            project_folder (str): The project folder.
+
+        Returns:
+            list[str]: The file paths.
+        """
+        ignore_patterns: list[str] = self._gitignore_patterns(project_folder)
+        file_paths: list[str] = []
+        relative_path: str = ""
+
+        for path, directories, files in os.walk(project_folder):
+            relative_path = os.path.relpath(path, project_folder)
+            if relative_path == ".":
+                relative_path = ""
+
+            directories[:] = [
+                directory
+                for directory in directories
+                if directory not in c.SOURCE_IGNORE_DIRECTORIES
+                and not Path(path, directory, "pyvenv.cfg").exists()
+                and not self._gitignored(
+                    os.path.join(relative_path, directory),
+                    ignore_patterns,
+                    True,
+                )
+            ]
+
+            for name in files:
+                if fnmatch(name, "*.py") and not self._gitignored(
+                    os.path.join(relative_path, name), ignore_patterns, False
+                ):
+                    file_paths.append(os.path.join(path, name))
+
+        return file_paths
+
+    def _in_virtual_environment(
+        self,
+        project_folder: str,
+        directories: list[str],
+        checked: dict[str, bool],
+    ) -> bool:
+        """Checks if a path is inside a virtual environment
+
+        Args:
+            project_folder (str): The project folder.
+            directories (list[str]): The folders of the path, relative to the
+                                     project folder.
+            checked (dict[str, bool]): folders already checked, updated with
+                                       the folders checked by this call.
+
+        Returns:
+            bool: True if any of the folders holds a pyvenv.cfg file.
+        """
+        directory: str = ""
+
+        for length in range(1, len(directories) + 1):
+            directory = "/".join(directories[:length])
+            if directory not in checked:
+                checked[directory] = Path(
+                    f"{ project_folder }{ directory }/pyvenv.cfg"
+                ).exists()
+            if checked[directory]:
+                return True
+
+        return False
+
+    def _gitignore_patterns(self, project_folder: str) -> list[str]:
+        """Reads the patterns in the project's top level .gitignore
+
+        Negated patterns are not supported, and are skipped.
+
+        Args:
+            project_folder (str): The project folder.
+
+        Returns:
+            list[str]: The patterns.
+        """
+        patterns: list[str] = []
+        line: str = ""
+
+        try:
+            with open(f"{ project_folder }.gitignore", "r") as file:
+                for line in file.read().splitlines():
+                    line = line.strip()
+                    if line and not line.startswith(("#", "!")):
+                        patterns.append(line)
+        except OSError:
+            return []
+
+        return patterns
+
+    def _gitignored(
+        self, relative_path: str, patterns: list[str], is_directory: bool
+    ) -> bool:
+        """Checks if a path matches a .gitignore pattern
+
+        Args:
+            relative_path (str): The path, relative to the project folder.
+            patterns (list[str]): The .gitignore patterns.
+            is_directory (bool): True if the path is a folder.
+
+        Returns:
+            bool: True if the path is ignored.
+        """
+        pattern: str = ""
+
+        for pattern in patterns:
+            if pattern.endswith("/"):
+                if not is_directory:
+                    continue
+                pattern = pattern.rstrip("/")
+
+            if "/" in pattern:
+                if fnmatch(relative_path, pattern.lstrip("/")):
+                    return True
+            elif fnmatch(os.path.basename(relative_path), pattern):
+                return True
+
+        return False
+
     def extract_docstrings(self, file_path: str) -> list[Tuple[str, Any]]:
         """Extracts docstrings from Python files
 
-        Extracts docstrings from Python files.
+        Extracts docstrings from Python files. Results are cached until the
+        file changes.
 
         Args:
             file_path (str): The file path.
@@ -124,10 +517,15 @@ class DocstringManipulation:
         file: Optional[TextIO] = None
         tree: Optional[ast.AST] = None
         node: Optional[ast.AST] = None
+        cached: Optional[list[list[Any]]] = None
 
         if not Path(file_path).exists():
             return []
 
+        cached = self.cache.get(file_path, "docstrings")
+        if cached is not None:
+            return [(sub_routine, doc) for sub_routine, doc in cached]
+
         with open(file_path, "r") as file:
             file_contents = file.read()
             tree = ast.parse(file_contents, filename=file_path)
@@ -155,12 +553,15 @@ class DocstringManipulation:
                         )
                     )
 
+        self.cache.set(file_path, "docstrings", docstrings)
+
         return docstrings
 
     def extract_hazards(self, file_path: str) -> list[dict[str, Any]]:
         """Extracts hazards from Python files
 
-        Extracts hazards from Python files.
+        Extracts hazards from Python files. Results are cached until the file
+        changes.
 
         Args:
             file_path (str): The file path.
@@ -178,10 +579,15 @@ class DocstringManipulation:
         line: str = ""
         match: Optional[re.Match[Any]] = None
         section_content: list[dict[str, Any]] = []
+        cached: Optional[list[dict[str, Any]]] = None
 
         if not Path(file_path).exists():
             return []
 
+        cached = self.cache.get(file_path, "hazards")
+        if cached is not None:
+            return list(cached)
+
         docstrings = self.extract_docstrings(file_path)
 
         for (
@@ -217,4 +623,6 @@ class DocstringManipulation:
                     elif line.strip() == f"{ HAZARD_TITLE }":
                         section_found = True
 
+        self.cache.set(file_path, "hazards", section_content)
+
         return section_content
@@ -10,19 +10,19 @@ import time as t
 import os
 from typing import Any, Optional
 from subprocess import CompletedProcess  # nosec B404
-import subprocess  # nosec B404
 from pathlib import Path
 from fnmatch import fnmatch
 import re
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 from datetime import datetime
 
 from django.template.loader import (
     render_to_string,
 )
 from django.utils import timezone
+from django.utils.html import strip_tags
 
-from app.models import Project
+from app.models import Project, BuildRun, BuildRunStatus
 
 import app.functions.constants as c
 from app.functions.project_builder import (
@@ -31,6 +31,15 @@ from app.functions.project_builder import (
 from app.functions.docstring_manipulation import (
     DocstringManipulation,
 )
+from app.functions.build_lock import BuildLock
+from app.functions.build_progress import BuildProgress
+from app.functions.build_telemetry import BuildTelemetry
+from app.functions.build_manifest import BuildManifest
+from app.functions.mkdocs_engine import MkdocsEngine
+from app.functions.site_publisher import SitePublisher
+from app.functions.site_chrome import SiteChrome
+from app.functions.site_compressor import SiteCompressor
+from app.functions.asset_store import AssetStore
 
 
 class MkdocsControl:
@@ -49,6 +58,11 @@ class MkdocsControl:
         self.process_arg1: str = "serve"
         self.documentation_pages: str = ""
         self.project_folder: str = ""
+        self.page_titles: dict[str, str] = {}
+        self.build_succeeded: bool = False
+        self.progress: Optional[BuildProgress] = None
+        self.telemetry: BuildTelemetry = BuildTelemetry()
+        self.incremental: bool = False
 
         if not isinstance(project_id, int):
             if not project_id.isdigit():
@@ -108,8 +122,10 @@ class MkdocsControl:
         entry_form: dict[str, Any]
         icon_html: str = ""
         code_html: str = ""
-        referenced_hazards: list[dict[str, Any]] = []
+        referenced_hazards: dict[str, list[dict[str, str]]] = {}
         function_hazards: list[str] = []
+        env: Environment
+        icons_template: Optional[Template] = None
 
         if not Path(entries_dir).is_dir():
             return (
@@ -148,7 +164,17 @@ class MkdocsControl:
         # TODO - should check there are no files with same entry number (eg hazard-1 and hazard-01 and hazard-001)
 
         docstring = DocstringManipulation(self.project_id)
-        referenced_hazards = docstring.docstring_all()
+        with self.telemetry.phase("docstrings"):
+            referenced_hazards = docstring.hazard_index()
+        self.telemetry.count("files_scanned", docstring.files_scanned)
+
+        # One builder and template environment for the whole run, so the
+        # entry and jinja templates are only parsed once
+        project = ProjectBuilder(self.project_id)
+        env = Environment(
+            loader=FileSystemLoader(entry_template_dir),
+            autoescape=True,
+        )
 
         for file in files_to_check:
             icon_html = ""
@@ -166,41 +192,32 @@ class MkdocsControl:
             except:
                 entry_number = "[Number not defined]"
 
-            for function_info in referenced_hazards:
-                for hazard in function_info["hazards"]:
-                    if hazard["hazard_number"] == entry_number:
-                        function_hazards.append(function_info["mk_file_path"])
+            for link in referenced_hazards.get(entry_number, []):
+                function_hazards.append(link["mk_file_path"])
 
-                        # print(entry_number)
-                        # print(function_hazards)
-
-            project = ProjectBuilder(self.project_id)
             # TODO - need to figure out which entry_types are preprocessed
             contents_list = project.entry_read_with_field_types("hazard", file)
 
             for field in contents_list:
                 if field["field_type"] == "icon":
-                    env = Environment(
-                        loader=FileSystemLoader(entry_template_dir),
-                        autoescape=True,
-                    )
-                    template = env.get_template(f"{ entry_type }-icons.md")
+                    if icons_template is None:
+                        icons_template = env.get_template(
+                            f"{ entry_type }-icons.md"
+                        )
 
                     context = {"contents_list": contents_list}
-                    icon_html = template.render(context)
+                    icon_html = icons_template.render(context)
                     icon_html = f"{ icon_html }\n<!-- [iconend] -->"
 
                 elif field["field_type"] == "code":
                     code_html = ""
 
-                    for function in referenced_hazards:
-                        for hazard in function["hazards"]:
-                            if hazard["hazard_number"] == entry_number:
-                                code_html += (
-                                    f"[{ function['code_file'].replace('.py', '') }"
-                                    f".{ hazard['sub_routine']}](../../{ function['mk_file_path'] }"
-                                    f"#{ hazard['sub_routine']}_hazard)\n\n"
-                                )
+                    for link in referenced_hazards.get(entry_number, []):
+                        code_html += (
+                            f"[{ link['code_file'].replace('.py', '') }"
+                            f".{ link['sub_routine']}](../../{ link['mk_file_path'] }"
+                            f"#{ link['sub_routine']}_hazard)\n\n"
+                        )
 
                     code_html = code_html.rstrip("\n\n")
 
@@ -217,6 +234,7 @@ class MkdocsControl:
                 entry_form,
                 entry_type,
                 entry_number,
+                timestamp=False,
             )
             pattern = re.compile(
                 r"<!--\s*\[icon\]\s*-->.*?<!--\s*\[iconend\]\s*-->",
@@ -240,9 +258,6 @@ class MkdocsControl:
             )
 
         # Creating the summary
-        env = Environment(
-            loader=FileSystemLoader(entry_template_dir), autoescape=True
-        )
         template = env.get_template(
             f"{ entry_type }{ c.ENTRY_SUMMARY_SUFFIX }"
         )
@@ -265,9 +280,43 @@ class MkdocsControl:
         else:
             return "<b>Successful preprocessor step</b>" "<br><hr>"
 
-    def build(self) -> str:
-        """ """
-        command: list[str] = []
+    def build(
+        self,
+        pages: Optional[list[str]] = None,
+        titles: Optional[dict[str, str]] = None,
+    ) -> str:
+        """Builds the static pages with mkdocs
+
+        The build runs in-process (see MkdocsEngine), so the mkdocs plugins
+        are only imported once per process. After the build, page_titles holds
+        the titles of the pages rendered, and build_succeeded and incremental
+        are set.
+
+        If only some pages are rendered and one of their titles has changed,
+        all pages are rendered again before publishing, as a title is in the
+        navigation of every page.
+
+        The site is built into a staging folder and only published (see
+        SitePublisher) if the build succeeds, so readers never see a partly
+        built site. Before it is published, the platform bar is added to its
+        pages (see SiteChrome), precompressed copies of its pages are written
+        (see SiteCompressor), and files shared with other sites are linked to
+        a single copy (see AssetStore). mkdocs log messages are also written
+        to self.progress, if set, as they are logged.
+
+        Args:
+            pages (Optional[list[str]]): pages to render, relative to the docs
+                                         folder. None renders all pages.
+            titles (Optional[dict[str, str]]): titles of the pages from the
+                                               previous build.
+
+        Returns:
+            str: the build result and its stdout and stderr, formatted for
+                 html.
+
+        Raises:
+            FileExistsError: if the output directory does not exist.
+        """
         command_output_dir: str = (
             f"{ c.DOCUMENTATION_PAGES }/project_{ self.project_id }"
         )
@@ -275,27 +324,48 @@ class MkdocsControl:
         command_output_html: str = ""
         stdout_result: str = ""
         stderr_result: str = ""
+        engine: MkdocsEngine = MkdocsEngine()
+        publisher: SitePublisher = SitePublisher(self.project_id)
+        asset_store: AssetStore = AssetStore()
+        staging_path: str = ""
 
         if not Path(command_output_dir).is_dir():
             raise FileExistsError(
                 f"'{ command_output_dir }' directory does not exist"
             )
 
-        command = [
-            "/usr/local/bin/mkdocs",
-            "build",
-            "-d",
-            command_output_dir,
-        ]
-
-        command_output = subprocess.run(
-            command,
-            shell=False,
-            check=False,
-            cwd=self.documents_directory,
-            capture_output=True,
-            text=True,
-        )  # nosec B603
+        # An incremental build starts from the live site
+        staging_path = publisher.stage(copy_current=pages is not None)
+        command_output = self._render(engine, staging_path, pages, titles)
+
+        if pages is not None and any(
+            (titles or {}).get(page) != title
+            for page, title in engine.titles.items()
+        ):
+            # Rendered again from scratch, so only one generation is published
+            publisher.discard(staging_path)
+            self._phase("mkdocs, all pages")
+            pages = None
+            staging_path = publisher.stage()
+            command_output = self._render(engine, staging_path, None, None)
+
+        self.page_titles = engine.titles
+        self.build_succeeded = command_output.returncode == 0
+        self.incremental = pages is not None
+        # Of the published site only, not of a discarded render
+        self.telemetry.count("pages_written", len(engine.titles))
+
+        with self.telemetry.phase("publish"):
+            if self.build_succeeded:
+                SiteChrome(self.project_id).inject(staging_path)
+                SiteCompressor(self.project_id).compress(
+                    staging_path, os.path.realpath(command_output_dir)
+                )
+                asset_store.deduplicate(staging_path)
+                publisher.publish(staging_path)
+                asset_store.collect()
+            else:
+                publisher.discard(staging_path)
 
         if command_output.returncode == 0:
             command_output_html += "<b>Successful mkdocs build</b>"
@@ -314,46 +384,234 @@ class MkdocsControl:
 
         return command_output_html
 
-    def build_documents(self, force: bool = False) -> str:
+    def _render(
+        self,
+        engine: MkdocsEngine,
+        staging_path: str,
+        pages: Optional[list[str]],
+        titles: Optional[dict[str, str]],
+    ) -> CompletedProcess[str]:
+        """Renders pages with mkdocs into a staging folder
+
+        Args:
+            engine (MkdocsEngine): the in-process mkdocs.
+            staging_path (str): the folder to build the site in.
+            pages (Optional[list[str]]): pages to render, relative to the docs
+                                         folder. None renders all pages.
+            titles (Optional[dict[str, str]]): titles of the pages from the
+                                               previous build.
+
+        Returns:
+            CompletedProcess[str]: the result of the mkdocs build.
+        """
+        command_output: CompletedProcess[str]
+
+        with self.telemetry.phase("mkdocs"):
+            command_output = engine.build(
+                f"{ self.documents_directory }{ c.MKDOCS_CONFIG_FILE }",
+                staging_path,
+                pages,
+                titles,
+                self.progress.handler() if self.progress is not None else None,
+            )
+
+        return command_output
+
+    def build_required(self) -> bool:
+        """Checks if the static pages are out of date
+
+        The static pages need building if the project has never been built, or
+        if the content of the documents differs from the last build. The
+        content is only compared if the documents have been saved since the
+        last build (or the last content check), so most calls are a timestamp
+        comparison.
+
+        Returns:
+            bool: True if a build is required.
+        """
+        project: Project = Project.objects.get(id=self.project_id)
+        last_build: Optional[datetime] = project.last_built
+        last_modified: Optional[datetime] = project.last_modified
+        last_verified: Optional[datetime] = None
+        manifest: BuildManifest = BuildManifest(self.project_id)
+
+        if not isinstance(last_build, datetime):
+            return True
+
+        last_verified = manifest.verified()
+        if isinstance(last_verified, datetime):
+            last_build = max(last_build, last_verified)
+
+        if isinstance(last_modified, datetime) and last_modified < last_build:
+            return False
+
+        if manifest.changed():
+            return True
+
+        manifest.verify()
+        return False
+
+    def build_documents(
+        self, force: bool = False, progress: Optional[BuildProgress] = None
+    ) -> str:
         """Build the documents static pages
 
-        Builds the documents static pages if any documents have been modified since
-        last build.
+        Only one build of a project runs at a time, across all processes (see
+        BuildLock). A caller that has to wait for another build reuses that
+        build's output if it started after this call was made, as it will
+        have included all changes up to then. build_succeeded is then that of
+        the build reused.
 
         Args:
-            project_id (str): the primary key for the project
+            force (bool): build all pages, even if the documents have not been
+                          modified.
+            progress (Optional[BuildProgress]): receives the output and phases
+                                                of the build as it runs.
+
+        Returns:
+            str: the build output formatted for html, or an empty string if no
+                 build was needed.
         """
+        requested: datetime = timezone.now()
         project: Project
-        time_now = timezone.now()
+        build_lock: BuildLock = BuildLock(self.project_id)
+
+        self.progress = progress
+        if build_lock.locked():
+            self._phase("waiting for another build")
+
+        try:
+            with build_lock:
+                project = Project.objects.get(id=self.project_id)
+                if (
+                    project.last_built is not None
+                    and project.last_built >= requested
+                ):
+                    self._phase("reused the output of the previous build")
+                    self.build_succeeded = (
+                        BuildRun.objects.filter(project=project)
+                        .order_by("-started", "-id")
+                        .values_list("status", flat=True)
+                        .first()
+                        == BuildRunStatus.SUCCEEDED
+                    )
+                    return project.build_output or ""
+
+                return self._build_documents(force)
+        except TimeoutError:
+            return "Timed out waiting for another build to finish!"
+
+    def _build_documents(self, force: bool) -> str:
+        """Build the documents static pages, with the build lock held
+
+        Builds the documents static pages if any documents have been modified
+        since last build. A BuildRun (see BuildTelemetry) is recorded for each
+        build that runs, including failed builds.
+
+        Args:
+            force (bool): build all pages, even if the documents have not been
+                          modified.
+
+        Returns:
+            str: the build output formatted for html, or an empty string if no
+                 build was needed.
+        """
         build_output: str = ""
-        last_build: Optional[datetime] = None
-        last_modified: Optional[datetime] = None
-        preprocessor_output: str = ""
+        status: BuildRunStatus = BuildRunStatus.SUCCEEDED
 
-        project = project = Project.objects.get(id=self.project_id)
-        last_build = project.last_built
-        last_modified = project.last_modified
+        if not force and not self.build_required():
+            self._phase("no changes to build")
+            return ""
 
-        if (
-            isinstance(last_modified, datetime)
-            and isinstance(last_build, datetime)
-            and not force
-        ):
-            if last_modified < last_build:
-                return ""
+        self.telemetry = BuildTelemetry()
+
+        try:
+            build_output = self._build_steps(force)
+        except Exception as error:
+            self.telemetry.record(
+                self.project_id, BuildRunStatus.FAILED, str(error)
+            )
+            raise
+
+        if build_output == "Preprocessor error!":
+            status = BuildRunStatus.PREPROCESSOR_ERROR
+        elif not self.build_succeeded:
+            status = BuildRunStatus.MKDOCS_ERROR
+
+        self.telemetry.record(
+            self.project_id,
+            status,
+            build_output,
+            incremental=self.incremental,
+        )
+        return build_output
+
+    def _build_steps(self, force: bool) -> str:
+        """Runs the preprocessor and mkdocs, and saves the build state
 
-        preprocessor_output = self.preprocessor()
+        Only the pages whose inputs have changed are rendered, unless the set
+        of pages, their titles or the mkdocs configuration has changed (see
+        BuildManifest.pages_changed).
+
+        Args:
+            force (bool): build all pages.
+
+        Returns:
+            str: the build output formatted for html.
+        """
+        project: Project
+        time_now = timezone.now()
+        build_output: str = ""
+        preprocessor_output: str = ""
+        manifest: BuildManifest = BuildManifest(self.project_id)
+        pages: Optional[list[str]] = None
+        titles: dict[str, str] = {}
+
+        project = Project.objects.get(id=self.project_id)
+
+        self._phase("preprocessor")
+        with self.telemetry.phase("preprocessor"):
+            preprocessor_output = self.preprocessor()
+        if self.progress is not None:
+            self.progress.write(
+                strip_tags(preprocessor_output.replace("<br>", "\n")) + "\n"
+            )
         if preprocessor_output == "":
             return "Preprocessor error!"
 
-        build_output = self.build()
+        # After the preprocessor, so its own rewrites are part of the manifest
+        manifest.snapshot()
+        if not force:
+            pages = manifest.pages_changed()
+        titles = manifest.titles()
+
+        self._phase("mkdocs")
+        build_output = self.build(pages, titles)
         if build_output == "":
             return "mkdocs build error!"
 
+        if not self.incremental:
+            titles = {}
+        titles.update(self.page_titles)
+
         build_output = f"{ preprocessor_output } {build_output}"
 
+        manifest.save(titles if self.build_succeeded else None)
+
+        # Only these fields, as the project may have been changed (eg made
+        # private) while it was building
         project.last_built = time_now
         project.build_output = build_output
-        project.save()
+        project.save(update_fields=["last_built", "build_output"])
 
         return build_output
+
+    def _phase(self, name: str) -> None:
+        """Marks the start of a build phase in the build progress, if any
+
+        Args:
+            name (str): name of the phase.
+        """
+        if self.progress is not None:
+            self.progress.phase(name)
+        return
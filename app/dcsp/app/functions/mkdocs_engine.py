@@ -0,0 +1,315 @@
+"""In-process mkdocs builds
+
+Runs mkdocs through its Python API rather than spawning the mkdocs command for
+each build. A long running process (the build worker) imports mkdocs, its
+plugins and themes once, so each build only pays for the build itself.
+
+Builds can also be incremental, re-rendering only a given list of pages and
+keeping the rest of a previous build.
+
+Classes:
+    IncrementalPlugin: limits a build to the changed pages.
+    MkdocsEngine: warm up and run in-process mkdocs builds.
+"""
+
+import os
+import io
+import json
+import logging
+from contextlib import redirect_stdout
+from subprocess import CompletedProcess  # nosec B404
+from typing import Any, Optional
+
+from mkdocs.commands import build as mkdocs_build
+from mkdocs.config import load_config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import BasePlugin, event_priority, get_plugins
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.nav import Navigation
+from mkdocs.structure.pages import Page
+from mkdocs.utils import get_themes
+
+logger = logging.getLogger(__name__)
+
+
+class DirtyWarningFilter(logging.Filter):
+    """Drops the mkdocs warning about dirty builds
+
+    Incremental builds are dirty builds on purpose, and the warning would
+    otherwise abort builds in strict mode.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return "A 'dirty' build is being performed" not in record.getMessage()
+
+
+# BasePlugin.__init_subclass__ is not annotated in mkdocs
+class IncrementalPlugin(BasePlugin):  # type: ignore[type-arg, no-untyped-call]
+    """Limits a build to the changed pages
+
+    Added to every build made by MkdocsEngine. When given a list of pages,
+    only those pages (and any page missing from the site) are rendered. Pages
+    that are not rendered keep their previous title in the navigation, and
+    keep their entries in the search index.
+
+    The title of each rendered page is recorded, so the caller can tell if
+    the navigation of the other pages is now out of date.
+    """
+
+    def __init__(
+        self,
+        pages: Optional[list[str]] = None,
+        titles: Optional[dict[str, str]] = None,
+    ) -> None:
+        """Initialises the IncrementalPlugin class
+
+        Args:
+            pages (Optional[list[str]]): pages to render, relative to the docs
+                                         folder. None renders all pages.
+            titles (Optional[dict[str, str]]): titles of the pages from the
+                                               previous build.
+        """
+        super().__init__()
+        self.pages: Optional[set[str]] = None
+        self.titles: dict[str, str] = titles or {}
+        self.built: dict[str, str] = {}
+        self.urls_built: set[str] = set()
+        self.search_docs: list[dict[str, Any]] = []
+
+        if pages is not None:
+            self.pages = set(pages)
+
+        return
+
+    def on_pre_build(self, config: MkDocsConfig) -> None:
+        """Keeps the search index of the previous build"""
+        search_index: dict[str, Any] = {}
+
+        if self.pages is None:
+            return
+
+        try:
+            with open(self.search_index_path(config), "r") as file:
+                search_index = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self.search_docs = search_index.get("docs", [])
+        return
+
+    def on_files(self, files: Files, config: MkDocsConfig) -> Files:
+        """Marks which pages need rendering"""
+        file: File
+
+        if self.pages is None:
+            return files
+
+        for file in files.documentation_pages():
+            if file.src_uri in self.pages or not os.path.isfile(
+                file.abs_dest_path
+            ):
+                file.is_modified = lambda: True  # type: ignore[method-assign]
+            else:
+                file.is_modified = lambda: False  # type: ignore[method-assign]
+
+        return files
+
+    def on_nav(
+        self, nav: Navigation, config: MkDocsConfig, files: Files
+    ) -> Navigation:
+        """Restores the titles of the pages that are not rendered"""
+        page: Page
+
+        if self.pages is None:
+            return nav
+
+        for page in nav.pages:
+            if (
+                not page.file.is_modified()
+                and page.file.src_uri in self.titles
+            ):
+                page.title = self.titles[page.file.src_uri]
+
+        return nav
+
+    def on_post_page(
+        self, output: str, page: Page, config: MkDocsConfig
+    ) -> str:
+        """Records the title of a rendered page"""
+        self.built[page.file.src_uri] = str(page.title)
+        self.urls_built.add(page.url)
+        return output
+
+    @event_priority(-100)
+    def on_post_build(self, config: MkDocsConfig) -> None:
+        """Adds the search entries of the pages that were not rendered"""
+        search_index: dict[str, Any] = {}
+        search_index_path: str = self.search_index_path(config)
+
+        if self.pages is None or not self.search_docs:
+            return
+
+        try:
+            with open(search_index_path, "r") as file:
+                search_index = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        search_index["docs"] = [
+            doc
+            for doc in self.search_docs
+            if doc.get("location", "").split("#")[0] not in self.urls_built
+        ] + search_index.get("docs", [])
+
+        with open(search_index_path, "w") as file:
+            json.dump(search_index, file)
+
+        return
+
+    def search_index_path(self, config: MkDocsConfig) -> str:
+        """Returns the path of the search index in the site folder"""
+        return os.path.join(config.site_dir, "search", "search_index.json")
+
+
+class MkdocsEngine:
+    """Warm up and run in-process mkdocs builds
+
+    The result of a build is returned as a CompletedProcess, with the same
+    return code and output streams as the mkdocs command would give, so
+    callers can handle both in the same way.
+
+    functions:
+        warm_up: imports the installed mkdocs plugins and themes.
+        build: builds a mkdocs site.
+    """
+
+    warm: bool = False
+
+    def __init__(self) -> None:
+        """Initialises the MkdocsEngine class"""
+        self.titles: dict[str, str] = {}
+        return
+
+    def warm_up(self) -> None:
+        """Imports the installed mkdocs plugins and themes
+
+        Only done once per process. Plugins that fail to import are logged
+        and skipped, so that the build reports the error as it would have
+        done without the warm up.
+        """
+        if MkdocsEngine.warm:
+            return
+
+        for name, entry_point in get_plugins().items():
+            try:
+                entry_point.load()
+            except Exception as error:
+                logger.warning(
+                    f"mkdocs plugin '{ name }' failed to load: { error }"
+                )
+
+        for name, entry_point in get_themes().items():
+            try:
+                entry_point.load()
+            except Exception as error:
+                logger.warning(
+                    f"mkdocs theme '{ name }' failed to load: { error }"
+                )
+
+        MkdocsEngine.warm = True
+        return
+
+    def build(
+        self,
+        config_file: str,
+        site_dir: str,
+        pages: Optional[list[str]] = None,
+        titles: Optional[dict[str, str]] = None,
+        progress: Optional[logging.Handler] = None,
+    ) -> CompletedProcess[str]:
+        """Builds a mkdocs site
+
+        Equivalent to running 'mkdocs build -d site_dir' in the folder of the
+        configuration file. mkdocs log messages are captured as stderr, in
+        the format the mkdocs command uses when not writing to a terminal.
+
+        If pages is given, the build is incremental (see IncrementalPlugin).
+        After the build, the titles attribute holds the titles of the pages
+        rendered.
+
+        Args:
+            config_file (str): path to the mkdocs.yml configuration file.
+            site_dir (str): the folder to write the site to.
+            pages (Optional[list[str]]): pages to render, relative to the docs
+                                         folder. None renders all pages.
+            titles (Optional[dict[str, str]]): titles of the pages from the
+                                               previous build, used for pages
+                                               that are not rendered.
+            progress (Optional[logging.Handler]): also receives the mkdocs
+                                                  log messages, as they are
+                                                  logged.
+
+        Returns:
+            CompletedProcess[str]: return code 0 if the build succeeded, else
+                                   1, with the captured stdout and stderr.
+        """
+        mkdocs_logger: logging.Logger = logging.getLogger("mkdocs")
+        build_logger: logging.Logger = logging.getLogger(
+            "mkdocs.commands.build"
+        )
+        level: int = mkdocs_logger.level
+        stderr: io.StringIO = io.StringIO()
+        stdout: io.StringIO = io.StringIO()
+        handler: logging.Handler = logging.StreamHandler(stderr)
+        dirty_filter: logging.Filter = DirtyWarningFilter()
+        plugin: IncrementalPlugin = IncrementalPlugin(pages, titles)
+        cwd: str = os.getcwd()
+        config: Any = None
+        returncode: int = 0
+
+        self.warm_up()
+        self.titles = {}
+
+        handler.setFormatter(
+            logging.Formatter("%(levelname)-8s-  %(message)s")
+        )
+        mkdocs_logger.addHandler(handler)
+        if progress is not None:
+            mkdocs_logger.addHandler(progress)
+        mkdocs_logger.setLevel(logging.INFO)
+        build_logger.addFilter(dirty_filter)
+
+        try:
+            # Plugins may resolve relative paths against the working directory
+            os.chdir(os.path.dirname(os.path.abspath(config_file)))
+            with redirect_stdout(stdout):
+                config = load_config(
+                    config_file=config_file, site_dir=site_dir
+                )
+                config.plugins["dcsp-incremental"] = plugin
+                config.plugins.on_startup(
+                    command="build", dirty=pages is not None
+                )
+                try:
+                    mkdocs_build.build(config, dirty=pages is not None)
+                finally:
+                    config.plugins.on_shutdown()
+        except Exception as error:
+            returncode = 1
+            mkdocs_logger.error(str(error))
+        finally:
+            os.chdir(cwd)
+            mkdocs_logger.removeHandler(handler)
+            if progress is not None:
+                mkdocs_logger.removeHandler(progress)
+            mkdocs_logger.setLevel(level)
+            build_logger.removeFilter(dirty_filter)
+
+        self.titles = plugin.built
+
+        return CompletedProcess(
+            args=["mkdocs", "build", "-d", site_dir],
+            returncode=returncode,
+            stdout=stdout.getvalue(),
+            stderr=stderr.getvalue(),
+        )
@@ -8,6 +8,7 @@ Classes:
 """
 
 import os
+import copy
 from fnmatch import fnmatch
 import re
 import yaml
@@ -47,6 +48,20 @@ from ..models import (
 )
 from ..forms import PlaceholdersForm
 
+# Parsed entry templates, keyed by path. Each is stored with the modification
+# time and size of the template when parsed, so edited templates are re-read.
+_entry_template_cache: dict[
+    str, tuple[tuple[int, int], list[dict[str, Any]]]
+] = {}
+
+# Entry types and setup step of each project, used on every page (see
+# views.std_context), keyed by project_id. Each is stored with the signatures
+# of the templates folder, documents.yml and setup.ini when read, so changes
+# made by other processes are picked up too.
+_project_metadata_cache: dict[
+    int, tuple[tuple[Optional[tuple[int, int]], ...], dict[str, Any]]
+] = {}
+
 
 class ProjectBuilder:
     """A class to create and manipulate files for mkdocs
@@ -61,6 +76,9 @@ class ProjectBuilder:
         master_template_get: gets the different types of document templates available.
         configuration_get: gets the configuration settings for the project.
         configuration_set: sets the configuration settings for the project.
+        metadata_get: gets the entry types and setup step of the project.
+        metadata_clear: forgets the cached entry types and setup step.
+        _metadata_signature: returns the signatures the metadata depends on.
         copy_templates: copies a project template to the clinical safety folder.
         get_placeholders: gets the placeholders found in markdown files.
         save_placeholders: saves placeholders to yaml.
@@ -68,6 +86,7 @@ class ProjectBuilder:
         read_placeholders: reads placeholders from yaml file.
         entry_exists: checks if an entry of certain type exists.
         entry_file_read: reads the contents of either an entry template or entry instance.
+        _file_signature: returns the modification time and size of a file.
         entry_read_with_field_types: read an instance of a entry with field typing.
         _heading_numbering: creates a numbered heading.
         _create_gui_label: creates a user readable label.
@@ -413,8 +432,81 @@ class ProjectBuilder:
         config = ENVManipulator(configration_file)
 
         config.add(key, str(value))
+        self.metadata_clear()
         return True
 
+    @new_build_prohibit
+    def metadata_get(self) -> dict[str, Any]:
+        """Returns the entry types and setup step of the project
+
+        These are needed on every page of a project, so are cached for the
+        process. The cache is checked against the modification time and size
+        of the templates folder, documents.yml and setup.ini, rather than
+        reading and parsing them.
+
+        Returns:
+            dict[str, Any]: 'entry_templates', the entry types in order, and
+                            'setup_step'.
+
+        Raises:
+            FileNotFoundError: if the clinical safety folder does not exist.
+        """
+        signature: tuple[Optional[tuple[int, int]], ...] = ()
+        cached: Optional[
+            tuple[tuple[Optional[tuple[int, int]], ...], dict[str, Any]]
+        ] = None
+        metadata: dict[str, Any] = {}
+
+        signature = self._metadata_signature()
+        cached = _project_metadata_cache.get(self.project_id)
+
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+
+        metadata = {
+            "entry_templates": self.entry_template_names(),
+            "setup_step": self.configuration_get()["setup_step"],
+        }
+
+        # configuration_get may have written a default setup step, and the
+        # files may have changed while being read, so only cache if the
+        # signature is still the same
+        if self._metadata_signature() == signature:
+            _project_metadata_cache[self.project_id] = (
+                signature,
+                copy.deepcopy(metadata),
+            )
+
+        return metadata
+
+    def metadata_clear(self) -> None:
+        """Forgets the cached entry types and setup step of the project
+
+        For changes made by this process, which a file's signature may not
+        show, eg a second write to setup.ini within the same timestamp.
+        """
+        _project_metadata_cache.pop(self.project_id, None)
+        return
+
+    def _metadata_signature(
+        self,
+    ) -> tuple[Optional[tuple[int, int]], ...]:
+        """Returns the signatures of the files the metadata is read from
+
+        The templates folder's modification time changes when a template is
+        added, removed or renamed, which is all entry_template_names uses.
+
+        Returns:
+            tuple[Optional[tuple[int, int]], ...]: signatures of the templates
+                                                    folder, documents.yml and
+                                                    setup.ini.
+        """
+        return (
+            self._file_signature(self.entries_templates_dir),
+            self._file_signature(self.documents_yaml),
+            self._file_signature(f"{ self.safety_directory }setup.ini"),
+        )
+
     @new_build_prohibit
     def copy_master_template(self, template_chosen: str) -> None:
         """Copies a master template to the clinical safety folder
@@ -441,6 +533,7 @@ class ProjectBuilder:
             self.safety_directory,
             dirs_exist_ok=True,
         )
+        self.metadata_clear()
         return
 
     @new_build_prohibit
@@ -609,6 +702,9 @@ class ProjectBuilder:
     ) -> list[dict[str, Any]]:
         """Read the contents of either an entry template or entry instance
 
+        Parsed templates are cached for the life of the process, and parsed
+        again if the template file is modified.
+
         Args:
             entry_type (str): the type of entry (eg hazard or incident)
             non_template_path (str): if empty string, then read template,
@@ -641,6 +737,7 @@ class ProjectBuilder:
         choice_split: list[str] = []
         choices_dict_split: dict[str, str] = {}
         potential_number: str = ""
+        signature: Optional[tuple[int, int]] = None
 
         if non_template_path == "":
             entry_file_path = f"{ self.entries_templates_dir }{ entry_type }{ c.ENTRY_TEMPLATE_SUFFIX }"
@@ -650,6 +747,15 @@ class ProjectBuilder:
         if not Path(entry_file_path).is_file():
             raise FileNotFoundError(f"'{ entry_file_path }' does not exists")
 
+        if non_template_path == "":
+            signature = self._file_signature(entry_file_path)
+            if (
+                signature is not None
+                and entry_file_path in _entry_template_cache
+                and _entry_template_cache[entry_file_path][0] == signature
+            ):
+                return copy.deepcopy(_entry_template_cache[entry_file_path][1])
+
         lines = open(entry_file_path, "r").read().split("\n")
 
         for line in lines:
@@ -794,8 +900,34 @@ class ProjectBuilder:
                     if potential_number.isdigit():
                         content_list[index]["number"].append(potential_number)
 
+        if signature is not None:
+            _entry_template_cache[entry_file_path] = (
+                signature,
+                copy.deepcopy(content_list),
+            )
+
         return content_list
 
+    def _file_signature(self, file_path: str) -> Optional[tuple[int, int]]:
+        """Returns the modification time and size of a file
+
+        Args:
+            file_path (str): path to the file.
+
+        Returns:
+            Optional[tuple[int, int]]: modification time in nanoseconds and
+                                       size in bytes, or None if the file
+                                       cannot be read.
+        """
+        stat: os.stat_result
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        return (stat.st_mtime_ns, stat.st_size)
+
     def entry_read_with_field_types(
         self,
         entry_type: str,
@@ -889,6 +1021,7 @@ class ProjectBuilder:
         form_data: dict[str, str],
         entry_type: str = "hazard",
         id_new: str = "new",
+        timestamp: bool = True,
     ) -> dict[str, Any]:
         """Create or update entries (eg hazards and incidents)
 
@@ -901,6 +1034,9 @@ class ProjectBuilder:
             entry_type (str): type of entry, eg hazard, incident, officer.
             id_new (str): a valid digit (1 of more) to update an existing entry
                           or the word "new" to create a new one.
+            timestamp (bool): mark the project as modified. The preprocessor
+                              sets this to False, as its rewrites are part of
+                              the build rather than user edits.
 
         Returns:
             dict[str, Any]: returns a dictionary of method outcomes.
@@ -964,7 +1100,8 @@ class ProjectBuilder:
         entry_file.close()
 
         # TODO #54 need to get ride of the 404 in this none view.py code
-        project_timestamp(self.project_id)
+        if timestamp:
+            project_timestamp(self.project_id)
         """project = get_object_or_404(Project, id=self.project_id)
         project.last_modified = timezone.now()
         project.save()"""
@@ -0,0 +1,132 @@
+"""Links to the static sites of public projects, for nginx
+
+The sites of public projects are served by nginx without Django. nginx looks
+for a requested page under the public folder of the documentation pages,
+which holds a link to the live site of each public project, and passes the
+request to Django (view_docs) if it is not found there. The links are kept
+in step with Project.access by signals (see app.signals), so nginx never
+needs reloading.
+
+Classes:
+    PublicSites: keeps the links to the sites of public projects.
+"""
+
+import os
+from pathlib import Path
+
+import app.functions.constants as c
+from app.models import Project, ViewAccess
+
+
+class PublicSites:
+    """Keeps the links to the sites of public projects
+
+    functions:
+        update: adds or removes the link for one project.
+        sync: makes the links match the public projects.
+        linked: returns the projects linked.
+    """
+
+    def __init__(
+        self, documentation_pages: str = c.DOCUMENTATION_PAGES
+    ) -> None:
+        """Initialises the PublicSites class
+
+        Args:
+            documentation_pages (str): the folder served to readers.
+        """
+        self.documentation_pages: str = documentation_pages
+        self.public_path: str = (
+            f"{ documentation_pages }/{ c.PUBLIC_SITES_FOLDER }/"
+        )
+        return
+
+    def update(self, project_id: int, public: bool) -> bool:
+        """Adds or removes the link for one project
+
+        Nothing is done if the documentation pages are not on this host, eg
+        when testing.
+
+        Args:
+            project_id (int): the primary key of the project.
+            public (bool): if the project's site is public.
+
+        Returns:
+            bool: True if the link was added or removed.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        link_path: str = ""
+        temporary_link: str = ""
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        if not os.path.isdir(self.documentation_pages):
+            return False
+
+        link_path = f"{ self.public_path }project_{ project_id }"
+
+        if os.path.islink(link_path) == public:
+            return False
+
+        if not public:
+            os.remove(link_path)
+            return True
+
+        Path(self.public_path).mkdir(exist_ok=True)
+        temporary_link = f"{ link_path }.{ os.getpid() }.tmp"
+
+        if os.path.lexists(temporary_link):
+            os.remove(temporary_link)
+
+        # Relative, and to the live link rather than a generation, so it
+        # follows each publish and rollback (see SitePublisher)
+        os.symlink(f"../project_{ project_id }", temporary_link)
+        os.replace(temporary_link, link_path)
+        return True
+
+    def sync(self) -> tuple[int, int]:
+        """Makes the links match the public projects
+
+        Returns:
+            tuple[int, int]: the number of links added and removed.
+        """
+        public_ids: set[int] = set(
+            Project.objects.filter(access=ViewAccess.PUBLIC).values_list(
+                "id", flat=True
+            )
+        )
+        linked_ids: set[int] = self.linked()
+        added: int = 0
+        removed: int = 0
+
+        for project_id in sorted(public_ids - linked_ids):
+            added += self.update(project_id, True)
+
+        for project_id in sorted(linked_ids - public_ids):
+            removed += self.update(project_id, False)
+
+        return added, removed
+
+    def linked(self) -> set[int]:
+        """Returns the projects linked
+
+        Returns:
+            set[int]: the primary keys of the projects with a link.
+        """
+        linked_ids: set[int] = set()
+
+        if not os.path.isdir(self.public_path):
+            return linked_ids
+
+        for name in os.listdir(self.public_path):
+            if (
+                name.startswith("project_")
+                and name[len("project_") :].isdigit()
+                and os.path.islink(f"{ self.public_path }{ name }")
+            ):
+                linked_ids.add(int(name[len("project_") :]))
+
+        return linked_ids
@@ -0,0 +1,134 @@
+"""Platform navigation added to the pages of built sites
+
+Each page of a project's site starts with a bar linking back to the platform.
+The bar is added to the built pages, rather than as each page is requested,
+so pages are served by nginx as they are stored (see view_docs).
+
+Classes:
+    SiteChrome: adds the platform bar to the pages of a built site.
+"""
+
+import os
+import re
+from typing import Optional
+
+from django.template.loader import render_to_string
+
+import app.functions.constants as c
+
+
+class SiteChrome:
+    """Adds the platform bar to the pages of a built site
+
+    The bar is placed between marker comments just after the <body> tag. An
+    incremental build starts from a copy of the live site, so a page that
+    already has the bar has it replaced rather than added again. Pages whose
+    bar is unchanged are not written, so their precompressed copies are kept
+    (see SiteCompressor).
+
+    functions:
+        render: renders the bar.
+        inject: adds the bar to the pages of a site.
+    """
+
+    BODY_PATTERN: re.Pattern[str] = re.compile(r"<body\b[^>]*>", re.IGNORECASE)
+
+    def __init__(self, project_id: int) -> None:
+        """Initialises the SiteChrome class
+
+        Args:
+            project_id (int): the primary key of the project.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        self.project_id: int = 0
+        self.chrome: str = ""
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        self.project_id = project_id
+        return
+
+    def render(self) -> str:
+        """Renders the bar, between its marker comments
+
+        Returns:
+            str: the html of the bar.
+        """
+        if not self.chrome:
+            self.chrome = (
+                f"{ c.SITE_CHROME_START }"
+                + render_to_string(
+                    c.SITE_CHROME_TEMPLATE, {"project_id": self.project_id}
+                ).strip()
+                + f"{ c.SITE_CHROME_END }"
+            )
+
+        return self.chrome
+
+    def inject(self, site_path: str) -> int:
+        """Adds the bar to the pages of a site
+
+        Args:
+            site_path (str): the folder of the built site.
+
+        Returns:
+            int: the number of pages written.
+        """
+        chrome: str = self.render()
+        file_path: str = ""
+        content: str = ""
+        updated: str = ""
+        written: int = 0
+
+        for path, _, files in os.walk(site_path):
+            for name in files:
+                if not name.endswith(".html"):
+                    continue
+
+                file_path = os.path.join(path, name)
+
+                with open(file_path, "r", encoding="utf-8") as file:
+                    content = file.read()
+
+                updated = self._insert(content, chrome)
+
+                if updated == content:
+                    continue
+
+                with open(file_path, "w", encoding="utf-8") as file:
+                    file.write(updated)
+                written += 1
+
+        return written
+
+    def _insert(self, content: str, chrome: str) -> str:
+        """Places the bar in a page, replacing any bar already there
+
+        Args:
+            content (str): the html of the page.
+            chrome (str): the html of the bar.
+
+        Returns:
+            str: the html of the page with the bar. A page with no <body> tag
+                 is returned unchanged.
+        """
+        start: int = content.find(c.SITE_CHROME_START)
+        end: int = content.find(c.SITE_CHROME_END, start)
+        body: Optional[re.Match[str]] = None
+
+        if start != -1 and end != -1:
+            return (
+                content[:start]
+                + chrome
+                + content[end + len(c.SITE_CHROME_END) :]
+            )
+
+        body = self.BODY_PATTERN.search(content)
+
+        if body is None:
+            return content
+
+        return content[: body.end()] + chrome + content[body.end() :]
@@ -0,0 +1,281 @@
+"""Precompressed copies of built static sites
+
+nginx serves a file's precompressed sibling (eg index.html.gz) in place of the
+file itself when the browser accepts it (gzip_static), so pages are
+compressed once per build rather than on every request.
+
+The brotli package is optional. If it is installed and settings.
+PRECOMPRESS_BROTLI is set, .br siblings are written as well.
+
+Classes:
+    SiteCompressor: writes precompressed siblings of a site's files.
+"""
+
+import os
+import gzip
+import json
+import shutil
+import hashlib
+import importlib
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+from django.conf import settings
+
+import app.functions.constants as c
+
+# Imported by name, as brotli has no type information
+brotli: Optional[ModuleType] = None
+try:
+    brotli = importlib.import_module("brotli")
+except ImportError:
+    pass
+
+
+class SiteCompressor:
+    """Writes precompressed siblings of a site's files
+
+    The hash of each compressed file is recorded in the build state folder.
+    A file is only compressed again if its content has changed, which after
+    an incremental build is only the pages rendered. As with DocstringCache,
+    the size and modification time are compared before the hash.
+
+    functions:
+        compress: writes the siblings of the files in a site.
+        encodings: returns the sibling suffixes written.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        build_state_folder: str = c.BUILD_STATE_FOLDER,
+        use_brotli: Optional[bool] = None,
+    ) -> None:
+        """Initialises the SiteCompressor class
+
+        Args:
+            project_id (int): the primary key of the project.
+            build_state_folder (str): the folder holding build state for all
+                                      projects.
+            use_brotli (Optional[bool]): write .br siblings too. Defaults to
+                                         settings.PRECOMPRESS_BROTLI, and is
+                                         ignored if brotli is not installed.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        self.state_path: str = ""
+        self.use_brotli: bool = False
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        if use_brotli is None:
+            use_brotli = getattr(settings, "PRECOMPRESS_BROTLI", False)
+        self.use_brotli = bool(use_brotli) and brotli is not None
+
+        self.state_path = (
+            f"{ build_state_folder }project_{ project_id }/"
+            f"{ c.PRECOMPRESS_STATE_FILE }"
+        )
+        return
+
+    def encodings(self) -> list[str]:
+        """Returns the sibling suffixes written
+
+        Returns:
+            list[str]: eg ['.gz', '.br'].
+        """
+        return [".gz", ".br"] if self.use_brotli else [".gz"]
+
+    def compress(
+        self, site_path: str, previous_site_path: Optional[str] = None
+    ) -> int:
+        """Writes the siblings of the files in a site
+
+        Siblings of files that no longer exist, or of encodings no longer
+        written, are deleted.
+
+        Args:
+            site_path (str): the folder of the built site.
+            previous_site_path (Optional[str]): the folder of the previous
+                build. Siblings of unchanged files are copied from it, rather
+                than compressed again, eg after a full build.
+
+        Returns:
+            int: the number of files compressed.
+        """
+        previous: dict[str, dict[str, Any]] = self._state_read()
+        state: dict[str, dict[str, Any]] = {}
+        sources: set[str] = set()
+        encodings: list[str] = self.encodings()
+        relative_path: str = ""
+        stat: os.stat_result
+        entry: Optional[dict[str, Any]] = None
+        content: bytes = b""
+        compressed: int = 0
+
+        for path, _, files in os.walk(site_path):
+            for name in files:
+                if Path(name).suffix not in c.PRECOMPRESS_EXTENSIONS:
+                    continue
+
+                file_path = os.path.join(path, name)
+                relative_path = os.path.relpath(file_path, site_path)
+                stat = os.stat(file_path)
+
+                if stat.st_size < c.PRECOMPRESS_MIN_SIZE:
+                    continue
+
+                sources.add(file_path)
+                entry = previous.get(relative_path)
+
+                if (
+                    entry is not None
+                    and entry["size"] == stat.st_size
+                    and entry["mtime_ns"] == stat.st_mtime_ns
+                    and entry["encodings"] == encodings
+                    and self._siblings_exist(file_path, encodings)
+                ):
+                    state[relative_path] = entry
+                    continue
+
+                with open(file_path, "rb") as file:
+                    content = file.read()
+
+                state[relative_path] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                    "encodings": encodings,
+                }
+
+                if (
+                    entry is not None
+                    and entry["sha256"] == state[relative_path]["sha256"]
+                    and entry["encodings"] == encodings
+                ):
+                    if self._siblings_exist(file_path, encodings):
+                        continue
+
+                    if (
+                        previous_site_path is not None
+                        and self._siblings_exist(
+                            os.path.join(previous_site_path, relative_path),
+                            encodings,
+                        )
+                    ):
+                        for suffix in encodings:
+                            shutil.copy2(
+                                os.path.join(
+                                    previous_site_path,
+                                    f"{ relative_path }{ suffix }",
+                                ),
+                                f"{ file_path }{ suffix }",
+                            )
+                        continue
+
+                self._write(file_path, content, encodings)
+                compressed += 1
+
+        self._remove_orphans(site_path, sources, encodings)
+        self._state_write(state)
+        return compressed
+
+    def _write(
+        self, file_path: str, content: bytes, encodings: list[str]
+    ) -> None:
+        """Writes the compressed siblings of a file
+
+        Args:
+            file_path (str): path of the file.
+            content (bytes): content of the file.
+            encodings (list[str]): the sibling suffixes to write.
+        """
+        siblings: dict[str, bytes] = {
+            # mtime=0, so the same content gives the same bytes
+            ".gz": gzip.compress(content, 9, mtime=0),
+        }
+
+        if ".br" in encodings and brotli is not None:
+            siblings[".br"] = brotli.compress(content)
+
+        for suffix, compressed_content in siblings.items():
+            with open(f"{ file_path }{ suffix }", "wb") as file:
+                file.write(compressed_content)
+
+        return
+
+    def _siblings_exist(self, file_path: str, encodings: list[str]) -> bool:
+        """Checks that the siblings of a file exist
+
+        Args:
+            file_path (str): path of the file.
+            encodings (list[str]): the sibling suffixes.
+
+        Returns:
+            bool: True if every sibling exists.
+        """
+        return all(
+            Path(f"{ file_path }{ suffix }").is_file() for suffix in encodings
+        )
+
+    def _remove_orphans(
+        self, site_path: str, sources: set[str], encodings: list[str]
+    ) -> None:
+        """Deletes siblings whose file, or encoding, is no longer compressed
+
+        Args:
+            site_path (str): the folder of the built site.
+            sources (set[str]): paths of the files compressed.
+            encodings (list[str]): the sibling suffixes written.
+        """
+        for path, _, files in os.walk(site_path):
+            for name in files:
+                suffix = Path(name).suffix
+                if suffix not in (".gz", ".br"):
+                    continue
+
+                file_path = os.path.join(path, name)
+                source_path = file_path[: -len(suffix)]
+
+                # Eg a .tar.gz download is part of the site, not a sibling
+                if Path(source_path).suffix not in c.PRECOMPRESS_EXTENSIONS:
+                    continue
+
+                if source_path not in sources or suffix not in encodings:
+                    os.remove(file_path)
+
+        return
+
+    def _state_read(self) -> dict[str, dict[str, Any]]:
+        """Reads the recorded hashes of the files compressed
+
+        Returns:
+            dict[str, dict[str, Any]]: entries keyed by path within the site.
+        """
+        try:
+            with open(self.state_path, "r") as file:
+                state = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        return state if isinstance(state, dict) else {}
+
+    def _state_write(self, state: dict[str, dict[str, Any]]) -> None:
+        """Records the hashes of the files compressed
+
+        Args:
+            state (dict[str, dict[str, Any]]): entries keyed by path within
+                                               the site.
+        """
+        temporary_path: str = f"{ self.state_path }.{ os.getpid() }.tmp"
+
+        Path(self.state_path).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(temporary_path, "w") as file:
+            json.dump(state, file)
+
+        os.replace(temporary_path, self.state_path)
+        return
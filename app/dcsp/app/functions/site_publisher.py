@@ -0,0 +1,217 @@
+"""Atomic publication of built static sites
+
+Each build of a project's static site is written to a new generation folder.
+Once the build has finished, the live folder (a symbolic link) is switched to
+the new generation in one rename, so readers (nginx and view_docs) only ever
+see a complete site. A number of previous generations are kept, so a site can
+be rolled back instantly.
+
+Classes:
+    SitePublisher: stages, publishes and rolls back site generations.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from django.utils import timezone
+
+import app.functions.constants as c
+
+
+class SitePublisher:
+    """Stages, publishes and rolls back site generations
+
+    The live folder, eg /documentation-pages/project_1, is a relative symbolic
+    link to a generation in /documentation-pages/.generations/project_1/.
+
+    functions:
+        stage: creates a folder for a new generation.
+        publish: makes a staged generation live.
+        discard: deletes a staged generation that will not be published.
+        current: returns the name of the live generation.
+        generations: lists the generations, oldest first.
+        rollback: makes an earlier generation live.
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        documentation_pages: str = c.DOCUMENTATION_PAGES,
+        keep: int = c.SITE_GENERATIONS_KEEP,
+    ) -> None:
+        """Initialises the SitePublisher class
+
+        Args:
+            project_id (int): the primary key of the project.
+            documentation_pages (str): the folder served to readers.
+            keep (int): how many previous generations to keep for rollback.
+
+        Raises:
+            TypeError: if project_id is not an integer.
+        """
+        self.live_path: str = ""
+        self.generations_path: str = ""
+        self.keep: int = keep
+
+        if not isinstance(project_id, int):
+            raise TypeError(f"'project_id' '{ project_id }' is not an integer")
+
+        self.live_path = f"{ documentation_pages }/project_{ project_id }"
+        self.generations_path = (
+            f"{ documentation_pages }/{ c.SITE_GENERATIONS_FOLDER }/"
+            f"project_{ project_id }/"
+        )
+        return
+
+    def stage(self, copy_current: bool = False) -> str:
+        """Creates a folder for a new generation
+
+        Args:
+            copy_current (bool): start from a copy of the live site, for
+                                 incremental builds. Files are copied rather
+                                 than linked, as a build rewrites files in
+                                 place.
+
+        Returns:
+            str: path of the staging folder.
+        """
+        staging_path: str = (
+            f"{ self.generations_path }"
+            f"{ timezone.now().strftime('%Y%m%d%H%M%S%f') }"
+        )
+        current_path: str = os.path.realpath(self.live_path)
+
+        Path(self.generations_path).mkdir(parents=True, exist_ok=True)
+
+        if copy_current and Path(current_path).is_dir():
+            shutil.copytree(current_path, staging_path, symlinks=True)
+        else:
+            Path(staging_path).mkdir()
+
+        return staging_path
+
+    def publish(self, staging_path: str) -> None:
+        """Makes a staged generation live
+
+        A new link is created beside the live link and renamed over it, which
+        is atomic. Generations beyond those kept are then deleted.
+
+        Args:
+            staging_path (str): path returned by stage.
+        """
+        self._link(os.path.basename(staging_path))
+        self._prune()
+        return
+
+    def discard(self, staging_path: str) -> None:
+        """Deletes a staged generation that will not be published
+
+        Args:
+            staging_path (str): path returned by stage.
+        """
+        if os.path.realpath(staging_path) != os.path.realpath(self.live_path):
+            shutil.rmtree(staging_path, ignore_errors=True)
+        return
+
+    def current(self) -> Optional[str]:
+        """Returns the name of the live generation
+
+        Returns:
+            Optional[str]: the generation name, or None if no generation has
+                           been published.
+        """
+        if not os.path.islink(self.live_path):
+            return None
+
+        return os.path.basename(os.readlink(self.live_path))
+
+    def generations(self) -> list[str]:
+        """Lists the generations, oldest first
+
+        Returns:
+            list[str]: the generation names.
+        """
+        if not Path(self.generations_path).is_dir():
+            return []
+
+        return sorted(
+            entry.name
+            for entry in os.scandir(self.generations_path)
+            if entry.is_dir(follow_symlinks=False)
+        )
+
+    def rollback(self, generation: Optional[str] = None) -> str:
+        """Makes an earlier generation live
+
+        Args:
+            generation (Optional[str]): the generation to make live. Defaults
+                                        to the one before the live generation.
+
+        Returns:
+            str: the name of the generation now live.
+
+        Raises:
+            ValueError: if there is no such generation.
+        """
+        generations: list[str] = self.generations()
+        current: Optional[str] = self.current()
+
+        if generation is None:
+            if current not in generations or generations.index(current) == 0:
+                raise ValueError("There is no earlier generation")
+            generation = generations[generations.index(current) - 1]
+
+        if generation not in generations:
+            raise ValueError(f"Generation '{ generation }' does not exist")
+
+        self._link(generation)
+        return generation
+
+    def _link(self, generation: str) -> None:
+        """Points the live link at a generation
+
+        A live folder from before generations were used is moved into the
+        generations folder first.
+
+        Args:
+            generation (str): the generation name.
+        """
+        temporary_link: str = f"{ self.live_path }.{ os.getpid() }.tmp"
+        target: str = os.path.relpath(
+            f"{ self.generations_path }{ generation }",
+            os.path.dirname(self.live_path),
+        )
+
+        if Path(self.live_path).is_dir() and not os.path.islink(
+            self.live_path
+        ):
+            os.rename(self.live_path, f"{ self.generations_path }0-initial")
+
+        if os.path.lexists(temporary_link):
+            os.remove(temporary_link)
+
+        os.symlink(target, temporary_link)
+        os.replace(temporary_link, self.live_path)
+        return
+
+    def _prune(self) -> None:
+        """Deletes generations beyond those kept
+
+        The live generation and the newest self.keep others are kept.
+        Abandoned staging folders older than these are deleted too.
+        """
+        current: Optional[str] = self.current()
+        previous: list[str] = [
+            generation
+            for generation in self.generations()
+            if generation != current
+        ]
+
+        for generation in previous[: max(len(previous) - self.keep, 0)]:
+            shutil.rmtree(
+                f"{ self.generations_path }{ generation }", ignore_errors=True
+            )
+
+        return
@@ -0,0 +1,66 @@
+"""Build worker
+
+Runs queued static site builds, outside of the web server processes. mkdocs
+and its plugins are loaded once when the worker starts, and each build then
+runs in-process. Builds left running by a worker that stopped are queued
+again when the worker starts, and then every c.BUILD_RECOVER_INTERVAL
+seconds while the queue is empty.
+
+Usage:
+    python3 manage.py build_worker [--once] [--poll SECONDS]
+"""
+
+import time as t
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+import app.functions.constants as c
+from app.functions.build_queue import BuildQueue
+from app.functions.mkdocs_engine import MkdocsEngine
+
+
+class Command(BaseCommand):
+    help = "Runs queued static site builds"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run builds until the queue is empty, then exit",
+        )
+        parser.add_argument(
+            "--poll",
+            type=float,
+            default=c.BUILD_WORKER_POLL,
+            help="Seconds to wait between checks of an empty queue",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        build_queue: BuildQueue = BuildQueue()
+        recovered: float = float("-inf")
+
+        MkdocsEngine().warm_up()
+
+        while True:
+            if t.monotonic() - recovered >= c.BUILD_RECOVER_INTERVAL:
+                for stale_job in build_queue.recover():
+                    self.stdout.write(
+                        f"Project { stale_job.project_id } build left running, "
+                        "queued again"
+                    )
+                recovered = t.monotonic()
+
+            job = build_queue.run_next()
+
+            if job is not None:
+                self.stdout.write(
+                    f"Project { job.project_id } build "
+                    f"{ job.get_status_display() }"
+                )
+                continue
+
+            if options["once"]:
+                return
+
+            t.sleep(options["poll"])
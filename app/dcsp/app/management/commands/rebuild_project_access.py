@@ -0,0 +1,34 @@
+"""Rebuild project access
+
+Rebuilds the ProjectAccess table from the owners, members and groups of the
+projects. The table is kept up to date by signals, so this is only needed if
+it was changed by other means, eg bulk updates or raw SQL.
+
+Usage:
+    python3 manage.py rebuild_project_access [PROJECT_ID ...]
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from app.functions.access_control import access_table_refresh
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the table of which users have access to which projects"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "project_ids",
+            nargs="*",
+            type=int,
+            help="Projects to rebuild, defaults to the whole table",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rows: int = 0
+
+        rows = access_table_refresh(options["project_ids"] or None)
+
+        self.stdout.write(f"Wrote { rows } project access rows")
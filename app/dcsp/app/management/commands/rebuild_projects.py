@@ -0,0 +1,232 @@
+"""Rebuild projects
+
+Rebuilds the static sites of several projects, eg after a theme or template
+change, across a pool of processes. Progress is saved to a checkpoint file
+after each project, so a run that fails part way can be resumed without
+rebuilding the projects already done.
+
+Usage:
+    python3 manage.py rebuild_projects [PROJECT_ID ...] [--workers N]
+                                       [--resume] [--checkpoint PATH]
+"""
+
+import os
+import json
+import time as t
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import connections
+
+import app.functions.constants as c
+from app.models import Project
+from app.functions.mkdocs_control import MkdocsControl
+from app.functions.mkdocs_engine import MkdocsEngine
+
+
+def _rebuild_project(project_id: int) -> dict[str, Any]:
+    """Rebuilds one project, in a pool process
+
+    Args:
+        project_id (int): the primary key of the project.
+
+    Returns:
+        dict[str, Any]: the project_id, if the build succeeded, the seconds
+                        taken and any error.
+    """
+    start: float = t.perf_counter()
+    mkdocs_control: MkdocsControl
+    output: str = ""
+    error: str = ""
+
+    try:
+        mkdocs_control = MkdocsControl(project_id)
+        output = mkdocs_control.build_documents(force=True)
+        if not mkdocs_control.build_succeeded:
+            # Full build output is kept in the project's BuildRun
+            error = (
+                output
+                if "<" not in output
+                else "mkdocs build errors, see the project's latest build run"
+            )
+    except Exception as exception:
+        error = f"{ type(exception).__name__ }: { exception }"
+
+    return {
+        "project_id": project_id,
+        "succeeded": error == "",
+        "seconds": t.perf_counter() - start,
+        "error": error,
+    }
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the static sites of several projects in parallel"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "project_ids",
+            nargs="*",
+            type=int,
+            help="Projects to rebuild, defaults to all projects",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=c.REBUILD_WORKERS,
+            help="Projects built at once, 1 builds in this process",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the projects completed by the last run",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=f"{ c.BUILD_STATE_FOLDER }{ c.REBUILD_CHECKPOINT_FILE }",
+            help="File recording the projects completed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        checkpoint_path: str = options["checkpoint"]
+        completed: list[int] = []
+        project_ids: list[int] = []
+        results: list[dict[str, Any]] = []
+        workers: int = max(1, options["workers"])
+
+        if options["resume"]:
+            completed = self.checkpoint_read(checkpoint_path)
+
+        project_ids = options["project_ids"] or list(
+            Project.objects.order_by("id").values_list("id", flat=True)
+        )
+        project_ids = [
+            project_id
+            for project_id in project_ids
+            if project_id not in completed
+        ]
+
+        if not project_ids:
+            self.stdout.write("No projects to rebuild")
+            return
+
+        if workers == 1 or len(project_ids) == 1:
+            for project_id in project_ids:
+                results.append(_rebuild_project(project_id))
+                self.result_write(results[-1], completed, checkpoint_path)
+        else:
+            # Loaded once here, then shared by the forked pool processes
+            MkdocsEngine().warm_up()
+            # Forked processes must not share the database connections
+            connections.close_all()
+
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(project_ids))
+            ) as executor:
+                for future in as_completed(
+                    executor.submit(_rebuild_project, project_id)
+                    for project_id in project_ids
+                ):
+                    results.append(future.result())
+                    self.result_write(results[-1], completed, checkpoint_path)
+
+        self.summary_write(results)
+
+        if any(not result["succeeded"] for result in results):
+            raise CommandError(
+                "Some projects failed to build, run again with --resume "
+                "to rebuild only those"
+            )
+
+        Path(checkpoint_path).unlink(missing_ok=True)
+
+    def checkpoint_read(self, checkpoint_path: str) -> list[int]:
+        """Reads the projects completed by the last run
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file.
+
+        Returns:
+            list[int]: the primary keys of the projects completed.
+        """
+        try:
+            with open(checkpoint_path, "r") as file:
+                return list(json.load(file).get("completed", []))
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return []
+
+    def result_write(
+        self,
+        result: dict[str, Any],
+        completed: list[int],
+        checkpoint_path: str,
+    ) -> None:
+        """Reports a project's result and updates the checkpoint
+
+        Args:
+            result (dict[str, Any]): the result from _rebuild_project.
+            completed (list[int]): the projects completed so far, updated.
+            checkpoint_path (str): path of the checkpoint file.
+        """
+        temporary_path: str = f"{ checkpoint_path }.{ os.getpid() }.tmp"
+
+        self.stdout.write(
+            f"Project { result['project_id'] } "
+            f"{ 'built' if result['succeeded'] else 'FAILED' } "
+            f"in { result['seconds']:.1f}s"
+        )
+
+        if not result["succeeded"]:
+            return
+
+        completed.append(result["project_id"])
+
+        Path(checkpoint_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(temporary_path, "w") as file:
+            json.dump({"completed": completed}, file)
+        os.replace(temporary_path, checkpoint_path)
+        return
+
+    def summary_write(self, results: list[dict[str, Any]]) -> None:
+        """Writes a summary of timings and failures
+
+        Args:
+            results (list[dict[str, Any]]): the results of this run.
+        """
+        failed: list[dict[str, Any]] = [
+            result for result in results if not result["succeeded"]
+        ]
+        slowest: list[dict[str, Any]] = sorted(
+            results, key=lambda result: result["seconds"], reverse=True
+        )[:5]
+        total: float = sum(result["seconds"] for result in results)
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"Built { len(results) - len(failed) } of { len(results) } "
+            f"projects, { total:.1f}s of build time, "
+            f"{ total / len(results):.1f}s average"
+        )
+
+        self.stdout.write("Slowest:")
+        for result in slowest:
+            self.stdout.write(
+                f"    Project { result['project_id'] }: "
+                f"{ result['seconds']:.1f}s"
+            )
+
+        if failed:
+            self.stdout.write("Failed:")
+            for result in failed:
+                self.stdout.write(
+                    f"    Project { result['project_id'] }: "
+                    f"{ result['error'] }"
+                )
+
+        return
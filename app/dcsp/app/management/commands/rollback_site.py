@@ -0,0 +1,60 @@
+"""Rollback site
+
+Makes an earlier generation of a project's static site live again. Only the
+live link is switched, so the rollback is instant and nothing is rebuilt. The
+page records of the build manifest are cleared, so the next build renders
+every page rather than updating the rolled back site. The project's build
+lock is held throughout, so a build running at the same time cannot publish
+over the rollback.
+
+Usage:
+    python3 manage.py rollback_site PROJECT_ID [--generation NAME] [--list]
+"""
+
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from app.functions.build_lock import BuildLock
+from app.functions.build_manifest import BuildManifest
+from app.functions.site_publisher import SitePublisher
+
+
+class Command(BaseCommand):
+    help = "Makes an earlier generation of a project's static site live"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("project_id", type=int)
+        parser.add_argument(
+            "--generation",
+            default=None,
+            help="Generation to make live, defaults to the previous one",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the generations kept, then exit",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        publisher: SitePublisher = SitePublisher(options["project_id"])
+        generation: str = ""
+
+        if options["list"]:
+            for generation in publisher.generations():
+                marker = "*" if generation == publisher.current() else " "
+                self.stdout.write(f"{ marker } { generation }")
+            return
+
+        try:
+            with BuildLock(options["project_id"]):
+                generation = publisher.rollback(options["generation"])
+                BuildManifest(options["project_id"]).pages_clear()
+        except (ValueError, TimeoutError) as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(f"Generation { generation } is now live")
@@ -0,0 +1,27 @@
+"""Sync public sites
+
+Makes the links nginx uses to serve public projects without Django match the
+projects' access. The links are updated as projects are saved, so this is
+only needed once for existing projects, or if the links were lost.
+
+Usage:
+    python3 manage.py sync_public_sites
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from app.functions.public_sites import PublicSites
+
+
+class Command(BaseCommand):
+    help = "Links the static sites of public projects for nginx"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        added: int = 0
+        removed: int = 0
+
+        added, removed = PublicSites().sync()
+
+        self.stdout.write(f"Added { added } links, removed { removed } links")
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0012_alter_projectgroup_project_access"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BuildJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QU", "queued"),
+                            ("RU", "running"),
+                            ("CO", "complete"),
+                            ("FA", "failed"),
+                        ],
+                        default="QU",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "force",
+                    models.BooleanField(
+                        default=False, verbose_name="Force build"
+                    ),
+                ),
+                (
+                    "requested",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Requested",
+                    ),
+                ),
+                (
+                    "started",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Started"
+                    ),
+                ),
+                (
+                    "finished",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished"
+                    ),
+                ),
+                (
+                    "output",
+                    models.TextField(
+                        blank=True, null=True, verbose_name="Build output"
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["requested"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "requested"],
+                        name="app_buildjo_status_9bd8ae_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="buildjob",
+            constraint=models.CheckConstraint(
+                check=models.Q(("status__in", ["QU", "RU", "CO", "FA"])),
+                name="app_buildjob_status_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="buildjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "QU")),
+                fields=("project",),
+                name="app_buildjob_one_queued_per_project",
+            ),
+        ),
+    ]
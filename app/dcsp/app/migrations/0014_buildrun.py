@@ -0,0 +1,131 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0013_buildjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BuildRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "started",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Started",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("SU", "succeeded"),
+                            ("PE", "preprocessor error"),
+                            ("ME", "mkdocs error"),
+                            ("FA", "failed"),
+                        ],
+                        default="SU",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "incremental",
+                    models.BooleanField(
+                        default=False, verbose_name="Incremental"
+                    ),
+                ),
+                (
+                    "total_seconds",
+                    models.FloatField(default=0, verbose_name="Total (s)"),
+                ),
+                (
+                    "docstrings_seconds",
+                    models.FloatField(
+                        blank=True,
+                        null=True,
+                        verbose_name="Docstring scan (s)",
+                    ),
+                ),
+                (
+                    "preprocessor_seconds",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Preprocessor (s)"
+                    ),
+                ),
+                (
+                    "mkdocs_seconds",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="mkdocs (s)"
+                    ),
+                ),
+                (
+                    "publish_seconds",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Publish (s)"
+                    ),
+                ),
+                (
+                    "files_scanned",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Files scanned"
+                    ),
+                ),
+                (
+                    "pages_written",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Pages written"
+                    ),
+                ),
+                (
+                    "peak_rss_kb",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Peak RSS (kB)"
+                    ),
+                ),
+                (
+                    "log_compressed",
+                    models.BinaryField(default=b"", verbose_name="Log (zlib)"),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-started"],
+                "indexes": [
+                    models.Index(
+                        fields=["project", "started"],
+                        name="app_buildru_project_8a6858_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="buildrun",
+            constraint=models.CheckConstraint(
+                check=models.Q(("status__in", ["SU", "PE", "ME", "FA"])),
+                name="app_buildrun_status_valid",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:19
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0014_buildrun"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="buildjob",
+            name="app_buildjo_status_9bd8ae_idx",
+        ),
+        migrations.AddField(
+            model_name="buildjob",
+            name="run_after",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, verbose_name="Run after"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="buildjob",
+            index=models.Index(
+                fields=["status", "run_after"],
+                name="app_buildjo_status_2f6dac_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:50
+
+from typing import Any
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def project_access_populate(apps: Any, schema_editor: Any) -> None:
+    """Fills ProjectAccess from the owners, members and groups of projects"""
+    Project = apps.get_model("app", "Project")
+    ProjectGroup = apps.get_model("app", "ProjectGroup")
+    ProjectAccess = apps.get_model("app", "ProjectAccess")
+    rows: set[tuple[int, int, str]] = set()
+
+    for user_id, project_id in Project.objects.values_list("owner_id", "id"):
+        rows.add((user_id, project_id, "OW"))
+
+    for user_id, project_id in Project.member.through.objects.values_list(
+        "user_id", "project_id"
+    ):
+        rows.add((user_id, project_id, "ME"))
+
+    for group in ProjectGroup.objects.prefetch_related(
+        "member", "project_access"
+    ):
+        for user in group.member.all():
+            for project in group.project_access.all():
+                rows.add((user.id, project.id, "GR"))
+
+    ProjectAccess.objects.bulk_create(
+        ProjectAccess(user_id=user_id, project_id=project_id, via=via)
+        for user_id, project_id, via in sorted(rows)
+    )
+    return
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("app", "0015_buildjob_run_after"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectAccess",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "via",
+                    models.CharField(
+                        choices=[
+                            ("OW", "owner"),
+                            ("ME", "member"),
+                            ("GR", "project group"),
+                        ],
+                        max_length=2,
+                        verbose_name="Access via",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="projectaccess",
+            constraint=models.CheckConstraint(
+                check=models.Q(("via__in", ["OW", "ME", "GR"])),
+                name="app_projectaccess_via_valid",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="projectaccess",
+            constraint=models.UniqueConstraint(
+                fields=("user", "project", "via"),
+                name="app_projectaccess_unique",
+            ),
+        ),
+        migrations.RunPython(
+            project_access_populate, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:57
+
+from typing import Any
+
+from django.db import migrations
+
+# For searches by the start of the name (name__istartswith), which use
+# UPPER(name) LIKE '...%'. text_pattern_ops is needed for LIKE to use the
+# index whatever the database collation, and only exists on PostgreSQL
+INDEX_NAME = "app_project_name_upper"
+
+
+def name_upper_index_create(apps: Any, schema_editor: Any) -> None:
+    """Creates the index of project names, on PostgreSQL only"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS { INDEX_NAME } "
+        "ON app_project (UPPER(name) text_pattern_ops)"
+    )
+    return
+
+
+def name_upper_index_drop(apps: Any, schema_editor: Any) -> None:
+    """Drops the index of project names"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(f"DROP INDEX IF EXISTS { INDEX_NAME }")
+    return
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0016_projectaccess"),
+    ]
+
+    operations = [
+        migrations.RunPython(name_upper_index_create, name_upper_index_drop),
+    ]
@@ -7,14 +7,21 @@ Functions:
 
 Enumerations:
     ViewAccess: Enumeration for view access levels.
+    BuildStatus: Enumeration for the states of a build job.
+    BuildRunStatus: Enumeration for how a build ended.
+    AccessVia: Enumeration for how a user has access to a project.
 
 Models:
     UserProfile: A user profile model.
     Project: Project model.
     UserProjectAttribute: A user project attribute model.
     ProjectGroup: A project group model.
+    ProjectAccess: Which users have access to which projects, and how.
+    BuildJob: A queued build of a project's static site.
+    BuildRun: Timings and counts of a build of a project's static site.
 """
 
+import zlib
 from typing import Optional
 
 from django.db.models import (
@@ -25,9 +32,15 @@ from django.db.models import (
     ManyToManyField,
     ForeignKey,
     DateTimeField,
+    BooleanField,
+    BinaryField,
+    FloatField,
+    PositiveIntegerField,
     CASCADE,
     TextChoices,
     CheckConstraint,
+    UniqueConstraint,
+    Index,
     Q,
 )
 from django.contrib.auth.models import User
@@ -56,10 +69,61 @@ class ViewAccess(TextChoices):
         return cls(choice).label
 
 
+class BuildStatus(TextChoices):
+    """
+    Enumeration for the states of a build job.
+
+    Attributes:
+    QUEUED: Represents a job waiting for a build worker.
+    RUNNING: Represents a job currently being built.
+    COMPLETE: Represents a job that has finished building.
+    FAILED: Represents a job that raised an error while building.
+    """
+
+    QUEUED = "QU", "queued"
+    RUNNING = "RU", "running"
+    COMPLETE = "CO", "complete"
+    FAILED = "FA", "failed"
+
+
+class BuildRunStatus(TextChoices):
+    """
+    Enumeration for how a build ended.
+
+    Attributes:
+    SUCCEEDED: Represents a build that was published.
+    PREPROCESSOR_ERROR: Represents a build stopped by the preprocessor.
+    MKDOCS_ERROR: Represents a build that mkdocs could not complete.
+    FAILED: Represents a build that raised an error.
+    """
+
+    SUCCEEDED = "SU", "succeeded"
+    PREPROCESSOR_ERROR = "PE", "preprocessor error"
+    MKDOCS_ERROR = "ME", "mkdocs error"
+    FAILED = "FA", "failed"
+
+
+class AccessVia(TextChoices):
+    """
+    Enumeration for how a user has access to a project.
+
+    Attributes:
+    OWNER: Represents the owner of the project.
+    MEMBER: Represents a member of the project.
+    GROUP: Represents a member of a project group with access to the project.
+    """
+
+    OWNER = "OW", "owner"
+    MEMBER = "ME", "member"
+    GROUP = "GR", "project group"
+
+
 # TODO #62 needs to be tested
 def project_timestamp(project_id: int) -> bool:
     """Updates the last_modified timestamp of a project if it exists.
 
+    A debounced rebuild of the project is scheduled (see BuildQueue.schedule).
+
     Args:
         project_id (int): The id of the project to update.
 
@@ -76,7 +140,12 @@ def project_timestamp(project_id: int) -> bool:
 
     project = Project.objects.get(id=project_id)
     project.last_modified = timezone.now()
-    project.save()
+    project.save(update_fields=["last_modified"])
+
+    # Imported here, as the build queue itself uses the models
+    from app.functions.build_queue import BuildQueue
+
+    BuildQueue().schedule(project_id)
     return True
 
 
@@ -172,6 +241,8 @@ class Project(Model):
 
     class Meta:
         ordering = ["name"]
+        # Searches by the start of the name use the app_project_name_upper
+        # index on PostgreSQL (see migration 0017)
         constraints = [
             CheckConstraint(
                 name="%(app_label)s_%(class)s_access_valid",
@@ -225,3 +296,167 @@ class ProjectGroup(Model):
 
     def __str__(self) -> str:
         return f"{ self.name }"
+
+
+class ProjectAccess(Model):
+    """Which users have access to which projects, and how
+
+    Derived from Project.owner, Project.member and ProjectGroup, and kept up
+    to date by signals (see app.signals), so access is found without joining
+    across them. Rebuild with the rebuild_project_access command.
+    """
+
+    user = ForeignKey(User, verbose_name=_("User"), on_delete=CASCADE)
+
+    project = ForeignKey(Project, verbose_name=_("Project"), on_delete=CASCADE)
+
+    via = CharField(
+        verbose_name=_("Access via"),
+        max_length=2,
+        choices=AccessVia.choices,
+    )
+
+    def __str__(self) -> str:
+        return f"{ self.user } - { self.project } ({ self.get_via_display() })"
+
+    class Meta:
+        constraints = [
+            CheckConstraint(
+                name="%(app_label)s_%(class)s_via_valid",
+                check=Q(via__in=AccessVia.values),
+            ),
+            # Also the index for lookups by user, and by user and project
+            UniqueConstraint(
+                fields=["user", "project", "via"],
+                name="%(app_label)s_%(class)s_unique",
+            ),
+        ]
+
+
+class BuildJob(Model):
+    project = ForeignKey(Project, verbose_name=_("Project"), on_delete=CASCADE)
+
+    status = CharField(
+        verbose_name=_("Status"),
+        max_length=10,
+        choices=BuildStatus.choices,
+        default=BuildStatus.QUEUED,
+    )
+
+    force = BooleanField(verbose_name=_("Force build"), default=False)
+
+    requested = DateTimeField(
+        verbose_name=_("Requested"), default=timezone.now
+    )
+
+    # Edits push this back, so a burst of edits gives one build
+    run_after = DateTimeField(
+        verbose_name=_("Run after"), default=timezone.now
+    )
+
+    started = DateTimeField(verbose_name=_("Started"), blank=True, null=True)
+
+    finished = DateTimeField(verbose_name=_("Finished"), blank=True, null=True)
+
+    output = TextField(verbose_name=_("Build output"), blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"{ self.project } - { self.get_status_display() }"
+
+    class Meta:
+        ordering = ["requested"]
+        indexes = [Index(fields=["status", "run_after"])]
+        constraints = [
+            CheckConstraint(
+                name="%(app_label)s_%(class)s_status_valid",
+                check=Q(status__in=BuildStatus.values),
+            ),
+            # Coalesces requests, only one queued build per project
+            UniqueConstraint(
+                fields=["project"],
+                condition=Q(status=BuildStatus.QUEUED),
+                name="%(app_label)s_%(class)s_one_queued_per_project",
+            ),
+        ]
+
+
+class BuildRun(Model):
+    project = ForeignKey(Project, verbose_name=_("Project"), on_delete=CASCADE)
+
+    started = DateTimeField(verbose_name=_("Started"), default=timezone.now)
+
+    status = CharField(
+        verbose_name=_("Status"),
+        max_length=10,
+        choices=BuildRunStatus.choices,
+        default=BuildRunStatus.SUCCEEDED,
+    )
+
+    incremental = BooleanField(verbose_name=_("Incremental"), default=False)
+
+    total_seconds = FloatField(verbose_name=_("Total (s)"), default=0)
+
+    docstrings_seconds = FloatField(
+        verbose_name=_("Docstring scan (s)"), blank=True, null=True
+    )
+
+    preprocessor_seconds = FloatField(
+        verbose_name=_("Preprocessor (s)"), blank=True, null=True
+    )
+
+    mkdocs_seconds = FloatField(
+        verbose_name=_("mkdocs (s)"), blank=True, null=True
+    )
+
+    publish_seconds = FloatField(
+        verbose_name=_("Publish (s)"), blank=True, null=True
+    )
+
+    files_scanned = PositiveIntegerField(
+        verbose_name=_("Files scanned"), default=0
+    )
+
+    pages_written = PositiveIntegerField(
+        verbose_name=_("Pages written"), default=0
+    )
+
+    # Peak of the building process during this build, if it could be
+    # measured (see BuildTelemetry)
+    peak_rss_kb = PositiveIntegerField(
+        verbose_name=_("Peak RSS (kB)"), blank=True, null=True
+    )
+
+    log_compressed = BinaryField(verbose_name=_("Log (zlib)"), default=b"")
+
+    def log_get(self) -> str:
+        """Returns the build log
+
+        Returns:
+            str: the decompressed log.
+        """
+        if not self.log_compressed:
+            return ""
+
+        return zlib.decompress(bytes(self.log_compressed)).decode("utf-8")
+
+    def log_set(self, log: str) -> None:
+        """Stores the build log, compressed
+
+        Args:
+            log (str): the full build log.
+        """
+        self.log_compressed = zlib.compress(log.encode("utf-8"))
+        return
+
+    def __str__(self) -> str:
+        return f"{ self.project } - { self.started:%Y-%m-%d %H:%M:%S}"
+
+    class Meta:
+        ordering = ["-started"]
+        indexes = [Index(fields=["project", "started"])]
+        constraints = [
+            CheckConstraint(
+                name="%(app_label)s_%(class)s_status_valid",
+                check=Q(status__in=BuildRunStatus.values),
+            ),
+        ]
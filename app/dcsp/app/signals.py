@@ -0,0 +1,207 @@
+"""Signal handlers
+
+Keeps state held outside the database in step with the models.
+
+Functions:
+    project_loaded: records the access settings a project was loaded with.
+    project_saved: updates the link to a project's site for nginx, and
+                   access if its owner or access changed.
+    project_deleted: removes the link to a project's site for nginx.
+    access_changed: updates access when members or groups change.
+    project_group_deleting: records the projects of a group being deleted.
+    project_group_deleted: updates access when a group is deleted.
+"""
+
+from typing import Any, Optional
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from app.models import Project, ProjectGroup, ViewAccess
+from app.functions.public_sites import PublicSites
+from app.functions.access_control import access_table_refresh
+
+
+@receiver(post_init, sender=Project)
+def project_loaded(
+    sender: type[Project], instance: Project, **kwargs: Any
+) -> None:
+    """Records the access settings a project was loaded with
+
+    Read from __dict__, so deferred fields are not loaded.
+
+    Args:
+        sender (type[Project]): the model class.
+        instance (Project): the project loaded.
+    """
+    instance._access_loaded = (  # type: ignore[attr-defined]
+        instance.__dict__.get("owner_id"),
+        instance.__dict__.get("access"),
+    )
+    return
+
+
+@receiver(post_save, sender=Project)
+def project_saved(
+    sender: type[Project],
+    instance: Project,
+    created: bool,
+    update_fields: Optional[frozenset[str]] = None,
+    **kwargs: Any,
+) -> None:
+    """Updates state held for a project outside the database
+
+    A save of only other fields (eg last_built at the end of a build) is
+    ignored, as the owner and access of the instance saved may be out of
+    date.
+
+    Args:
+        sender (type[Project]): the model class.
+        instance (Project): the project saved.
+        created (bool): if the project is new.
+        update_fields (Optional[frozenset[str]]): the fields saved, or None
+                                                  for all fields.
+    """
+    access: tuple[Any, Any] = (instance.owner_id, instance.access)
+    loaded: Any = getattr(instance, "_access_loaded", None)
+
+    if update_fields is not None and not update_fields & {"owner", "access"}:
+        return
+
+    PublicSites().update(instance.id, instance.access == ViewAccess.PUBLIC)
+
+    if created or loaded is None or access[0] != loaded[0]:
+        access_table_refresh([instance.id])
+
+    instance._access_loaded = access  # type: ignore[attr-defined]
+    return
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(
+    sender: type[Project], instance: Project, **kwargs: Any
+) -> None:
+    """Removes the link to a project's site for nginx
+
+    Args:
+        sender (type[Project]): the model class.
+        instance (Project): the project deleted.
+    """
+    PublicSites().update(instance.id, False)
+    return
+
+
+@receiver(m2m_changed, sender=Project.member.through)
+@receiver(m2m_changed, sender=ProjectGroup.member.through)
+@receiver(m2m_changed, sender=ProjectGroup.project_access.through)
+def access_changed(
+    sender: Any,
+    instance: Any,
+    action: str,
+    pk_set: Optional[set[int]],
+    **kwargs: Any,
+) -> None:
+    """Updates access when members or groups change
+
+    The projects changed by a clear are recorded before it, while the rows
+    cleared still exist.
+
+    Args:
+        sender (Any): the many to many table changed.
+        instance (Any): the object whose relation changed, from either side.
+        action (str): the kind of change.
+        pk_set (Optional[set[int]]): primary keys added or removed.
+    """
+    if action == "pre_clear":
+        instance._access_projects = _projects_changed(sender, instance, None)
+
+    elif action in ("post_add", "post_remove"):
+        access_table_refresh(_projects_changed(sender, instance, pk_set))
+
+    elif action == "post_clear":
+        access_table_refresh(getattr(instance, "_access_projects", set()))
+
+    return
+
+
+def _projects_changed(
+    sender: Any, instance: Any, pk_set: Optional[set[int]]
+) -> set[int]:
+    """Finds the projects whose access a many to many change affects
+
+    Args:
+        sender (Any): the many to many table changed.
+        instance (Any): the object whose relation changed, from either side.
+        pk_set (Optional[set[int]]): primary keys added or removed, or None
+                                     for all those currently related.
+
+    Returns:
+        set[int]: primary keys of the projects.
+    """
+    if sender is Project.member.through:
+        if isinstance(instance, Project):
+            return {instance.id}
+        return set(
+            pk_set
+            if pk_set is not None
+            else instance.member_many_to_many.values_list("id", flat=True)
+        )
+
+    if sender is ProjectGroup.project_access.through:
+        if isinstance(instance, Project):
+            return {instance.id}
+        return set(
+            pk_set
+            if pk_set is not None
+            else instance.project_access.values_list("id", flat=True)
+        )
+
+    # ProjectGroup.member
+    if isinstance(instance, ProjectGroup):
+        return set(instance.project_access.values_list("id", flat=True))
+
+    return set(
+        Project.objects.filter(
+            projectgroup__in=(
+                pk_set
+                if pk_set is not None
+                else instance.projectgroup_set.all()
+            )
+        ).values_list("id", flat=True)
+    )
+
+
+@receiver(pre_delete, sender=ProjectGroup)
+def project_group_deleting(
+    sender: type[ProjectGroup], instance: ProjectGroup, **kwargs: Any
+) -> None:
+    """Records the projects of a group being deleted
+
+    Args:
+        sender (type[ProjectGroup]): the model class.
+        instance (ProjectGroup): the group being deleted.
+    """
+    instance._access_projects = set(  # type: ignore[attr-defined]
+        instance.project_access.values_list("id", flat=True)
+    )
+    return
+
+
+@receiver(post_delete, sender=ProjectGroup)
+def project_group_deleted(
+    sender: type[ProjectGroup], instance: ProjectGroup, **kwargs: Any
+) -> None:
+    """Updates access when a group is deleted
+
+    Args:
+        sender (type[ProjectGroup]): the model class.
+        instance (ProjectGroup): the group deleted.
+    """
+    access_table_refresh(getattr(instance, "_access_projects", set()))
+    return
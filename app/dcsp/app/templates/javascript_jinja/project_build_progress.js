@@ -0,0 +1,35 @@
+<script>
+    var build_progress_offset = 0;
+
+    function build_progress_poll() {
+        fetch("{% url 'project_build_progress' project_id build_job_id %}?offset=" + build_progress_offset)
+            .then(response => response.json())
+            .then(data => {
+                var build_progress = document.getElementById("id_build_progress");
+
+                data.events.forEach(event => {
+                    var line = document.createElement("div");
+
+                    if ("phase" in event) {
+                        line.className = "fw-bold mt-2";
+                        line.textContent = event.phase;
+                    } else {
+                        line.textContent = event.line;
+                    }
+                    build_progress.appendChild(line);
+                });
+
+                build_progress_offset = data.offset;
+                document.getElementById("id_build_status").textContent = data.status;
+
+                if (data.finished) {
+                    document.getElementById("id_build_output").innerHTML = data.output;
+                } else {
+                    setTimeout(build_progress_poll, {{ build_progress_poll_ms }});
+                }
+            })
+            .catch(() => setTimeout(build_progress_poll, {{ build_progress_poll_ms }}));
+    };
+
+    build_progress_poll();
+</script>
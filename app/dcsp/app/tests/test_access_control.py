@@ -0,0 +1,180 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser, User
+
+from app.models import AccessVia, Project, ProjectAccess, ProjectGroup
+from app.functions.access_control import can_access, access_table_refresh
+
+
+@patch("app.signals.PublicSites")
+class CanAccessTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            id=1, username="owner", password="p"
+        )  # nosec B106
+        self.user = User.objects.create_user(
+            id=2, username="user", password="p"
+        )  # nosec B106
+        self.project = Project.objects.create(
+            id=1, owner=self.owner, name="Project 1"
+        )
+
+    def test_anonymous(self, mock_public_sites):
+        self.assertFalse(can_access(AnonymousUser(), self.project))
+
+    def test_owner(self, mock_public_sites):
+        with self.assertNumQueries(0):
+            self.assertTrue(can_access(self.owner, self.project))
+
+    def test_no_access(self, mock_public_sites):
+        with self.assertNumQueries(1):
+            self.assertFalse(can_access(self.user, self.project))
+
+    def test_member(self, mock_public_sites):
+        self.project.member.add(self.user)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(can_access(self.user, self.project))
+
+    def test_group_member(self, mock_public_sites):
+        group = ProjectGroup.objects.create(name="Group")
+        group.project_access.add(self.project)
+        group.member.add(self.user)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(can_access(self.user, self.project))
+
+    def test_cached(self, mock_public_sites):
+        can_access(self.user, self.project)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(can_access(self.user, self.project))
+
+    def test_cached_per_user_object(self, mock_public_sites):
+        can_access(self.user, self.project)
+        user = User.objects.get(id=2)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(can_access(user, self.project))
+
+    def test_member_added(self, mock_public_sites):
+        can_access(self.user, self.project)
+
+        self.project.member.add(self.user)
+
+        self.assertTrue(can_access(User.objects.get(id=2), self.project))
+
+    def test_member_removed(self, mock_public_sites):
+        self.project.member.add(self.user)
+        can_access(self.user, self.project)
+
+        self.project.member.remove(self.user)
+
+        self.assertFalse(can_access(User.objects.get(id=2), self.project))
+
+    def test_group_deleted(self, mock_public_sites):
+        group = ProjectGroup.objects.create(name="Group")
+        group.project_access.add(self.project)
+        group.member.add(self.user)
+        can_access(self.user, self.project)
+
+        group.delete()
+
+        self.assertFalse(can_access(User.objects.get(id=2), self.project))
+
+
+@patch("app.signals.PublicSites")
+class AccessTableTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            id=1, username="owner", password="p"
+        )  # nosec B106
+        self.user = User.objects.create_user(
+            id=2, username="user", password="p"
+        )  # nosec B106
+        self.project = Project.objects.create(
+            id=1, owner=self.owner, name="Project 1"
+        )
+        self.group = ProjectGroup.objects.create(name="Group")
+
+    def rows(self):
+        return set(
+            ProjectAccess.objects.values_list("user_id", "project_id", "via")
+        )
+
+    def test_owner(self, mock_public_sites):
+        self.assertEqual(self.rows(), {(1, 1, AccessVia.OWNER)})
+
+    def test_owner_changed(self, mock_public_sites):
+        self.project.owner = self.user
+        self.project.save()
+
+        self.assertEqual(self.rows(), {(2, 1, AccessVia.OWNER)})
+
+    def test_member(self, mock_public_sites):
+        self.project.member.add(self.user)
+
+        self.assertIn((2, 1, AccessVia.MEMBER), self.rows())
+
+        self.user.member_many_to_many.clear()
+
+        self.assertEqual(self.rows(), {(1, 1, AccessVia.OWNER)})
+
+    def test_group(self, mock_public_sites):
+        self.group.member.add(self.user)
+        self.group.project_access.add(self.project)
+
+        self.assertIn((2, 1, AccessVia.GROUP), self.rows())
+
+        self.project.projectgroup_set.clear()
+
+        self.assertEqual(self.rows(), {(1, 1, AccessVia.OWNER)})
+
+    def test_group_member_removed(self, mock_public_sites):
+        self.group.project_access.add(self.project)
+        self.user.projectgroup_set.add(self.group)
+
+        self.assertIn((2, 1, AccessVia.GROUP), self.rows())
+
+        self.user.projectgroup_set.remove(self.group)
+
+        self.assertEqual(self.rows(), {(1, 1, AccessVia.OWNER)})
+
+    def test_group_deleted(self, mock_public_sites):
+        self.group.project_access.add(self.project)
+        self.group.member.add(self.user)
+
+        self.group.delete()
+
+        self.assertEqual(self.rows(), {(1, 1, AccessVia.OWNER)})
+
+    def test_refresh_all(self, mock_public_sites):
+        self.group.project_access.add(self.project)
+        self.group.member.add(self.user, self.owner)
+        ProjectAccess.objects.all().delete()
+        ProjectAccess.objects.create(
+            user=self.user, project=self.project, via=AccessVia.MEMBER
+        )
+
+        self.assertEqual(access_table_refresh(), 3)
+
+        self.assertEqual(
+            self.rows(),
+            {
+                (1, 1, AccessVia.OWNER),
+                (1, 1, AccessVia.GROUP),
+                (2, 1, AccessVia.GROUP),
+            },
+        )
+
+    def test_command(self, mock_public_sites):
+        stdout = StringIO()
+        ProjectAccess.objects.all().delete()
+
+        call_command("rebuild_project_access", stdout=stdout)
+
+        self.assertEqual(stdout.getvalue(), "Wrote 1 project access rows\n")
+        self.assertEqual(self.rows(), {(1, 1, AccessVia.OWNER)})
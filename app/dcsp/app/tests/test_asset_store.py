@@ -0,0 +1,100 @@
+import os
+import errno
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from app.functions.asset_store import AssetStore
+
+
+class AssetStoreTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.store = AssetStore(f"{ self.root }/.assets/")
+        self.sites = []
+        for number in range(2):
+            site = self.root / f"site_{ number }"
+            (site / "assets").mkdir(parents=True)
+            (site / "assets" / "theme.css").write_text("body {}" * 200)
+            (site / "assets" / "theme.css.gz").write_bytes(b"\x1f" * 2000)
+            (site / "assets" / "small.js").write_text("x")
+            (site / "index.html").write_text("<p>Index</p>" * 200)
+            self.sites.append(site)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_first_site_stored(self):
+        self.assertEqual(self.store.deduplicate(str(self.sites[0])), 0)
+
+        css = self.sites[0] / "assets" / "theme.css"
+        self.assertEqual(os.stat(css).st_nlink, 2)
+        self.assertEqual(os.stat(css.with_suffix(".css.gz")).st_nlink, 2)
+        self.assertEqual(
+            os.stat(self.sites[0] / "assets" / "small.js").st_nlink, 1
+        )
+        self.assertEqual(os.stat(self.sites[0] / "index.html").st_nlink, 1)
+
+    def test_identical_files_shared(self):
+        self.store.deduplicate(str(self.sites[0]))
+
+        self.assertEqual(self.store.deduplicate(str(self.sites[1])), 2)
+
+        self.assertTrue(
+            os.path.samefile(
+                self.sites[0] / "assets" / "theme.css",
+                self.sites[1] / "assets" / "theme.css",
+            )
+        )
+        self.assertEqual(
+            (self.sites[1] / "assets" / "theme.css").read_text(),
+            "body {}" * 200,
+        )
+
+    def test_repeated(self):
+        self.store.deduplicate(str(self.sites[0]))
+
+        self.assertEqual(self.store.deduplicate(str(self.sites[0])), 0)
+        self.assertEqual(
+            os.stat(self.sites[0] / "assets" / "theme.css").st_nlink, 2
+        )
+
+    def test_different_content(self):
+        (self.sites[1] / "assets" / "theme.css").write_text("p {}" * 300)
+        self.store.deduplicate(str(self.sites[0]))
+
+        self.store.deduplicate(str(self.sites[1]))
+
+        self.assertFalse(
+            os.path.samefile(
+                self.sites[0] / "assets" / "theme.css",
+                self.sites[1] / "assets" / "theme.css",
+            )
+        )
+
+    def test_collect(self):
+        self.store.deduplicate(str(self.sites[0]))
+        self.store.deduplicate(str(self.sites[1]))
+        for path in (self.sites[0] / "assets").iterdir():
+            path.unlink()
+
+        self.assertEqual(self.store.collect(), 0)
+
+        for path in (self.sites[1] / "assets").iterdir():
+            path.unlink()
+
+        self.assertEqual(self.store.collect(), 2)
+
+    def test_other_file_system(self):
+        with patch(
+            "app.functions.asset_store.os.link",
+            side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+        ):
+            self.assertEqual(self.store.deduplicate(str(self.sites[0])), 0)
+
+        self.assertEqual(
+            os.stat(self.sites[0] / "assets" / "theme.css").st_nlink, 1
+        )
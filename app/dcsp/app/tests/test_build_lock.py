@@ -0,0 +1,160 @@
+import tempfile
+import threading
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from app.models import BuildRun, BuildRunStatus, Project
+from app.functions.build_lock import BuildLock
+from app.functions.mkdocs_control import MkdocsControl
+
+
+class BuildLockTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.build_state_folder = f"{ self.temporary_directory.name }/state/"
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def lock(self, project_id=1, timeout=0.3):
+        return BuildLock(
+            project_id,
+            build_state_folder=self.build_state_folder,
+            timeout=timeout,
+        )
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            BuildLock("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_not_locked(self):
+        self.assertFalse(self.lock().locked())
+
+    def test_locked(self):
+        with self.lock():
+            self.assertTrue(self.lock().locked())
+
+        self.assertFalse(self.lock().locked())
+
+    def test_timeout(self):
+        with self.lock():
+            with self.assertRaises(TimeoutError):
+                self.lock().acquire()
+
+    def test_other_project(self):
+        with self.lock(1):
+            with self.lock(2):
+                self.assertTrue(self.lock(2).locked())
+
+    def test_waits_for_release(self):
+        lock = self.lock()
+        lock.acquire()
+        timer = threading.Timer(0.1, lock.release)
+        timer.start()
+
+        with self.lock(timeout=5):
+            self.assertIsNone(lock.file_descriptor)
+
+        timer.join()
+
+
+class BuildDocumentsLockTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        self.project = Project.objects.create(
+            id=1, owner=self.user, name="Project 1"
+        )
+        build_state_folder = f"{ self.temporary_directory.name }/state/"
+        patcher = patch(
+            "app.functions.mkdocs_control.BuildLock",
+            side_effect=lambda project_id: BuildLock(
+                project_id, build_state_folder=build_state_folder, timeout=0.3
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.build_state_folder = build_state_folder
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    @patch.object(MkdocsControl, "_build_documents")
+    def test_builds(self, mock_build_documents):
+        mock_build_documents.return_value = "built"
+
+        self.assertEqual(MkdocsControl(1).build_documents(force=True), "built")
+
+        mock_build_documents.assert_called_once_with(True)
+
+    @patch.object(MkdocsControl, "_build_documents")
+    def test_reuses_later_build(self, mock_build_documents):
+        self.project.last_built = timezone.now() + timedelta(seconds=10)
+        self.project.build_output = "earlier output"
+        self.project.save()
+        progress = Mock()
+
+        self.assertEqual(
+            MkdocsControl(1).build_documents(force=True, progress=progress),
+            "earlier output",
+        )
+
+        mock_build_documents.assert_not_called()
+        progress.phase.assert_called_once_with(
+            "reused the output of the previous build"
+        )
+
+    @patch.object(MkdocsControl, "_build_documents")
+    def test_reuses_later_build_status(self, mock_build_documents):
+        self.project.last_built = timezone.now() + timedelta(seconds=10)
+        self.project.save()
+        mkdocs_control = MkdocsControl(1)
+
+        BuildRun.objects.create(
+            project=self.project, status=BuildRunStatus.MKDOCS_ERROR
+        )
+        mkdocs_control.build_documents(force=True)
+        self.assertFalse(mkdocs_control.build_succeeded)
+
+        BuildRun.objects.create(
+            project=self.project, status=BuildRunStatus.SUCCEEDED
+        )
+        mkdocs_control.build_documents(force=True)
+        self.assertTrue(mkdocs_control.build_succeeded)
+
+    @patch.object(MkdocsControl, "_build_documents")
+    def test_reuses_later_build_no_output(self, mock_build_documents):
+        self.project.last_built = timezone.now() + timedelta(seconds=10)
+        self.project.save()
+
+        self.assertEqual(MkdocsControl(1).build_documents(force=True), "")
+
+        mock_build_documents.assert_not_called()
+
+    @patch.object(MkdocsControl, "_build_documents")
+    def test_older_build_not_reused(self, mock_build_documents):
+        mock_build_documents.return_value = "built"
+        self.project.last_built = timezone.now() - timedelta(seconds=10)
+        self.project.build_output = "earlier output"
+        self.project.save()
+
+        self.assertEqual(MkdocsControl(1).build_documents(), "built")
+
+    @patch.object(MkdocsControl, "_build_documents")
+    def test_timeout(self, mock_build_documents):
+        with BuildLock(1, build_state_folder=self.build_state_folder):
+            self.assertEqual(
+                MkdocsControl(1).build_documents(),
+                "Timed out waiting for another build to finish!",
+            )
+
+        mock_build_documents.assert_not_called()
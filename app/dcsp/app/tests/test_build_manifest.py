@@ -0,0 +1,233 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+import app.functions.constants as c
+from app.functions.build_manifest import BuildManifest
+
+
+class BuildManifestTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.projects_folder = f"{ self.temporary_directory.name }/projects/"
+        self.build_state_folder = f"{ self.temporary_directory.name }/state/"
+        self.inputs = Path(
+            f"{ self.projects_folder }project_1/{ c.CLINICAL_SAFETY_FOLDER }"
+        )
+        (self.inputs / "docs").mkdir(parents=True)
+        (self.inputs / "docs" / "index.md").write_text("# Index")
+        (self.inputs / "mkdocs.yml").write_text("site_name: test")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def manifest(self):
+        return BuildManifest(
+            1,
+            projects_folder=self.projects_folder,
+            build_state_folder=self.build_state_folder,
+        )
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            BuildManifest("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_changed_no_manifest(self):
+        self.assertTrue(self.manifest().changed())
+        self.assertIsNone(self.manifest().verified())
+
+    def test_unchanged_after_save(self):
+        self.manifest().save()
+
+        self.assertFalse(self.manifest().changed())
+        self.assertIsNotNone(self.manifest().verified())
+
+    def test_rewrite_same_content(self):
+        self.manifest().save()
+        (self.inputs / "docs" / "index.md").write_text("# Index")
+        os.utime(self.inputs / "docs" / "index.md", ns=(0, 0))
+
+        self.assertFalse(self.manifest().changed())
+
+    def test_content_edited(self):
+        self.manifest().save()
+        (self.inputs / "docs" / "index.md").write_text("# Index edited")
+
+        self.assertTrue(self.manifest().changed())
+
+    def test_file_added(self):
+        self.manifest().save()
+        (self.inputs / "docs" / "new.md").write_text("# New")
+
+        self.assertTrue(self.manifest().changed())
+
+    def test_file_removed(self):
+        self.manifest().save()
+        (self.inputs / "docs" / "index.md").unlink()
+
+        self.assertTrue(self.manifest().changed())
+
+    def test_hidden_ignored(self):
+        self.manifest().save()
+        (self.inputs / ".git").mkdir()
+        (self.inputs / ".git" / "HEAD").write_text("ref: main")
+        (self.inputs / ".hidden.md").write_text("# Hidden")
+
+        self.assertFalse(self.manifest().changed())
+
+    def test_verify(self):
+        self.manifest().save()
+        verified = self.manifest().verified()
+
+        self.manifest().verify()
+
+        self.assertGreaterEqual(self.manifest().verified(), verified)
+        self.assertFalse(self.manifest().changed())
+
+    def test_edited_after_snapshot(self):
+        manifest = self.manifest()
+        manifest.snapshot()
+        (self.inputs / "docs" / "index.md").write_text("# Index edited")
+
+        manifest.save({})
+
+        self.assertTrue(self.manifest().changed())
+        self.assertEqual(
+            self.manifest().verified().isoformat(), manifest.snapshot_verified
+        )
+
+    def test_corrupt_manifest(self):
+        manifest = self.manifest()
+        Path(manifest.manifest_path).parent.mkdir(parents=True)
+        Path(manifest.manifest_path).write_text("{not json")
+
+        self.assertEqual(manifest.read(), {})
+        self.assertTrue(manifest.changed())
+
+
+class BuildManifestPagesTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.projects_folder = f"{ self.temporary_directory.name }/projects/"
+        self.build_state_folder = f"{ self.temporary_directory.name }/state/"
+        self.project = Path(f"{ self.projects_folder }project_1/")
+        self.inputs = self.project / c.CLINICAL_SAFETY_FOLDER
+        (self.inputs / "docs" / "hazards").mkdir(parents=True)
+        (self.inputs / "snippets").mkdir()
+        (self.project / "src" / "app").mkdir(parents=True)
+        (self.project / "src" / "app" / "code.py").write_text("x = 1")
+        (self.inputs / "mkdocs.yml").write_text("site_name: test")
+        (self.inputs / "placeholders.yml").write_text("extra: {}")
+        (self.inputs / "snippets" / "note.md").write_text("A note")
+        (self.inputs / "docs" / "index.md").write_text("# Index")
+        (self.inputs / "docs" / "hazards" / "hazard-1.md").write_text(
+            "# Hazard {{ project_name }}"
+        )
+        (self.inputs / "docs" / "hazards" / "summary.md").write_text(
+            '{% include-markdown "hazard-1.md" %}\n'
+            '--8<-- "snippets/note.md:1:2"\n'
+            "--8<--\nsnippets/note.md\n--8<--\n"
+            "::: src.app.code.function\n"
+            "::: missing.module\n"
+        )
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def manifest(self):
+        return BuildManifest(
+            1,
+            projects_folder=self.projects_folder,
+            build_state_folder=self.build_state_folder,
+        )
+
+    def test_dependencies(self):
+        self.assertEqual(
+            self.manifest().dependencies("docs/hazards/summary.md"),
+            [
+                "../src/app/code.py",
+                "?missing.module",
+                "docs/hazards/hazard-1.md",
+                "placeholders.yml",
+                "snippets/note.md",
+            ],
+        )
+
+    def test_dependencies_none(self):
+        self.assertEqual(self.manifest().dependencies("docs/index.md"), [])
+
+    def test_no_build_recorded(self):
+        self.assertIsNone(self.manifest().pages_changed())
+        self.assertEqual(self.manifest().titles(), {})
+
+    def test_failed_build_recorded(self):
+        self.manifest().save(None)
+
+        self.assertIsNone(self.manifest().pages_changed())
+
+    def test_unchanged(self):
+        self.manifest().save({"index.md": "Index"})
+
+        # summary.md has an unresolved reference, so is always rendered
+        self.assertEqual(
+            self.manifest().pages_changed(), ["hazards/summary.md"]
+        )
+        self.assertEqual(self.manifest().titles(), {"index.md": "Index"})
+
+    def test_placeholders_changed(self):
+        self.manifest().save({})
+        (self.inputs / "placeholders.yml").write_text("extra: {a: b}")
+
+        self.assertEqual(
+            self.manifest().pages_changed(),
+            ["hazards/hazard-1.md", "hazards/summary.md"],
+        )
+
+    def test_code_changed(self):
+        (self.inputs / "docs" / "hazards" / "summary.md").write_text(
+            "::: src.app.code"
+        )
+        self.manifest().save({})
+        (self.project / "src" / "app" / "code.py").write_text("x = 2")
+
+        self.assertEqual(
+            self.manifest().pages_changed(), ["hazards/summary.md"]
+        )
+
+    def test_page_added(self):
+        self.manifest().save({})
+        (self.inputs / "docs" / "new.md").write_text("# New")
+
+        self.assertIsNone(self.manifest().pages_changed())
+
+    def test_config_changed(self):
+        self.manifest().save({})
+        (self.inputs / "mkdocs.yml").write_text("site_name: changed")
+
+        self.assertIsNone(self.manifest().pages_changed())
+
+    def test_code_changed_inputs_changed(self):
+        self.manifest().save({})
+        (self.project / "src" / "app" / "code.py").write_text("x = 2")
+
+        self.assertTrue(self.manifest().changed())
+
+    def test_pages_clear(self):
+        self.manifest().save({"index.md": "Index"})
+        digest = self.manifest().read()["digest"]
+
+        self.manifest().pages_clear()
+
+        self.assertIsNone(self.manifest().pages_changed())
+        self.assertEqual(self.manifest().titles(), {})
+        self.assertEqual(self.manifest().read()["digest"], digest)
+
+    def test_pages_clear_no_manifest(self):
+        self.manifest().pages_clear()
+
+        self.assertFalse(Path(self.manifest().manifest_path).exists())
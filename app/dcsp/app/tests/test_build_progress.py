@@ -0,0 +1,84 @@
+import logging
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from app.functions.build_progress import BuildProgress
+
+
+class BuildProgressTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.build_state_folder = f"{ self.temporary_directory.name }/state/"
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def progress(self, job_id=1):
+        return BuildProgress(
+            1, job_id, build_state_folder=self.build_state_folder
+        )
+
+    def test_job_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            BuildProgress(1, "1")
+        self.assertEqual(
+            str(error.exception), "'job_id' '1' is not an integer"
+        )
+
+    def test_not_started(self):
+        self.assertEqual(self.progress().read(5), ([], 5))
+
+    def test_phases_and_lines(self):
+        progress = self.progress()
+        progress.start()
+        progress.phase("preprocessor")
+        progress.write("Line 1\nLine 2\n")
+
+        self.assertEqual(
+            progress.read(),
+            (
+                [
+                    {"phase": "preprocessor"},
+                    {"line": "Line 1"},
+                    {"line": "Line 2"},
+                ],
+                Path(progress.progress_path).stat().st_size,
+            ),
+        )
+
+    def test_read_on_partial_line(self):
+        progress = self.progress()
+        progress.start()
+        progress.write("Line 1\nLine")
+        events, offset = progress.read()
+
+        progress.write(" 2\n")
+
+        self.assertEqual(events, [{"line": "Line 1"}])
+        self.assertEqual(progress.read(offset)[0], [{"line": "Line 2"}])
+
+    def test_handler(self):
+        progress = self.progress()
+        progress.start()
+        logger = logging.getLogger("test_build_progress")
+        handler = progress.handler()
+        logger.addHandler(handler)
+
+        logger.warning("A warning")
+        logger.removeHandler(handler)
+
+        self.assertEqual(
+            progress.read()[0], [{"line": "WARNING -  A warning"}]
+        )
+
+    def test_start_removes_earlier(self):
+        earlier = self.progress(1)
+        earlier.start()
+        earlier.write("Line 1\n")
+
+        self.progress(2).start()
+
+        self.assertFalse(Path(earlier.progress_path).exists())
+        self.assertEqual(self.progress(2).read(), ([], 0))
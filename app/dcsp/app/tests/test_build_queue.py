@@ -0,0 +1,272 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.db import IntegrityError
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+
+import app.functions.constants as c
+from app.models import BuildJob, BuildStatus, Project, project_timestamp
+from app.functions.build_queue import BuildQueue
+
+
+class BuildQueueAddTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            BuildQueue().add("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_add(self):
+        job = BuildQueue().add(1)
+
+        self.assertEqual(job.project_id, 1)
+        self.assertEqual(job.status, BuildStatus.QUEUED)
+        self.assertFalse(job.force)
+        self.assertTrue(BuildQueue().is_queued(1))
+
+    def test_coalesced(self):
+        job_1 = BuildQueue().add(1)
+        job_2 = BuildQueue().add(1)
+
+        self.assertEqual(job_1.id, job_2.id)
+        self.assertEqual(BuildJob.objects.count(), 1)
+
+    def test_force_upgrades_queued(self):
+        BuildQueue().add(1)
+        job = BuildQueue().add(1, force=True)
+
+        self.assertTrue(job.force)
+        self.assertTrue(BuildJob.objects.get(id=job.id).force)
+
+    def test_claimed_while_adding(self):
+        claimed = BuildJob.objects.create(
+            project_id=1, status=BuildStatus.RUNNING
+        )
+        create = BuildJob.objects.create
+        # The first create fails as if another process had queued a build,
+        # which a worker then claimed before it could be found
+        side_effect = [IntegrityError(), None]
+
+        def create_once(**kwargs):
+            error = side_effect.pop(0)
+            if error is not None:
+                raise error
+            return create(**kwargs)
+
+        with patch.object(
+            BuildJob.objects, "create", side_effect=create_once
+        ) as mock_create:
+            job = BuildQueue().add(1)
+
+        self.assertNotEqual(job.id, claimed.id)
+        self.assertEqual(job.status, BuildStatus.QUEUED)
+        self.assertEqual(mock_create.call_count, 2)
+
+    def test_new_job_while_running(self):
+        job_1 = BuildQueue().add(1)
+        BuildQueue().claim()
+        job_2 = BuildQueue().add(1)
+
+        self.assertNotEqual(job_1.id, job_2.id)
+        self.assertEqual(BuildJob.objects.count(), 2)
+
+
+class BuildQueueScheduleTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+
+    def test_delayed(self):
+        job = BuildQueue().schedule(1)
+
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIsNone(BuildQueue().claim())
+
+    def test_delay_restarted(self):
+        job = BuildQueue().schedule(1)
+        job.run_after = timezone.now() + timedelta(seconds=1)
+        job.save()
+
+        job = BuildQueue().schedule(1)
+
+        self.assertGreater(
+            job.run_after, timezone.now() + timedelta(seconds=5)
+        )
+        self.assertEqual(BuildJob.objects.count(), 1)
+
+    def test_delay_capped(self):
+        job = BuildQueue().schedule(1)
+        job.requested = timezone.now() - timedelta(
+            seconds=c.BUILD_DEBOUNCE_MAX_SECONDS - 1
+        )
+        job.save()
+
+        job = BuildQueue().schedule(1)
+
+        self.assertLessEqual(
+            job.run_after, timezone.now() + timedelta(seconds=1)
+        )
+
+    def test_brought_forward(self):
+        BuildQueue().schedule(1)
+
+        job = BuildQueue().add(1)
+
+        self.assertLessEqual(job.run_after, timezone.now())
+        self.assertEqual(BuildQueue().claim().id, job.id)
+
+    def test_due_not_delayed(self):
+        job = BuildQueue().add(1)
+
+        self.assertEqual(BuildQueue().schedule(1).run_after, job.run_after)
+
+    def test_project_timestamp(self):
+        project_timestamp(1)
+
+        self.assertTrue(BuildQueue().is_queued(1))
+        self.assertIsNone(BuildQueue().claim())
+
+
+class BuildQueueClaimTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+        Project.objects.create(id=2, owner=self.user, name="Project 2")
+
+    def test_empty(self):
+        self.assertIsNone(BuildQueue().claim())
+
+    def test_oldest_first(self):
+        BuildJob.objects.create(project_id=2, requested=timezone.now())
+        BuildJob.objects.create(
+            project_id=1, requested=timezone.now() - timedelta(minutes=1)
+        )
+
+        job = BuildQueue().claim()
+
+        self.assertEqual(job.project_id, 1)
+        self.assertEqual(job.status, BuildStatus.RUNNING)
+        self.assertIsNotNone(job.started)
+        self.assertFalse(BuildQueue().is_queued(1))
+        self.assertTrue(BuildQueue().is_queued(2))
+
+
+class BuildQueueRecoverTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+        Project.objects.create(id=2, owner=self.user, name="Project 2")
+
+    def test_stale(self):
+        stale = BuildJob.objects.create(
+            project_id=1,
+            status=BuildStatus.RUNNING,
+            force=True,
+            started=timezone.now()
+            - timedelta(seconds=c.BUILD_STALE_SECONDS + 1),
+        )
+
+        jobs = BuildQueue().recover()
+
+        stale.refresh_from_db()
+        self.assertEqual(jobs, [stale])
+        self.assertEqual(stale.status, BuildStatus.FAILED)
+        self.assertIsNotNone(stale.finished)
+        self.assertTrue(
+            BuildJob.objects.get(project_id=1, status=BuildStatus.QUEUED).force
+        )
+
+    def test_running(self):
+        running = BuildJob.objects.create(
+            project_id=2, status=BuildStatus.RUNNING, started=timezone.now()
+        )
+
+        self.assertEqual(BuildQueue().recover(), [])
+
+        running.refresh_from_db()
+        self.assertEqual(running.status, BuildStatus.RUNNING)
+        self.assertFalse(BuildQueue().is_queued(2))
+
+
+class BuildQueueRunTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+
+    def test_run_next_empty(self):
+        self.assertIsNone(BuildQueue().run_next())
+
+    @patch("app.functions.build_queue.BuildProgress")
+    @patch("app.functions.build_queue.MkdocsControl")
+    def test_run_next(self, mock_mkdocs_control, mock_build_progress):
+        mock_mkdocs_control.return_value.build_documents.return_value = (
+            "All passed"
+        )
+        BuildQueue().add(1, force=True)
+
+        job = BuildQueue().run_next()
+
+        self.assertEqual(job.status, BuildStatus.COMPLETE)
+        self.assertEqual(job.output, "All passed")
+        self.assertIsNotNone(job.finished)
+        mock_mkdocs_control.assert_called_once_with(1)
+        mock_mkdocs_control.return_value.build_documents.assert_called_once_with(
+            force=True, progress=mock_build_progress.return_value
+        )
+        mock_build_progress.assert_called_once_with(1, job.id)
+        mock_build_progress.return_value.start.assert_called_once_with()
+        mock_build_progress.return_value.phase.assert_called_once_with(
+            "complete"
+        )
+
+    @patch("app.functions.build_queue.BuildProgress")
+    @patch("app.functions.build_queue.MkdocsControl")
+    def test_run_next_error(self, mock_mkdocs_control, mock_build_progress):
+        mock_mkdocs_control.return_value.build_documents.side_effect = (
+            FileExistsError("'/documentation-pages' does not exist")
+        )
+        BuildQueue().add(1)
+
+        job = BuildQueue().run_next()
+
+        self.assertEqual(job.status, BuildStatus.FAILED)
+        self.assertIn("'/documentation-pages' does not exist", job.output)
+        mock_build_progress.return_value.phase.assert_called_once_with(
+            "failed"
+        )
+
+
+class BuildWorkerCommandTest(TestCase):
+    @patch("app.management.commands.build_worker.MkdocsEngine")
+    @patch("app.management.commands.build_worker.BuildQueue")
+    def test_once(self, mock_build_queue, mock_mkdocs_engine):
+        mock_build_queue.return_value.run_next.return_value = None
+        mock_build_queue.return_value.recover.return_value = []
+        out = StringIO()
+
+        call_command("build_worker", "--once", stdout=out)
+
+        mock_mkdocs_engine.return_value.warm_up.assert_called_once_with()
+        mock_build_queue.return_value.recover.assert_called_once_with()
+        mock_build_queue.return_value.run_next.assert_called_once_with()
+        self.assertEqual(out.getvalue(), "")
@@ -0,0 +1,182 @@
+import time as t
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+import app.functions.constants as c
+from app.models import BuildRun, BuildRunStatus, Project
+from app.functions.build_telemetry import BuildTelemetry
+from app.functions.mkdocs_control import MkdocsControl
+
+
+class BuildTelemetryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+
+    def test_nested_phases(self):
+        telemetry = BuildTelemetry()
+
+        with telemetry.phase("preprocessor"):
+            with telemetry.phase("docstrings"):
+                t.sleep(0.05)
+
+        self.assertGreaterEqual(telemetry.durations["docstrings"], 0.05)
+        self.assertLess(telemetry.durations["preprocessor"], 0.05)
+
+    def test_phase_repeated(self):
+        telemetry = BuildTelemetry()
+
+        with telemetry.phase("mkdocs"):
+            t.sleep(0.02)
+        with telemetry.phase("mkdocs"):
+            t.sleep(0.02)
+
+        self.assertGreaterEqual(telemetry.durations["mkdocs"], 0.04)
+
+    def test_phase_error(self):
+        telemetry = BuildTelemetry()
+
+        with self.assertRaises(ValueError):
+            with telemetry.phase("mkdocs"):
+                raise ValueError()
+
+        self.assertIn("mkdocs", telemetry.durations)
+        self.assertEqual(telemetry.nested, [])
+
+    def test_record(self):
+        telemetry = BuildTelemetry()
+        with telemetry.phase("mkdocs"):
+            pass
+        telemetry.count("pages_written", 2)
+        telemetry.count("pages_written", 3)
+
+        telemetry.record(
+            1, BuildRunStatus.SUCCEEDED, "<b>Log</b>" * 1000, incremental=True
+        )
+
+        build_run = BuildRun.objects.get()
+        self.assertEqual(build_run.status, BuildRunStatus.SUCCEEDED)
+        self.assertTrue(build_run.incremental)
+        self.assertEqual(build_run.pages_written, 5)
+        self.assertEqual(build_run.files_scanned, 0)
+        self.assertIsNotNone(build_run.mkdocs_seconds)
+        self.assertIsNone(build_run.preprocessor_seconds)
+        self.assertGreater(build_run.peak_rss_kb, 0)
+        self.assertEqual(build_run.log_get(), "<b>Log</b>" * 1000)
+        self.assertLess(len(build_run.log_compressed), 1000)
+
+    def test_peak_rss(self):
+        with tempfile.TemporaryDirectory() as directory:
+            clear_refs = Path(directory, "clear_refs")
+            status = Path(directory, "status")
+            status.write_text("Name:\tpython\nVmHWM:\t  1234 kB\n")
+
+            with patch.object(c, "PROC_CLEAR_REFS", str(clear_refs)):
+                with patch.object(c, "PROC_STATUS", str(status)):
+                    telemetry = BuildTelemetry()
+                    self.assertEqual(clear_refs.read_text(), "5")
+                    self.assertEqual(telemetry.peak_rss(), 1234)
+
+    def test_peak_rss_not_measured(self):
+        with patch.object(c, "PROC_CLEAR_REFS", "/nonexistent/clear_refs"):
+            telemetry = BuildTelemetry()
+
+        telemetry.record(1, BuildRunStatus.SUCCEEDED, "")
+
+        self.assertIsNone(BuildRun.objects.get().peak_rss_kb)
+
+
+@patch.object(MkdocsControl, "build_required", return_value=True)
+class BuildDocumentsTelemetryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(id=1, owner=self.user, name="Project 1")
+
+    @patch.object(MkdocsControl, "_build_steps")
+    def test_succeeded(self, mock_build_steps, _):
+        mock_build_steps.return_value = "All passed"
+        mkdocs_control = MkdocsControl(1)
+        mkdocs_control.build_succeeded = True
+
+        mkdocs_control._build_documents(False)
+
+        self.assertEqual(
+            BuildRun.objects.get().status, BuildRunStatus.SUCCEEDED
+        )
+
+    @patch.object(MkdocsControl, "_build_steps")
+    def test_preprocessor_error(self, mock_build_steps, _):
+        mock_build_steps.return_value = "Preprocessor error!"
+
+        MkdocsControl(1)._build_documents(False)
+
+        self.assertEqual(
+            BuildRun.objects.get().status, BuildRunStatus.PREPROCESSOR_ERROR
+        )
+
+    @patch.object(MkdocsControl, "_build_steps")
+    def test_mkdocs_error(self, mock_build_steps, _):
+        mock_build_steps.return_value = "<b>Mkdocs build errors!</b>"
+
+        MkdocsControl(1)._build_documents(False)
+
+        self.assertEqual(
+            BuildRun.objects.get().status, BuildRunStatus.MKDOCS_ERROR
+        )
+
+    @patch.object(MkdocsControl, "_build_steps")
+    def test_failed(self, mock_build_steps, _):
+        mock_build_steps.side_effect = FileExistsError("no folder")
+
+        with self.assertRaises(FileExistsError):
+            MkdocsControl(1)._build_documents(False)
+
+        build_run = BuildRun.objects.get()
+        self.assertEqual(build_run.status, BuildRunStatus.FAILED)
+        self.assertEqual(build_run.log_get(), "no folder")
+
+    @patch.object(MkdocsControl, "_build_steps")
+    def test_not_required(self, mock_build_steps, mock_build_required):
+        mock_build_required.return_value = False
+
+        self.assertEqual(MkdocsControl(1)._build_documents(False), "")
+
+        mock_build_steps.assert_not_called()
+        self.assertFalse(BuildRun.objects.exists())
+
+
+class BuildRunAdminTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        project = Project.objects.create(
+            id=1, owner=self.user, name="Project 1"
+        )
+        BuildRun.objects.create(project=project, total_seconds=2)
+        BuildRun.objects.create(
+            project=project,
+            total_seconds=4,
+            status=BuildRunStatus.MKDOCS_ERROR,
+        )
+        self.client.force_login(self.user)
+
+    def test_trends(self):
+        response = self.client.get("/admin/app/buildrun/")
+
+        self.assertEqual(response.status_code, 200)
+        trend = response.context["trends"][0]
+        self.assertEqual(trend["project__name"], "Project 1")
+        self.assertEqual(trend["runs"], 2)
+        self.assertEqual(trend["failures"], 1)
+        self.assertEqual(trend["total_average"], 3)
+        self.assertEqual(trend["total_maximum"], 4)
+        self.assertContains(response, "Trends per project")
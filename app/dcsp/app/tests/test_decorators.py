@@ -13,6 +13,7 @@ import app.functions.constants as c
 sys.path.append(c.FUNCTIONS_APP)
 
 import app.views as views
+from app.decorators import request_project
 from app.models import Project
 
 
@@ -96,19 +97,19 @@ class ProjectAccessTest(TestCase):
         )
         mock_std_context.assert_called_once_with()
 
-    @patch("app.views.user_accessible_projects")
+    @patch("app.decorators.can_access")
     @patch("app.decorators.messages.error")
     @patch("app.views.std_context")
     def test_no_user_access(
         self,
         mock_std_context,
         mock_messages_error,
-        mock_user_accessible_projects,
+        mock_can_access,
     ):
         project_id = "1"
         Project.objects.create(id=1, owner=self.user, name="Test Project")
 
-        mock_user_accessible_projects.return_value = [{"doc_id": 2}]
+        mock_can_access.return_value = False
         # mock_messages_error - here we are mocking the messages.error function
         mock_std_context.return_value = {"test": "test"}
 
@@ -126,10 +127,12 @@ class ProjectAccessTest(TestCase):
         mock_messages_error.assert_called_once_with(
             request, f"You do not have access to this project!"
         )
-        mock_user_accessible_projects.assert_called_once_with(request)
+        mock_can_access.assert_called_once_with(
+            request.user, Project.objects.get(id=1)
+        )
         mock_std_context.assert_called_once_with()
 
-    @patch("app.views.user_accessible_projects")
+    @patch("app.decorators.can_access")
     @patch("app.decorators.ProjectBuilder")
     @patch("app.views.Path.is_dir")
     @patch("app.decorators.messages.error")
@@ -140,13 +143,13 @@ class ProjectAccessTest(TestCase):
         mock_messages_error,
         mock_is_dir,
         mock_project_builder,
-        mock_user_accessible_projects,
+        mock_can_access,
     ):
         project_id = "1"
         project_id_int = int(project_id)
         Project.objects.create(id=1, owner=self.user, name="Test Project")
 
-        mock_user_accessible_projects.return_value = [{"doc_id": 1}]
+        mock_can_access.return_value = True
         mock_project_builder.return_value.configuration_get.return_value = {
             "setup_step": 2
         }
@@ -165,7 +168,9 @@ class ProjectAccessTest(TestCase):
 
         self.assertEqual(response.status_code, 500)
 
-        mock_user_accessible_projects.assert_called_once_with(request)
+        mock_can_access.assert_called_once_with(
+            request.user, Project.objects.get(id=1)
+        )
         mock_project_builder.assert_called_once_with(project_id_int)
         mock_project_builder.return_value.configuration_get.assert_called_once_with()
         mock_messages_error.assert_called_once_with(
@@ -178,12 +183,12 @@ class ProjectAccessTest(TestCase):
         )
         mock_std_context.assert_called_once_with()
 
-    @patch("app.views.user_accessible_projects")
+    @patch("app.decorators.can_access")
     @patch("app.decorators.ProjectBuilder")
     def test_allow_access(
         self,
         mock_project_builder,
-        mock_user_accessible_projects,
+        mock_can_access,
     ):
         project_id = "1"
         project_id_int = int(project_id)
@@ -194,7 +199,7 @@ class ProjectAccessTest(TestCase):
 
         Project.objects.create(id=1, owner=self.user, name="Test Project")
 
-        mock_user_accessible_projects.return_value = [{"doc_id": 1}]
+        mock_can_access.return_value = True
 
         mock_project_builder.return_value.configuration_get.return_value = {
             "setup_step": 1
@@ -206,6 +211,34 @@ class ProjectAccessTest(TestCase):
         response = mock_view(request, project_id)
 
         self.assertEqual(response.content, b"Success")
-        mock_user_accessible_projects.assert_called_once_with(request)
+        self.assertEqual(request.project.id, 1)
+        mock_can_access.assert_called_once_with(
+            request.user, Project.objects.get(id=1)
+        )
         mock_project_builder.assert_called_once_with(project_id_int)
         mock_project_builder.return_value.configuration_get.assert_called_once_with()
+
+
+class RequestProjectTest(TestCase):
+    def setUp(self):
+        log_in(self)
+        self.project = Project.objects.create(
+            id=1, owner=self.user, name="Test Project"
+        )
+
+    def test_attached(self):
+        request = HttpRequest()
+        request.project = self.project
+
+        with self.assertNumQueries(0):
+            self.assertIs(request_project(request, 1), self.project)
+
+    def test_not_attached(self):
+        self.assertEqual(request_project(HttpRequest(), 1), self.project)
+
+    def test_other_project(self):
+        Project.objects.create(id=2, owner=self.user, name="Other Project")
+        request = HttpRequest()
+        request.project = self.project
+
+        self.assertEqual(request_project(request, 2).name, "Other Project")
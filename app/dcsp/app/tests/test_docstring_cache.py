@@ -0,0 +1,213 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+
+import app.functions.docstring_manipulation as docstring_manipulation
+from app.functions.docstring_cache import DocstringCache
+from app.functions.docstring_manipulation import DocstringManipulation
+
+
+class DocstringCacheTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.build_state_folder = f"{ self.temporary_directory.name }/state/"
+        self.source = Path(self.temporary_directory.name) / "source.py"
+        self.source.write_text('def a():\n    """A"""\n')
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def cache(self, max_entries=10):
+        return DocstringCache(
+            1,
+            build_state_folder=self.build_state_folder,
+            max_entries=max_entries,
+        )
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            DocstringCache("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_empty(self):
+        self.assertIsNone(self.cache().get(str(self.source), "docstrings"))
+
+    def test_persisted(self):
+        cache = self.cache()
+        cache.set(str(self.source), "docstrings", [["a", "A"]])
+        cache.save()
+
+        self.assertEqual(
+            self.cache().get(str(self.source), "docstrings"), [["a", "A"]]
+        )
+        self.assertIsNone(self.cache().get(str(self.source), "hazards"))
+
+    def test_nonexistent_file(self):
+        cache = self.cache()
+        cache.set("/nonexistent/file.py", "docstrings", [])
+
+        self.assertIsNone(cache.get("/nonexistent/file.py", "docstrings"))
+        self.assertFalse(cache.modified)
+
+    def test_touched_unchanged(self):
+        cache = self.cache()
+        cache.set(str(self.source), "docstrings", [["a", "A"]])
+        os.utime(self.source, ns=(0, 0))
+
+        self.assertEqual(
+            cache.get(str(self.source), "docstrings"), [["a", "A"]]
+        )
+
+    def test_content_changed(self):
+        cache = self.cache()
+        cache.set(str(self.source), "docstrings", [["a", "A"]])
+        self.source.write_text('def b():\n    """B"""\n')
+        os.utime(self.source, ns=(0, 0))
+
+        self.assertIsNone(cache.get(str(self.source), "docstrings"))
+        self.assertNotIn(str(self.source), cache.entries)
+
+    def test_eviction(self):
+        sources = []
+        for number in range(3):
+            source = Path(self.temporary_directory.name) / f"s{ number }.py"
+            source.write_text(f"x = { number }")
+            sources.append(str(source))
+        cache = self.cache(max_entries=2)
+        for source in sources:
+            cache.set(source, "docstrings", [])
+        cache.get(sources[0], "docstrings")
+
+        cache.save()
+
+        reloaded = self.cache()
+        self.assertEqual(reloaded.get(sources[0], "docstrings"), [])
+        self.assertIsNone(reloaded.get(sources[1], "docstrings"))
+        self.assertEqual(reloaded.get(sources[2], "docstrings"), [])
+
+    def test_read_only_not_saved(self):
+        cache = self.cache()
+        cache.set(str(self.source), "docstrings", [["a", "A"]])
+        cache.save()
+        os.utime(cache.cache_path, ns=(0, 0))
+
+        reloaded = self.cache()
+        reloaded.get(str(self.source), "docstrings")
+        reloaded.save()
+
+        self.assertFalse(reloaded.modified)
+        self.assertEqual(os.stat(cache.cache_path).st_mtime_ns, 0)
+
+    def test_save_unmodified(self):
+        self.cache().save()
+
+        self.assertFalse(Path(self.cache().cache_path).exists())
+
+
+class DocstringManipulationCacheTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.source = Path(self.temporary_directory.name) / "source.py"
+        self.source.write_text(
+            "def a():\n"
+            '    """Function a\n\n'
+            "    Hazards:\n"
+            "        Wrong patient (1)\n"
+            '    """\n'
+        )
+        self.cache = DocstringCache(
+            1, build_state_folder=f"{ self.temporary_directory.name }/state/"
+        )
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_parsed_once(self):
+        docstring = DocstringManipulation(1, cache=self.cache)
+        hazards = docstring.extract_hazards(str(self.source))
+
+        with patch(
+            "app.functions.docstring_manipulation.ast.parse"
+        ) as mock_parse:
+            self.assertEqual(
+                docstring.extract_docstrings(str(self.source)),
+                [
+                    (
+                        "a",
+                        "Function a\n\n    Hazards:\n        Wrong patient (1)\n    ",
+                    )
+                ],
+            )
+            self.assertEqual(
+                docstring.extract_hazards(str(self.source)), hazards
+            )
+
+        mock_parse.assert_not_called()
+        self.assertEqual(hazards[0]["hazard_number"], "1")
+
+
+class DocstringManipulationParallelTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.sources = []
+        for number in range(1, 6):
+            source = Path(self.temporary_directory.name) / f"s{ number }.py"
+            source.write_text(
+                f"def function_{ number }():\n"
+                '    """Function\n\n'
+                "    Hazards:\n"
+                f"        Hazard ({ number })\n"
+                '    """\n'
+            )
+            self.sources.append(str(source))
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def cache(self):
+        return DocstringCache(
+            1, build_state_folder=f"{ self.temporary_directory.name }/state/"
+        )
+
+    def test_same_as_serial(self):
+        file_paths = list(reversed(self.sources)) + [self.sources[0]]
+        serial = DocstringManipulation(
+            1, cache=DocstringCache(1, persistent=False), workers=1
+        ).hazards_extracted(file_paths)
+        cache = self.cache()
+
+        parallel = DocstringManipulation(
+            1, cache=cache, workers=3
+        ).hazards_extracted(file_paths)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(list(parallel), list(reversed(self.sources)))
+        self.assertEqual(
+            cache.get(self.sources[2], "hazards"), serial[self.sources[2]]
+        )
+
+    @patch("app.functions.docstring_manipulation._pool_docstring", None)
+    def test_pool_not_initialised(self):
+        with self.assertRaises(RuntimeError) as error:
+            docstring_manipulation._pool_extract_hazards(self.sources[0])
+        self.assertEqual(
+            str(error.exception), "The pool process has not been initialised"
+        )
+
+    @patch("app.functions.docstring_manipulation.ProcessPoolExecutor")
+    def test_cached_not_parsed(self, mock_executor):
+        cache = self.cache()
+        for source in self.sources:
+            cache.set(source, "hazards", [])
+
+        hazards = DocstringManipulation(
+            1, cache=cache, workers=3
+        ).hazards_extracted(self.sources)
+
+        self.assertEqual(hazards, {source: [] for source in self.sources})
+        mock_executor.assert_not_called()
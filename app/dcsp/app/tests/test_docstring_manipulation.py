@@ -1,6 +1,9 @@
+import tempfile
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import Mock, MagicMock, patch, call, PropertyMock
 from django.test import tag
+from git import Repo
 
 from app.functions.docstring_manipulation import DocstringManipulation
 import app.functions.constants as c
@@ -45,31 +48,25 @@ class DocstringAllTest(TestCase):
     @patch(
         "app.functions.docstring_manipulation.DocstringManipulation.extract_hazards"
     )
+    @patch(
+        "app.functions.docstring_manipulation.DocstringManipulation.source_index"
+    )
     def test_function_and_hazard_present(
-        self, mock_extract_hazards, mock_open, mock_path
+        self, mock_source_index, mock_extract_hazards, mock_open, mock_path
     ):
         project_id = 1
         docs_folder: str = f"{ c.PROJECTS_FOLDER }project_{ project_id }/{ c.CLINICAL_SAFETY_FOLDER }docs/"
 
         mock_path.return_value.exists.side_effect = [True, True]
 
-        mock_file_1 = MagicMock()
-        mock_file_1.name = "function_1.py"
-        mock_file_1.__str__.return_value = "/path/to/function_1.py"
+        mock_source_index.return_value = {
+            "function_1.py": ["/path/to/function_1.py"],
+            "function_2.py": ["/path/to/function_2.py"],
+        }
 
-        mock_file_2 = MagicMock()
-        mock_file_2.name = "function_2.py"
-        mock_file_2.__str__.return_value = "/path/to/function_2.py"
-
-        mock_path.return_value.rglob.side_effect = [
-            [
-                f"{ docs_folder }file1.md",
-                f"{ docs_folder }file2.md",
-            ],
-            [
-                mock_file_1,
-                mock_file_2,
-            ],
+        mock_path.return_value.rglob.return_value = [
+            f"{ docs_folder }file1.md",
+            f"{ docs_folder }file2.md",
         ]
 
         mock_open.return_value.__enter__().readlines.side_effect = [
@@ -99,12 +96,12 @@ class DocstringAllTest(TestCase):
 
         self.assertEqual(docstring_return, d.DOCSTRING_ALL_RETURN_SINGLE)
 
-        self.assertEqual(mock_path.call_count, 4)
+        self.assertEqual(mock_path.call_count, 3)
         self.assertEqual(mock_path.return_value.exists.call_count, 2)
-        self.assertEqual(mock_path.return_value.rglob.call_count, 2)
-        self.assertEqual(mock_file_1.__str__.call_count, 2)
-        self.assertEqual(mock_file_2.__str__.call_count, 2)
-        mock_path.return_value.rglob.calls = [call("*.md"), call("*.py")]
+        mock_path.return_value.rglob.assert_called_once_with("*.md")
+        mock_source_index.assert_called_once_with(
+            f"{ c.PROJECTS_FOLDER }project_{ project_id }/"
+        )
         self.assertEqual(
             mock_open.return_value.__enter__().readlines.call_count, 2
         )
@@ -115,36 +112,26 @@ class DocstringAllTest(TestCase):
     @patch(
         "app.functions.docstring_manipulation.DocstringManipulation.extract_hazards"
     )
+    @patch(
+        "app.functions.docstring_manipulation.DocstringManipulation.source_index"
+    )
     def test_two_lines_of_triple_colons(
-        self, mock_extract_hazards, mock_open, mock_path
+        self, mock_source_index, mock_extract_hazards, mock_open, mock_path
     ):
         project_id = 1
         docs_folder: str = f"{ c.PROJECTS_FOLDER }project_{ project_id }/{ c.CLINICAL_SAFETY_FOLDER }docs/"
 
         mock_path.return_value.exists.side_effect = [True, True]
 
-        mock_file_1 = MagicMock()
-        mock_file_1.name = "function_1.py"
-        mock_file_1.__str__.return_value = "/path/to/function_1.py"
-
-        mock_file_2 = MagicMock()
-        mock_file_2.name = "function_2.py"
-        mock_file_2.__str__.return_value = "/path/to/function_2.py"
+        mock_source_index.return_value = {
+            "function_1.py": ["/path/to/function_1.py"],
+            "function_2.py": ["/path/to/function_2.py"],
+            "function_3.py": ["/path/to/function_3.py"],
+        }
 
-        mock_file_3 = MagicMock()
-        mock_file_3.name = "function_3.py"
-        mock_file_3.__str__.return_value = "/path/to/function_3.py"
-
-        mock_path.return_value.rglob.side_effect = [
-            [
-                f"{ docs_folder }file1.md",
-                f"{ docs_folder }file2.md",
-            ],
-            [
-                mock_file_1,
-                mock_file_2,
-                mock_file_3,
-            ],
+        mock_path.return_value.rglob.return_value = [
+            f"{ docs_folder }file1.md",
+            f"{ docs_folder }file2.md",
         ]
 
         mock_open.return_value.__enter__().readlines.side_effect = [
@@ -187,12 +174,12 @@ class DocstringAllTest(TestCase):
 
         self.assertEqual(docstring_return, d.DOCSTRING_ALL_RETURN_DOUBLE)
 
-        self.assertEqual(mock_path.call_count, 4)
+        self.assertEqual(mock_path.call_count, 3)
         self.assertEqual(mock_path.return_value.exists.call_count, 2)
-        self.assertEqual(mock_path.return_value.rglob.call_count, 2)
-        self.assertEqual(mock_file_1.__str__.call_count, 2)
-        self.assertEqual(mock_file_2.__str__.call_count, 2)
-        self.assertEqual(mock_file_3.__str__.call_count, 2)
+        mock_path.return_value.rglob.assert_called_once_with("*.md")
+        mock_source_index.assert_called_once_with(
+            f"{ c.PROJECTS_FOLDER }project_{ project_id }/"
+        )
         self.assertEqual(
             mock_open.return_value.__enter__().readlines.call_count, 2
         )
@@ -203,31 +190,25 @@ class DocstringAllTest(TestCase):
     @patch(
         "app.functions.docstring_manipulation.DocstringManipulation.extract_hazards"
     )
+    @patch(
+        "app.functions.docstring_manipulation.DocstringManipulation.source_index"
+    )
     def test_no_functions_in_markdown_files(
-        self, mock_extract_hazards, mock_open, mock_path
+        self, mock_source_index, mock_extract_hazards, mock_open, mock_path
     ):
         project_id = 1
         docs_folder: str = f"{ c.PROJECTS_FOLDER }project_{ project_id }/{ c.CLINICAL_SAFETY_FOLDER }docs/"
 
         mock_path.return_value.exists.side_effect = [True, True]
 
-        mock_file_1 = MagicMock()
-        mock_file_1.name = "function_1.py"
-        mock_file_1.__str__.return_value = "/path/to/function_1.py"
-
-        mock_file_2 = MagicMock()
-        mock_file_2.name = "function_2.py"
-        mock_file_2.__str__.return_value = "/path/to/function_2.py"
+        mock_source_index.return_value = {
+            "function_1.py": ["/path/to/function_1.py"],
+            "function_2.py": ["/path/to/function_2.py"],
+        }
 
-        mock_path.return_value.rglob.side_effect = [
-            [
-                f"{ docs_folder }file1.md",
-                f"{ docs_folder }file2.md",
-            ],
-            [
-                mock_file_1,
-                mock_file_2,
-            ],
+        mock_path.return_value.rglob.return_value = [
+            f"{ docs_folder }file1.md",
+            f"{ docs_folder }file2.md",
         ]
 
         mock_open.return_value.__enter__().readlines.side_effect = [
@@ -267,11 +248,12 @@ class DocstringAllTest(TestCase):
 
         self.assertEqual(docstring_return, [])
 
-        self.assertEqual(mock_path.call_count, 4)
+        self.assertEqual(mock_path.call_count, 3)
         self.assertEqual(mock_path.return_value.exists.call_count, 2)
-        self.assertEqual(mock_path.return_value.rglob.call_count, 2)
-        mock_file_1.__str__.assert_not_called()
-        mock_file_2.__str__.assert_not_called()
+        mock_path.return_value.rglob.assert_called_once_with("*.md")
+        mock_source_index.assert_called_once_with(
+            f"{ c.PROJECTS_FOLDER }project_{ project_id }/"
+        )
         self.assertEqual(
             mock_open.return_value.__enter__().readlines.call_count, 2
         )
@@ -282,31 +264,25 @@ class DocstringAllTest(TestCase):
     @patch(
         "app.functions.docstring_manipulation.DocstringManipulation.extract_hazards"
     )
+    @patch(
+        "app.functions.docstring_manipulation.DocstringManipulation.source_index"
+    )
     def test_no_hazards_in_function_files(
-        self, mock_extract_hazards, mock_open, mock_path
+        self, mock_source_index, mock_extract_hazards, mock_open, mock_path
     ):
         project_id = 1
         docs_folder: str = f"{ c.PROJECTS_FOLDER }project_{ project_id }/{ c.CLINICAL_SAFETY_FOLDER }docs/"
 
         mock_path.return_value.exists.side_effect = [True, True]
 
-        mock_file_1 = MagicMock()
-        mock_file_1.name = "function_1.py"
-        mock_file_1.__str__.return_value = "/path/to/function_1.py"
-
-        mock_file_2 = MagicMock()
-        mock_file_2.name = "function_2.py"
-        mock_file_2.__str__.return_value = "/path/to/function_2.py"
+        mock_source_index.return_value = {
+            "function_1.py": ["/path/to/function_1.py"],
+            "function_2.py": ["/path/to/function_2.py"],
+        }
 
-        mock_path.return_value.rglob.side_effect = [
-            [
-                f"{ docs_folder }file1.md",
-                f"{ docs_folder }file2.md",
-            ],
-            [
-                mock_file_1,
-                mock_file_2,
-            ],
+        mock_path.return_value.rglob.return_value = [
+            f"{ docs_folder }file1.md",
+            f"{ docs_folder }file2.md",
         ]
 
         mock_open.return_value.__enter__().readlines.side_effect = [
@@ -321,17 +297,134 @@ class DocstringAllTest(TestCase):
 
         self.assertEqual(docstring_return, [])
 
-        self.assertEqual(mock_path.call_count, 4)
+        self.assertEqual(mock_path.call_count, 3)
         self.assertEqual(mock_path.return_value.exists.call_count, 2)
-        self.assertEqual(mock_path.return_value.rglob.call_count, 2)
-        self.assertEqual(mock_file_1.__str__.call_count, 2)
-        self.assertEqual(mock_file_2.__str__.call_count, 2)
+        mock_path.return_value.rglob.assert_called_once_with("*.md")
+        mock_source_index.assert_called_once_with(
+            f"{ c.PROJECTS_FOLDER }project_{ project_id }/"
+        )
         self.assertEqual(
             mock_open.return_value.__enter__().readlines.call_count, 2
         )
         self.assertEqual(mock_extract_hazards.call_count, 2)
 
 
+class HazardIndexTest(TestCase):
+    def test_index(self):
+        referenced_hazards = [
+            {
+                "mk_file_path": "code/function_1.md",
+                "code_file": "function_1.py",
+                "hazards": [
+                    {"sub_routine": "func_a", "hazard_number": "1"},
+                    {"sub_routine": "func_b", "hazard_number": None},
+                ],
+            },
+            {
+                "mk_file_path": "code/function_2.md",
+                "code_file": "function_2.py",
+                "hazards": [
+                    {"sub_routine": "func_c", "hazard_number": "1"},
+                    {"sub_routine": "func_d", "hazard_number": "2"},
+                ],
+            },
+        ]
+
+        index = DocstringManipulation(1).hazard_index(referenced_hazards)
+
+        self.assertEqual(
+            index,
+            {
+                "1": [
+                    {
+                        "sub_routine": "func_a",
+                        "code_file": "function_1.py",
+                        "mk_file_path": "code/function_1.md",
+                    },
+                    {
+                        "sub_routine": "func_c",
+                        "code_file": "function_2.py",
+                        "mk_file_path": "code/function_2.md",
+                    },
+                ],
+                "2": [
+                    {
+                        "sub_routine": "func_d",
+                        "code_file": "function_2.py",
+                        "mk_file_path": "code/function_2.md",
+                    },
+                ],
+            },
+        )
+
+    @patch(
+        "app.functions.docstring_manipulation.DocstringManipulation.docstring_all"
+    )
+    def test_index_calls_docstring_all(self, mock_docstring_all):
+        mock_docstring_all.return_value = []
+
+        self.assertEqual(DocstringManipulation(1).hazard_index(), {})
+        mock_docstring_all.assert_called_once_with()
+
+
+class SourceIndexTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.project_folder = f"{ self.temporary_directory.name }/project_1/"
+        for relative_path in [
+            "app/main.py",
+            "app/sub/main.py",
+            "app/notes.md",
+            "node_modules/pkg/main.py",
+            ".git/hooks/hook.py",
+            "env/pyvenv.cfg",
+            "env/lib/python3/site.py",
+            "generated/output.py",
+            "app/local_settings.py",
+        ]:
+            Path(f"{ self.project_folder }{ relative_path }").parent.mkdir(
+                parents=True, exist_ok=True
+            )
+            Path(f"{ self.project_folder }{ relative_path }").write_text("")
+        Path(f"{ self.project_folder }.gitignore").write_text(
+            "# Comment\ngenerated/\nlocal_*.py\n!keep.py\n"
+        )
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def expected(self):
+        return {
+            "main.py": [
+                f"{ self.project_folder }app/main.py",
+                f"{ self.project_folder }app/sub/main.py",
+            ],
+        }
+
+    def test_walk(self):
+        index = DocstringManipulation(1).source_index(self.project_folder)
+
+        self.assertEqual(index, self.expected())
+
+    def test_git(self):
+        Path(f"{ self.project_folder }.git").rename(
+            f"{ self.temporary_directory.name }/hooks"
+        )
+        Repo.init(self.project_folder)
+
+        doc = DocstringManipulation(1)
+        with patch.object(DocstringManipulation, "source_files_walk") as walk:
+            index = doc.source_index(self.project_folder)
+
+        self.assertEqual(index, self.expected())
+        walk.assert_not_called()
+
+    def test_not_git(self):
+        self.assertIsNone(
+            DocstringManipulation(1).source_files_git(self.project_folder)
+        )
+
+
 class ExtractDocstringTest(TestCase):
     @patch("app.functions.docstring_manipulation.Path")
     def test_bad_filename(self, mock_path):
@@ -0,0 +1,148 @@
+import os
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from app.functions.mkdocs_engine import MkdocsEngine
+
+
+class MkdocsEngineWarmUpTest(TestCase):
+    def tearDown(self):
+        MkdocsEngine.warm = False
+
+    @patch("app.functions.mkdocs_engine.get_themes")
+    @patch("app.functions.mkdocs_engine.get_plugins")
+    def test_warm_up_once(self, mock_get_plugins, mock_get_themes):
+        mock_get_plugins.return_value = {}
+        mock_get_themes.return_value = {}
+        MkdocsEngine.warm = False
+
+        MkdocsEngine().warm_up()
+        MkdocsEngine().warm_up()
+
+        mock_get_plugins.assert_called_once_with()
+        mock_get_themes.assert_called_once_with()
+        self.assertTrue(MkdocsEngine.warm)
+
+    @patch("app.functions.mkdocs_engine.get_themes")
+    @patch("app.functions.mkdocs_engine.get_plugins")
+    def test_warm_up_plugin_error(self, mock_get_plugins, mock_get_themes):
+        mock_get_plugins.return_value = {"broken": mock_get_plugins}
+        mock_get_plugins.load.side_effect = ImportError("no module")
+        mock_get_themes.return_value = {}
+        MkdocsEngine.warm = False
+
+        with self.assertLogs("app.functions.mkdocs_engine", "WARNING"):
+            MkdocsEngine().warm_up()
+
+        self.assertTrue(MkdocsEngine.warm)
+
+
+class MkdocsEngineBuildTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.documents = Path(self.temporary_directory.name) / "documents"
+        self.site = Path(self.temporary_directory.name) / "site"
+        (self.documents / "docs").mkdir(parents=True)
+        (self.documents / "docs" / "index.md").write_text("# Index")
+        self.site.mkdir()
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_build(self):
+        (self.documents / "mkdocs.yml").write_text("site_name: test\n")
+        cwd = os.getcwd()
+
+        result = MkdocsEngine().build(
+            str(self.documents / "mkdocs.yml"), str(self.site)
+        )
+
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("Documentation built in", result.stderr)
+        self.assertTrue((self.site / "index.html").is_file())
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_build_config_error(self):
+        (self.documents / "mkdocs.yml").write_text(
+            "site_name: test\nplugins:\n  - not-a-plugin\n"
+        )
+
+        result = MkdocsEngine().build(
+            str(self.documents / "mkdocs.yml"), str(self.site)
+        )
+
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("not-a-plugin", result.stderr)
+        self.assertFalse((self.site / "index.html").is_file())
+
+
+class MkdocsEngineIncrementalTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.documents = Path(self.temporary_directory.name) / "documents"
+        self.site = Path(self.temporary_directory.name) / "site"
+        (self.documents / "docs").mkdir(parents=True)
+        (self.documents / "docs" / "index.md").write_text("# Index\n\nalpha")
+        (self.documents / "docs" / "other.md").write_text("# Other\n\nbeta")
+        (self.documents / "mkdocs.yml").write_text(
+            "site_name: test\nuse_directory_urls: false\n"
+        )
+        self.site.mkdir()
+        self.config_file = str(self.documents / "mkdocs.yml")
+        MkdocsEngine().build(self.config_file, str(self.site))
+        os.utime(self.site / "other.html", ns=(0, 0))
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def search_locations(self):
+        search_index = json.loads(
+            (self.site / "search" / "search_index.json").read_text()
+        )
+        return {doc["location"].split("#")[0] for doc in search_index["docs"]}
+
+    def test_full_build_titles(self):
+        engine = MkdocsEngine()
+
+        engine.build(self.config_file, str(self.site))
+
+        self.assertEqual(
+            engine.titles, {"index.md": "Index", "other.md": "Other"}
+        )
+
+    def test_only_pages_rendered(self):
+        (self.documents / "docs" / "index.md").write_text("# Index\n\ngamma")
+        (self.documents / "docs" / "other.md").write_text("# Other\n\ndelta")
+        engine = MkdocsEngine()
+
+        result = engine.build(
+            self.config_file,
+            str(self.site),
+            pages=["index.md"],
+            titles={"index.md": "Index", "other.md": "Other"},
+        )
+
+        self.assertEqual(result.returncode, 0)
+        self.assertNotIn("dirty", result.stderr)
+        self.assertEqual(engine.titles, {"index.md": "Index"})
+        self.assertIn("gamma", (self.site / "index.html").read_text())
+        self.assertEqual(os.stat(self.site / "other.html").st_mtime_ns, 0)
+        self.assertEqual(self.search_locations(), {"index.html", "other.html"})
+
+    def test_missing_page_rendered(self):
+        (self.site / "other.html").unlink()
+        engine = MkdocsEngine()
+
+        engine.build(
+            self.config_file,
+            str(self.site),
+            pages=[],
+            titles={"index.md": "Index", "other.md": "Other"},
+        )
+
+        self.assertEqual(engine.titles, {"other.md": "Other"})
+        self.assertTrue((self.site / "other.html").is_file())
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
 from django.utils import timezone
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.test import tag
@@ -50,9 +50,10 @@ class TestProjectTimestamp(TestCase):
         mock_project.objects.filter.assert_called_once_with(id=1)
         mock_project.objects.get.assert_not_called()
 
+    @patch("app.functions.build_queue.BuildQueue")
     @patch("app.models.Project")
     @patch("django.utils.timezone.now")
-    def test_project_timestamp(self, mock_now, mock_project):
+    def test_project_timestamp(self, mock_now, mock_project, mock_build_queue):
         mock_now.return_value = "2022-01-01T00:00:00Z"
         mock_project.objects.filter.return_value.exists.return_value = True
         mock_project.objects.get.return_value = Mock()
@@ -63,7 +64,10 @@ class TestProjectTimestamp(TestCase):
 
         mock_project.objects.filter.assert_called_once_with(id=1)
         mock_project.objects.get.assert_called_once_with(id=1)
-        mock_project.objects.get.return_value.save.assert_called_once()
+        mock_project.objects.get.return_value.save.assert_called_once_with(
+            update_fields=["last_modified"]
+        )
+        mock_build_queue.return_value.schedule.assert_called_once_with(1)
 
 
 class UserProfileTest(TestCase):
@@ -203,6 +207,20 @@ class ProjectOrderingTest(TestCase):
         self.assertEqual(projects[1].name, "B Project")
 
 
+class ProjectNameIndexTest(TestCase):
+    def test_index(self):
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(
+                cursor, "app_project"
+            )
+
+        # Only created on PostgreSQL, for text_pattern_ops
+        self.assertEqual(
+            "app_project_name_upper" in indexes,
+            connection.vendor == "postgresql",
+        )
+
+
 class UserProjectAttributeTest(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest.mock import Mock, patch, call, MagicMock
 from pathlib import Path
 
@@ -7,6 +9,7 @@ from django.http import HttpRequest, HttpResponse
 from django.test import RequestFactory
 from django.contrib.sessions.middleware import SessionMiddleware
 
+import app.functions.project_builder as project_builder
 from app.functions.project_builder import ProjectBuilder
 import app.functions.constants as c
 import app.tests.data_project_builder as d
@@ -556,6 +559,122 @@ class CopyTemplatesTest(TestCase):
         )
 
 
+class MetadataGetTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.safety_directory = f"{ self.temporary_directory.name }/safety/"
+        os.makedirs(f"{ self.safety_directory }templates/")
+        for entry_type in ("hazard", "incident"):
+            Path(
+                f"{ self.safety_directory }templates/{ entry_type }"
+                f"{ c.ENTRY_TEMPLATE_SUFFIX }"
+            ).write_text("# Heading\n")
+        Path(f"{ self.safety_directory }documents.yml").write_text(
+            "entries:\n  - incident\n  - hazard\n"
+        )
+        Path(f"{ self.safety_directory }setup.ini").write_text(
+            'setup_step="2"\n'
+        )
+        project_builder._project_metadata_cache.clear()
+
+    def tearDown(self):
+        project_builder._project_metadata_cache.clear()
+        self.temporary_directory.cleanup()
+
+    def builder(self):
+        builder = ProjectBuilder(1)
+        builder.safety_directory = self.safety_directory
+        builder.documents_yaml = f"{ self.safety_directory }documents.yml"
+        builder.entries_templates_dir = f"{ self.safety_directory }templates/"
+        return builder
+
+    def touch(self, path):
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_metadata(self):
+        self.assertEqual(
+            self.builder().metadata_get(),
+            {"entry_templates": ["incident", "hazard"], "setup_step": 2},
+        )
+
+    def test_cached(self):
+        self.builder().metadata_get()
+
+        with patch.object(
+            ProjectBuilder, "entry_template_names"
+        ) as mock_entry_template_names, patch.object(
+            ProjectBuilder, "configuration_get"
+        ) as mock_configuration_get:
+            metadata = self.builder().metadata_get()
+
+        self.assertEqual(metadata["entry_templates"], ["incident", "hazard"])
+        mock_entry_template_names.assert_not_called()
+        mock_configuration_get.assert_not_called()
+
+    def test_caller_changes_not_cached(self):
+        self.builder().metadata_get()["entry_templates"].append("changed")
+
+        self.assertEqual(
+            self.builder().metadata_get()["entry_templates"],
+            ["incident", "hazard"],
+        )
+
+    def test_template_added(self):
+        self.builder().metadata_get()
+        Path(
+            f"{ self.safety_directory }templates/risk"
+            f"{ c.ENTRY_TEMPLATE_SUFFIX }"
+        ).write_text("# Heading\n")
+        self.touch(f"{ self.safety_directory }templates/")
+
+        self.assertEqual(
+            self.builder().metadata_get()["entry_templates"],
+            ["incident", "hazard", "risk"],
+        )
+
+    def test_setup_ini_changed(self):
+        self.builder().metadata_get()
+        Path(f"{ self.safety_directory }setup.ini").write_text(
+            'setup_step="3"\n'
+        )
+        self.touch(f"{ self.safety_directory }setup.ini")
+
+        self.assertEqual(self.builder().metadata_get()["setup_step"], 3)
+
+    @patch.object(ProjectBuilder, "_metadata_signature")
+    def test_configuration_set_clears(self, mock_metadata_signature):
+        mock_metadata_signature.return_value = ((1, 1), (1, 1), (1, 1))
+        self.builder().metadata_get()
+
+        self.builder().configuration_set("setup_step", "3")
+
+        self.assertEqual(self.builder().metadata_get()["setup_step"], 3)
+
+    @patch.object(ProjectBuilder, "_metadata_signature")
+    @patch("app.functions.project_builder.shutil")
+    def test_copy_master_template_clears(
+        self, mock_shutil, mock_metadata_signature
+    ):
+        mock_metadata_signature.return_value = ((1, 1), (1, 1), (1, 1))
+        self.builder().metadata_get()
+
+        with patch("app.functions.project_builder.Path") as mock_path:
+            mock_path.return_value.is_dir.return_value = True
+            self.builder().copy_master_template("template_1")
+
+        self.assertNotIn(1, project_builder._project_metadata_cache)
+
+    def test_invalid_setup_step(self):
+        Path(f"{ self.safety_directory }setup.ini").write_text(
+            'setup_step="x"\n'
+        )
+
+        self.assertEqual(self.builder().metadata_get()["setup_step"], 1)
+        self.assertEqual(self.builder().metadata_get()["setup_step"], 1)
+        self.assertIn(1, project_builder._project_metadata_cache)
+
+
 class GetPlaceholdersTest(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -953,6 +1072,42 @@ class EntryFileReadTest(TestCase):
         mock_path.assert_called_once_with(self.template_path)
         mock_path.return_value.is_file.assert_called_once_with()
 
+    @patch.object(ProjectBuilder, "_file_signature")
+    @patch("app.functions.project_builder.Path")
+    @patch("app.functions.project_builder.open")
+    def test_template_cached(self, mock_open, mock_path, mock_file_signature):
+        mock_path.return_value.is_file.return_value = True
+        mock_open.return_value.read.return_value = d.TEMPLATE_CONTENTS
+        mock_file_signature.return_value = (1, 100)
+        project_builder._entry_template_cache.clear()
+
+        first = self.project_builder.entry_file_read(self.entry_type)
+        first[0]["heading"] = "changed by caller"
+        second = ProjectBuilder(self.project_id).entry_file_read(
+            self.entry_type
+        )
+
+        self.assertEqual(second, d.TEMPLATE_LIST)
+        mock_open.assert_called_once_with(self.template_path, "r")
+        project_builder._entry_template_cache.clear()
+
+    @patch.object(ProjectBuilder, "_file_signature")
+    @patch("app.functions.project_builder.Path")
+    @patch("app.functions.project_builder.open")
+    def test_template_modified(
+        self, mock_open, mock_path, mock_file_signature
+    ):
+        mock_path.return_value.is_file.return_value = True
+        mock_open.return_value.read.return_value = d.TEMPLATE_CONTENTS
+        mock_file_signature.side_effect = [(1, 100), (2, 100)]
+        project_builder._entry_template_cache.clear()
+
+        self.project_builder.entry_file_read(self.entry_type)
+        self.project_builder.entry_file_read(self.entry_type)
+
+        self.assertEqual(mock_open.call_count, 2)
+        project_builder._entry_template_cache.clear()
+
 
 class EntryReadWithFieldTypesTest(TestCase):
     @classmethod
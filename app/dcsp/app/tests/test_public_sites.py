@@ -0,0 +1,141 @@
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth.models import User
+
+import app.functions.constants as c
+from app.models import Project, ViewAccess
+from app.functions.public_sites import PublicSites
+
+
+class PublicSitesTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.documentation_pages = self.temporary_directory.name
+        self.public_sites = PublicSites(self.documentation_pages)
+        self.link_path = (
+            f"{ self.documentation_pages }/{ c.PUBLIC_SITES_FOLDER }/project_1"
+        )
+        site = Path(self.documentation_pages) / "project_1"
+        site.mkdir()
+        (site / "index.html").write_text("Index")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            self.public_sites.update("1", True)
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_update_public(self):
+        self.assertTrue(self.public_sites.update(1, True))
+
+        self.assertEqual(os.readlink(self.link_path), "../project_1")
+        self.assertEqual(
+            Path(self.link_path, "index.html").read_text(), "Index"
+        )
+        self.assertFalse(self.public_sites.update(1, True))
+
+    def test_update_not_public(self):
+        self.public_sites.update(1, True)
+
+        self.assertTrue(self.public_sites.update(1, False))
+
+        self.assertFalse(os.path.lexists(self.link_path))
+        self.assertFalse(self.public_sites.update(1, False))
+
+    def test_update_no_documentation_pages(self):
+        public_sites = PublicSites(f"{ self.documentation_pages }/none")
+
+        self.assertFalse(public_sites.update(1, True))
+
+        self.assertFalse(Path(f"{ self.documentation_pages }/none").exists())
+
+    def test_linked(self):
+        self.public_sites.update(1, True)
+        self.public_sites.update(2, True)
+        Path(self.link_path).parent.joinpath("notes.txt").write_text("")
+
+        self.assertEqual(self.public_sites.linked(), {1, 2})
+
+    @patch("app.signals.PublicSites")
+    def test_sync(self, mock_public_sites):
+        user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(
+            id=1, owner=user, name="Project 1", access=ViewAccess.PUBLIC
+        )
+        Project.objects.create(
+            id=2, owner=user, name="Project 2", access=ViewAccess.MEMBERS
+        )
+        self.public_sites.update(3, True)
+
+        self.assertEqual(self.public_sites.sync(), (1, 1))
+
+        self.assertEqual(self.public_sites.linked(), {1})
+
+
+@patch("app.signals.PublicSites")
+class PublicSitesSignalTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+
+    def test_saved(self, mock_public_sites):
+        project = Project.objects.create(
+            id=1, owner=self.user, name="Project 1", access=ViewAccess.PUBLIC
+        )
+        project.access = ViewAccess.PRIVATE
+        project.save()
+
+        mock_public_sites.return_value.update.assert_has_calls(
+            [((1, True),), ((1, False),)]
+        )
+
+    def test_made_private_while_building(self, mock_public_sites):
+        Project.objects.create(
+            id=1, owner=self.user, name="Project 1", access=ViewAccess.PUBLIC
+        )
+        building = Project.objects.get(id=1)
+        project = Project.objects.get(id=1)
+        project.access = ViewAccess.PRIVATE
+        project.save()
+        mock_public_sites.reset_mock()
+
+        building.last_built = timezone.now()
+        building.save(update_fields=["last_built", "build_output"])
+
+        self.assertEqual(Project.objects.get(id=1).access, ViewAccess.PRIVATE)
+        mock_public_sites.return_value.update.assert_not_called()
+
+    def test_deleted(self, mock_public_sites):
+        project = Project.objects.create(
+            id=1, owner=self.user, name="Project 1", access=ViewAccess.PUBLIC
+        )
+        mock_public_sites.reset_mock()
+
+        project.delete()
+
+        mock_public_sites.return_value.update.assert_called_once_with(1, False)
+
+    def test_command(self, mock_public_sites):
+        stdout = StringIO()
+
+        with patch(
+            "app.management.commands.sync_public_sites.PublicSites"
+        ) as mock_command_public_sites:
+            mock_command_public_sites.return_value.sync.return_value = (2, 1)
+            call_command("sync_public_sites", stdout=stdout)
+
+        self.assertEqual(stdout.getvalue(), "Added 2 links, removed 1 links\n")
@@ -0,0 +1,127 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+from app.models import Project
+
+
+@patch("app.management.commands.rebuild_projects.MkdocsControl")
+class RebuildProjectsCommandTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.checkpoint = f"{ self.temporary_directory.name }/checkpoint.json"
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        for project_id in range(1, 4):
+            Project.objects.create(
+                id=project_id, owner=self.user, name=f"Project { project_id }"
+            )
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def rebuild(self, *args):
+        stdout = StringIO()
+        call_command(
+            "rebuild_projects",
+            *args,
+            "--workers",
+            "1",
+            "--checkpoint",
+            self.checkpoint,
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def test_all(self, mock_mkdocs_control):
+        mock_mkdocs_control.return_value.build_succeeded = True
+
+        output = self.rebuild()
+
+        self.assertEqual(
+            [call.args for call in mock_mkdocs_control.call_args_list],
+            [(1,), (2,), (3,)],
+        )
+        mock_mkdocs_control.return_value.build_documents.assert_called_with(
+            force=True
+        )
+        self.assertIn("Built 3 of 3 projects", output)
+        self.assertFalse(Path(self.checkpoint).exists())
+
+    def test_selected(self, mock_mkdocs_control):
+        mock_mkdocs_control.return_value.build_succeeded = True
+
+        self.rebuild("2")
+
+        mock_mkdocs_control.assert_called_once_with(2)
+
+    def test_failure_and_resume(self, mock_mkdocs_control):
+        mock_mkdocs_control.side_effect = lambda project_id: (
+            mock_mkdocs_control.failing
+            if project_id == 2
+            else mock_mkdocs_control.passing
+        )
+        mock_mkdocs_control.passing.build_succeeded = True
+        mock_mkdocs_control.failing.build_documents.side_effect = (
+            FileExistsError("no folder")
+        )
+
+        with self.assertRaises(CommandError):
+            self.rebuild()
+
+        self.assertEqual(
+            json.loads(Path(self.checkpoint).read_text()),
+            {"completed": [1, 3]},
+        )
+
+        mock_mkdocs_control.reset_mock()
+        mock_mkdocs_control.failing.build_documents.side_effect = None
+        mock_mkdocs_control.failing.build_succeeded = True
+
+        output = self.rebuild("--resume")
+
+        self.assertEqual(
+            [call.args for call in mock_mkdocs_control.call_args_list],
+            [(2,)],
+        )
+        self.assertIn("Built 1 of 1 projects", output)
+        self.assertFalse(Path(self.checkpoint).exists())
+
+    def test_mkdocs_errors_reported(self, mock_mkdocs_control):
+        mock_mkdocs_control.return_value.build_succeeded = False
+        mock_mkdocs_control.return_value.build_documents.return_value = (
+            "<b>Mkdocs build errors!</b>"
+        )
+        stdout = StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "rebuild_projects",
+                "1",
+                "--checkpoint",
+                self.checkpoint,
+                stdout=stdout,
+            )
+
+        self.assertIn(
+            "Project 1: mkdocs build errors, see the project's latest "
+            "build run",
+            stdout.getvalue(),
+        )
+
+    def test_nothing_to_rebuild(self, mock_mkdocs_control):
+        Path(self.checkpoint).write_text(json.dumps({"completed": [1]}))
+
+        output = self.rebuild("1", "--resume")
+
+        self.assertEqual(output, "No projects to rebuild\n")
+        mock_mkdocs_control.assert_not_called()
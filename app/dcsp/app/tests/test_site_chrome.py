@@ -0,0 +1,83 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+import app.functions.constants as c
+from app.functions.site_chrome import SiteChrome
+
+
+class SiteChromeTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.site = Path(self.temporary_directory.name)
+        (self.site / "page").mkdir()
+        (self.site / "index.html").write_text(
+            '<html><body class="md">Index</body></html>'
+        )
+        (self.site / "page" / "index.html").write_text(
+            "<html><BODY>Page</BODY></html>"
+        )
+        (self.site / "style.css").write_text("body {}")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            SiteChrome("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_render(self):
+        chrome = SiteChrome(1).render()
+
+        self.assertTrue(chrome.startswith(c.SITE_CHROME_START))
+        self.assertTrue(chrome.endswith(c.SITE_CHROME_END))
+        self.assertIn("Published documents view", chrome)
+        self.assertIn('href="/project-documents/1"', chrome)
+
+    def test_inject(self):
+        chrome = SiteChrome(1).render()
+
+        self.assertEqual(SiteChrome(1).inject(str(self.site)), 2)
+
+        self.assertEqual(
+            (self.site / "index.html").read_text(),
+            f'<html><body class="md">{ chrome }Index</body></html>',
+        )
+        self.assertEqual(
+            (self.site / "page" / "index.html").read_text(),
+            f"<html><BODY>{ chrome }Page</BODY></html>",
+        )
+        self.assertEqual((self.site / "style.css").read_text(), "body {}")
+
+    def test_inject_repeated(self):
+        SiteChrome(1).inject(str(self.site))
+        content = (self.site / "index.html").read_text()
+
+        self.assertEqual(SiteChrome(1).inject(str(self.site)), 0)
+
+        self.assertEqual((self.site / "index.html").read_text(), content)
+
+    def test_inject_replaces_chrome(self):
+        (self.site / "index.html").write_text(
+            f"<body>{ c.SITE_CHROME_START }old{ c.SITE_CHROME_END }Index"
+        )
+
+        SiteChrome(1).inject(str(self.site))
+
+        self.assertEqual(
+            (self.site / "index.html").read_text(),
+            f"<body>{ SiteChrome(1).render() }Index",
+        )
+
+    def test_no_body(self):
+        (self.site / "index.html").write_text("<p>Fragment</p>")
+
+        self.assertEqual(SiteChrome(1).inject(str(self.site)), 1)
+
+        self.assertEqual(
+            (self.site / "index.html").read_text(), "<p>Fragment</p>"
+        )
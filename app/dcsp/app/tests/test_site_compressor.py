@@ -0,0 +1,102 @@
+import os
+import gzip
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from app.functions.site_compressor import SiteCompressor
+
+
+class SiteCompressorTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.build_state_folder = f"{ self.temporary_directory.name }/state/"
+        self.site = Path(self.temporary_directory.name) / "site"
+        (self.site / "search").mkdir(parents=True)
+        (self.site / "index.html").write_text("<p>Index</p>" * 100)
+        (self.site / "search" / "search_index.json").write_text("{}" * 200)
+        (self.site / "small.css").write_text("a {}")
+        (self.site / "image.png").write_bytes(b"\x89PNG" * 100)
+        (self.site / "download.tar.gz").write_bytes(b"archive")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def compressor(self):
+        return SiteCompressor(
+            1, build_state_folder=self.build_state_folder, use_brotli=False
+        )
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            SiteCompressor("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_compress(self):
+        self.assertEqual(self.compressor().compress(str(self.site)), 2)
+
+        self.assertEqual(
+            gzip.decompress((self.site / "index.html.gz").read_bytes()),
+            (self.site / "index.html").read_bytes(),
+        )
+        self.assertTrue(
+            (self.site / "search" / "search_index.json.gz").is_file()
+        )
+        self.assertFalse((self.site / "small.css.gz").exists())
+        self.assertFalse((self.site / "image.png.gz").exists())
+        self.assertTrue((self.site / "download.tar.gz").is_file())
+
+    def test_unchanged_skipped(self):
+        self.compressor().compress(str(self.site))
+        (self.site / "index.html").write_text("<p>Index</p>" * 100)
+
+        with patch("app.functions.site_compressor.gzip.compress") as mock:
+            self.assertEqual(self.compressor().compress(str(self.site)), 0)
+
+        mock.assert_not_called()
+
+    def test_changed_compressed(self):
+        self.compressor().compress(str(self.site))
+        (self.site / "index.html").write_text("<p>Changed</p>" * 100)
+
+        self.assertEqual(self.compressor().compress(str(self.site)), 1)
+        self.assertEqual(
+            gzip.decompress((self.site / "index.html.gz").read_bytes()),
+            (self.site / "index.html").read_bytes(),
+        )
+
+    def test_copied_from_previous(self):
+        self.compressor().compress(str(self.site))
+        new_site = Path(self.temporary_directory.name) / "new-site"
+        (new_site / "search").mkdir(parents=True)
+        (new_site / "index.html").write_text("<p>Index</p>" * 100)
+        (new_site / "search" / "search_index.json").write_text("[]" * 200)
+
+        compressed = self.compressor().compress(str(new_site), str(self.site))
+
+        self.assertEqual(compressed, 1)
+        self.assertEqual(
+            (new_site / "index.html.gz").read_bytes(),
+            (self.site / "index.html.gz").read_bytes(),
+        )
+
+    def test_orphans_removed(self):
+        self.compressor().compress(str(self.site))
+        os.remove(self.site / "index.html")
+
+        self.compressor().compress(str(self.site))
+
+        self.assertFalse((self.site / "index.html.gz").exists())
+        self.assertTrue((self.site / "download.tar.gz").is_file())
+
+    def test_brotli_not_installed(self):
+        with patch("app.functions.site_compressor.brotli", None):
+            compressor = SiteCompressor(
+                1, build_state_folder=self.build_state_folder, use_brotli=True
+            )
+
+        self.assertEqual(compressor.encodings(), [".gz"])
@@ -0,0 +1,236 @@
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from subprocess import CompletedProcess  # nosec B404
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+import app.functions.constants as c
+from app.functions.mkdocs_control import MkdocsControl
+from app.functions.site_publisher import SitePublisher
+
+
+class SitePublisherTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.documentation_pages = self.temporary_directory.name
+        self.live = Path(self.documentation_pages) / "project_1"
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def publisher(self, keep=2):
+        return SitePublisher(
+            1, documentation_pages=self.documentation_pages, keep=keep
+        )
+
+    def publish(self, publisher, content):
+        staging_path = publisher.stage()
+        (Path(staging_path) / "index.html").write_text(content)
+        publisher.publish(staging_path)
+        return os.path.basename(staging_path)
+
+    def test_project_id_not_integer(self):
+        with self.assertRaises(TypeError) as error:
+            SitePublisher("1")
+        self.assertEqual(
+            str(error.exception), "'project_id' '1' is not an integer"
+        )
+
+    def test_publish(self):
+        publisher = self.publisher()
+
+        generation = self.publish(publisher, "first")
+
+        self.assertTrue(self.live.is_symlink())
+        self.assertFalse(os.path.isabs(os.readlink(self.live)))
+        self.assertEqual((self.live / "index.html").read_text(), "first")
+        self.assertEqual(publisher.current(), generation)
+
+    def test_stage_copy_current(self):
+        publisher = self.publisher()
+        self.publish(publisher, "first")
+
+        staging_path = publisher.stage(copy_current=True)
+
+        self.assertEqual(
+            (Path(staging_path) / "index.html").read_text(), "first"
+        )
+        self.assertNotEqual(
+            os.path.basename(staging_path), publisher.current()
+        )
+
+    def test_discard(self):
+        publisher = self.publisher()
+        generation = self.publish(publisher, "first")
+        staging_path = publisher.stage()
+
+        publisher.discard(staging_path)
+
+        self.assertFalse(Path(staging_path).exists())
+        self.assertEqual(publisher.generations(), [generation])
+        self.assertEqual((self.live / "index.html").read_text(), "first")
+
+    def test_prune(self):
+        publisher = self.publisher(keep=2)
+        generations = [
+            self.publish(publisher, str(number)) for number in range(4)
+        ]
+
+        self.assertEqual(publisher.generations(), generations[1:])
+        self.assertEqual((self.live / "index.html").read_text(), "3")
+
+    def test_rollback(self):
+        publisher = self.publisher()
+        generations = [
+            self.publish(publisher, str(number)) for number in range(3)
+        ]
+
+        self.assertEqual(publisher.rollback(), generations[1])
+        self.assertEqual((self.live / "index.html").read_text(), "1")
+        self.assertEqual(publisher.rollback(generations[2]), generations[2])
+        self.assertEqual((self.live / "index.html").read_text(), "2")
+
+    def test_rollback_no_earlier(self):
+        publisher = self.publisher()
+        self.publish(publisher, "first")
+
+        with self.assertRaises(ValueError):
+            publisher.rollback()
+        with self.assertRaises(ValueError):
+            publisher.rollback("missing")
+
+    def test_legacy_folder(self):
+        self.live.mkdir()
+        (self.live / "index.html").write_text("legacy")
+        publisher = self.publisher()
+
+        self.publish(publisher, "first")
+
+        self.assertEqual(publisher.generations()[0], "0-initial")
+        publisher.rollback()
+        self.assertEqual((self.live / "index.html").read_text(), "legacy")
+
+
+@patch("app.management.commands.rollback_site.BuildLock")
+@patch("app.management.commands.rollback_site.BuildManifest")
+class RollbackSiteCommandTest(TestCase):
+    @patch("app.management.commands.rollback_site.SitePublisher")
+    def test_rollback(
+        self, mock_site_publisher, mock_build_manifest, mock_build_lock
+    ):
+        mock_site_publisher.return_value.rollback.return_value = "2"
+        stdout = StringIO()
+
+        call_command("rollback_site", "1", stdout=stdout)
+
+        mock_site_publisher.assert_called_once_with(1)
+        mock_site_publisher.return_value.rollback.assert_called_once_with(None)
+        mock_build_manifest.assert_called_once_with(1)
+        mock_build_manifest.return_value.pages_clear.assert_called_once_with()
+        mock_build_lock.assert_called_once_with(1)
+        mock_build_lock.return_value.__enter__.assert_called_once_with()
+        self.assertEqual(stdout.getvalue(), "Generation 2 is now live\n")
+
+    @patch("app.management.commands.rollback_site.SitePublisher")
+    def test_rollback_error(
+        self, mock_site_publisher, mock_build_manifest, mock_build_lock
+    ):
+        mock_site_publisher.return_value.rollback.side_effect = ValueError(
+            "There is no earlier generation"
+        )
+
+        with self.assertRaises(CommandError) as error:
+            call_command("rollback_site", "1")
+        self.assertEqual(
+            str(error.exception), "There is no earlier generation"
+        )
+        mock_build_manifest.return_value.pages_clear.assert_not_called()
+
+    @patch("app.management.commands.rollback_site.SitePublisher")
+    def test_rollback_build_running(
+        self, mock_site_publisher, mock_build_manifest, mock_build_lock
+    ):
+        mock_build_lock.return_value.__enter__.side_effect = TimeoutError(
+            "Timed out waiting for the build lock"
+        )
+
+        with self.assertRaises(CommandError) as error:
+            call_command("rollback_site", "1")
+        self.assertEqual(
+            str(error.exception), "Timed out waiting for the build lock"
+        )
+        mock_site_publisher.return_value.rollback.assert_not_called()
+        mock_build_manifest.return_value.pages_clear.assert_not_called()
+
+
+class FakeEngine:
+    def __init__(self, titles):
+        self.titles = {}
+        self.rendered = titles
+        self.calls = []
+
+    def build(self, config_file, site_dir, pages, titles, handler):
+        self.calls.append(pages)
+        self.titles = dict(self.rendered)
+        Path(site_dir, "index.html").write_text(str(len(self.calls)))
+        return CompletedProcess([], 0, "", "")
+
+
+@patch("app.functions.mkdocs_control.AssetStore")
+@patch("app.functions.mkdocs_control.SiteCompressor")
+@patch("app.functions.mkdocs_control.SiteChrome")
+class BuildPublishTest(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        documentation_pages = self.temporary_directory.name
+        self.publisher = SitePublisher(
+            1, documentation_pages=documentation_pages
+        )
+        self.publisher.publish(self.publisher.stage())
+        patcher = patch.object(c, "DOCUMENTATION_PAGES", documentation_pages)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "app.functions.mkdocs_control.SitePublisher",
+            return_value=self.publisher,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def build(self, engine, pages, titles):
+        with patch(
+            "app.functions.mkdocs_control.MkdocsEngine", return_value=engine
+        ):
+            mkdocs_control = MkdocsControl(1)
+            mkdocs_control.build(pages, titles)
+        return mkdocs_control
+
+    def test_incremental(self, *_):
+        engine = FakeEngine({"index.md": "Home"})
+
+        mkdocs_control = self.build(engine, ["index.md"], {"index.md": "Home"})
+
+        self.assertEqual(engine.calls, [["index.md"]])
+        self.assertTrue(mkdocs_control.incremental)
+        self.assertEqual(len(self.publisher.generations()), 2)
+
+    def test_title_changed(self, *_):
+        engine = FakeEngine({"index.md": "New home"})
+
+        mkdocs_control = self.build(engine, ["index.md"], {"index.md": "Home"})
+
+        self.assertEqual(engine.calls, [["index.md"], None])
+        self.assertFalse(mkdocs_control.incremental)
+        self.assertEqual(mkdocs_control.telemetry.counts["pages_written"], 1)
+        self.assertEqual(len(self.publisher.generations()), 2)
+        self.assertEqual(
+            Path(self.publisher.live_path, "index.html").read_text(), "2"
+        )
@@ -1,4 +1,5 @@
 import sys
+import tempfile
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
@@ -19,7 +20,14 @@ import app.functions.constants as c
 sys.path.append(c.FUNCTIONS_APP)
 
 import app.views as views
-from app.models import Project, UserProjectAttribute, ViewAccess
+from app.models import (
+    Project,
+    UserProjectAttribute,
+    ViewAccess,
+    BuildJob,
+    BuildStatus,
+)
+from app.functions.build_progress import BuildProgress
 import app.tests.data_views as d
 from app.functions.text_manipulation import snake_to_sentense
 
@@ -77,7 +85,18 @@ class MemberLandingPageTest(TestCase):
         self.assertTemplateUsed(response, "member_landing_page.html")
 
         request = response.wsgi_request
-        mock_user_accessible_projects.assert_called_once_with(request)
+        self.assertEqual(
+            mock_user_accessible_projects.call_args_list,
+            [
+                call(
+                    request,
+                    search="",
+                    after="",
+                    page_size=c.LANDING_PAGE_SIZE,
+                ),
+                call(request),
+            ],
+        )
         mock_std_context.assert_called_once_with()
 
     @patch("app.views.std_context")
@@ -102,7 +121,9 @@ class MemberLandingPageTest(TestCase):
         self.assertTemplateUsed(response, "member_landing_page.html")
 
         request = response.wsgi_request
-        mock_user_accessible_projects.assert_called_once_with(request)
+        mock_user_accessible_projects.assert_any_call(
+            request, search="", after="", page_size=c.LANDING_PAGE_SIZE
+        )
         mock_std_context.assert_called_once_with()
 
 
@@ -751,10 +772,10 @@ class ProjectBuildASAPTest(TestCase):
         Project.objects.create(id=1, owner=self.user, name="Test Project")
 
     @patch("app.decorators._project_access")
-    @patch("app.views.MkdocsControl")
+    @patch("app.views.BuildQueue")
     @patch("app.views.std_context")
     def test_get(
-        self, mock_std_context, mock_mkdocs_control, mock_project_access
+        self, mock_std_context, mock_build_queue, mock_project_access
     ):
         project_id = 1
         setup_step = 2
@@ -771,17 +792,18 @@ class ProjectBuildASAPTest(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "project_build_asap.html")
+        self.assertNotContains(response, "id_build_progress")
 
         request = response.wsgi_request
         mock_project_access.assert_called_once_with(request, str(project_id))
-        mock_mkdocs_control.assert_called_once_with(project_id)
+        mock_build_queue.assert_not_called()
         mock_std_context.assert_called_once_with(project_id)
 
     @patch("app.decorators._project_access")
-    @patch("app.views.MkdocsControl")
+    @patch("app.views.BuildQueue")
     @patch("app.views.std_context")
     def test_post(
-        self, mock_std_context, mock_mkdocs_control, mock_project_access
+        self, mock_std_context, mock_build_queue, mock_project_access
     ):
         project_id = 1
         setup_step = 2
@@ -792,26 +814,98 @@ class ProjectBuildASAPTest(TestCase):
             project_id,
             setup_step,
         )
-        mock_mkdocs_control.return_value.build_documents.return_value = (
-            True,
-            "All passed",
-        )
+        mock_build_queue.return_value.add.return_value.id = 7
         mock_std_context.return_value = {"test": "test"}
 
         response = self.client.post(f"/project-build-asap/{ project_id }")
 
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "project_build_asap.html")
+        self.assertEqual(response.context["build_job_id"], 7)
+        self.assertContains(response, "/project-build-progress/1/7?offset=")
 
         request = response.wsgi_request
         mock_project_access.assert_called_once_with(request, str(project_id))
-        mock_mkdocs_control.assert_called_once_with(project_id)
-        mock_mkdocs_control.return_value.build_documents.assert_called_once_with(
-            force=True
+        mock_build_queue.return_value.add.assert_called_once_with(
+            project_id, force=True
         )
         mock_std_context.assert_called_once_with(project_id)
 
 
+class ProjectBuildProgressTest(TestCase):
+    def setUp(self):
+        log_in(self)
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.project = Project.objects.create(
+            id=1, owner=self.user, name="Test Project"
+        )
+        self.build_job = BuildJob.objects.create(project=self.project)
+        self.progress = BuildProgress(
+            1,
+            self.build_job.id,
+            build_state_folder=f"{ self.temporary_directory.name }/",
+        )
+        self.progress.start()
+        self.progress.phase("preprocessor")
+        self.progress.write("Line 1\n")
+        patcher = patch("app.views.BuildProgress", return_value=self.progress)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "app.decorators._project_access",
+            return_value=(True, HttpResponse(), 1, 2),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_wrong_method(self):
+        response = self.client.post(
+            f"/project-build-progress/1/{ self.build_job.id }"
+        )
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_job_not_found(self):
+        response = self.client.get("/project-build-progress/1/999")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_running(self):
+        response = self.client.get(
+            f"/project-build-progress/1/{ self.build_job.id }"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "status": "queued",
+                "finished": False,
+                "events": [{"phase": "preprocessor"}, {"line": "Line 1"}],
+                "offset": response.json()["offset"],
+                "output": "",
+            },
+        )
+
+    def test_finished_from_offset(self):
+        offset = self.progress.read()[1]
+        self.progress.write("Line 2\n")
+        self.build_job.status = BuildStatus.COMPLETE
+        self.build_job.output = "<b>Done</b>"
+        self.build_job.save()
+
+        response = self.client.get(
+            f"/project-build-progress/1/{ self.build_job.id }?offset={ offset }"
+        )
+
+        self.assertEqual(response.json()["events"], [{"line": "Line 2"}])
+        self.assertTrue(response.json()["finished"])
+        self.assertEqual(response.json()["output"], "<b>Done</b>")
+
+
 class ProjectDocumentsTest(TestCase):
     def setUp(self):
         log_in(self)
@@ -900,6 +994,28 @@ class ViewDocsTest(TestCase):
 
         mock_std_context.assert_called_once_with()
 
+    @patch("app.views.std_context")
+    def test_path_traversal(self, mock_std_context):
+        self.user = User.objects.create_user(
+            id=1, username="u", password="p"
+        )  # nosec B106
+        Project.objects.create(
+            id=1,
+            owner=self.user,
+            name="Test Project",
+            access=ViewAccess.PUBLIC,
+        )
+        mock_std_context.return_value = {"test": "test"}
+
+        response = self.client.get("/view-docs/1/../project_2/index.html")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("X-Accel-Redirect", response)
+        messages = list(get_messages(response.wsgi_request))
+        self.assertEqual(
+            str(messages[0]), "File '../project_2/index.html' does not exist."
+        )
+
     @patch("app.views.std_context")
     def test_members_user_not_authenticated(self, mock_std_context):
         project_id = 1
@@ -964,11 +1080,41 @@ class ViewDocsTest(TestCase):
         )
         mock_std_context.assert_called_once_with()
 
+    @patch("app.views.Path.is_file")
+    @patch("app.views.Path.stat")
+    def test_private_owner(self, mock_stat, mock_is_file):
+        self.user = User.objects.create_user(
+            id=1, username="user1", password="password1"
+        )  # nosec B106
+        Project.objects.create(
+            id=1,
+            owner=self.user,
+            name="Test Project",
+            access=ViewAccess.PRIVATE,
+        )
+        self.client.force_login(self.user)
+        mock_is_file.return_value = True
+        mock_stat.return_value = Mock(st_mtime=1700000000.5, st_size=4096)
+
+        response = self.client.get("/view-docs/1/test_image.jpeg")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/documentation-pages/project_1/test_image.jpeg",
+        )
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    @patch("app.views.BuildQueue")
     @patch("app.views.MkdocsControl")
     @patch("app.views.Path.is_file")
     @patch("app.views.std_context")
     def test_public_file_nonexistent(
-        self, mock_std_context, mock_is_file, mock_mkdocs_control
+        self,
+        mock_std_context,
+        mock_is_file,
+        mock_mkdocs_control,
+        mock_build_queue,
     ):
         project_id = 1
         test_page = "test-page.html"
@@ -981,9 +1127,10 @@ class ViewDocsTest(TestCase):
             owner=self.user,
             name="Test Project",
             access=ViewAccess.PUBLIC,
+            last_built=timezone.now(),
         )
 
-        mock_mkdocs_control.return_value.build_documents.return_value = Mock()
+        mock_mkdocs_control.return_value.build_required.return_value = False
 
         mock_is_file.return_value = False
 
@@ -1002,16 +1149,67 @@ class ViewDocsTest(TestCase):
             f"File '{ test_page }' does not exist.",
         )
         mock_mkdocs_control.assert_called_once_with(str(project_id))
-        mock_mkdocs_control.return_value.build_documents.assert_called_once_with()
+        mock_mkdocs_control.return_value.build_required.assert_called_once_with()
+        mock_build_queue.assert_not_called()
         mock_is_file.assert_called_once_with()
         mock_std_context.assert_called_once_with()
 
+    @patch("app.views.BuildQueue")
     @patch("app.views.MkdocsControl")
     @patch("app.views.Path.is_file")
-    @patch("app.views.open")
     @patch("app.views.std_context")
+    def test_public_never_built(
+        self,
+        mock_std_context,
+        mock_is_file,
+        mock_mkdocs_control,
+        mock_build_queue,
+    ):
+        project_id = 1
+        test_page = "test-page.html"
+
+        self.user = User.objects.create_user(
+            id=1, username="user", password="password"
+        )  # nosec B106
+        Project.objects.create(
+            id=project_id,
+            owner=self.user,
+            name="Test Project",
+            access=ViewAccess.PUBLIC,
+        )
+
+        mock_mkdocs_control.return_value.build_required.return_value = True
+
+        mock_is_file.return_value = False
+
+        mock_std_context.return_value = {"test": "test"}
+
+        response = self.client.get(f"/view-docs/{ project_id }/{ test_page }")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertTemplateUsed(response, "error_handler.html")
+
+        request = response.wsgi_request
+        messages = list(get_messages(request))
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(
+            str(messages[0]),
+            f"The documents for 'project { project_id }' are being built. "
+            "Please try again shortly.",
+        )
+        mock_build_queue.return_value.add.assert_called_once_with(project_id)
+        mock_std_context.assert_called_once_with()
+
+    @patch("app.views.BuildQueue")
+    @patch("app.views.MkdocsControl")
+    @patch("app.views.Path.is_file")
+    @patch("app.views.Path.stat")
     def test_public_html_file(
-        self, mock_std_context, mock_open, mock_is_file, mock_mkdocs_control
+        self,
+        mock_stat,
+        mock_is_file,
+        mock_mkdocs_control,
+        mock_build_queue,
     ):
         project_id = 1
         test_page = "test_page.html"
@@ -1025,35 +1223,29 @@ class ViewDocsTest(TestCase):
             access=ViewAccess.PUBLIC,
         )
 
-        mock_mkdocs_control.return_value.build_documents.return_value = Mock()
+        mock_mkdocs_control.return_value.build_required.return_value = True
 
         mock_is_file.return_value = True
-
-        mock_open.return_value.read.return_value = "Some test html"
-
-        mock_std_context.return_value = {"test": "test"}
+        mock_stat.return_value = Mock(st_mtime=1700000000.5, st_size=4096)
 
         response = self.client.get(f"/view-docs/{ project_id }/{ test_page }")
 
         self.assertEqual(response.status_code, 200)
-        self.assertTemplateUsed(response, "document_serve.html")
+        self.assertEqual(response["Content-Type"], "text/html")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/documentation-pages/project_1/test_page.html",
+        )
+        self.assertEqual(response.content, b"")
 
         mock_mkdocs_control.assert_called_once_with(str(project_id))
-        mock_mkdocs_control.return_value.build_documents.assert_called_once_with()
+        mock_mkdocs_control.return_value.build_required.assert_called_once_with()
+        mock_build_queue.return_value.add.assert_called_once_with(project_id)
         mock_is_file.assert_called_once_with()
-        mock_open.assert_called_once_with(
-            str(
-                Path(c.DOCUMENTATION_PAGES)
-                / f"project_{ project_id }"
-                / test_page
-            ),
-            "r",
-        )
-        mock_open.return_value.read.assert_called_once_with()
-        mock_std_context.assert_called_once_with(project_id)
 
     @patch("app.views.Path.is_file")
-    def test_public_non_html_file(self, mock_is_file):
+    @patch("app.views.Path.stat")
+    def test_public_non_html_file(self, mock_stat, mock_is_file):
         project_id = 1
         test_image = "test_image.jpeg"
         self.user = User.objects.create_user(
@@ -1067,6 +1259,7 @@ class ViewDocsTest(TestCase):
         )
 
         mock_is_file.return_value = True
+        mock_stat.return_value = Mock(st_mtime=1700000000.5, st_size=4096)
 
         response = self.client.get(f"/view-docs/{ project_id }/{ test_image }")
 
@@ -1076,10 +1269,206 @@ class ViewDocsTest(TestCase):
             response["X-Accel-Redirect"],
             "/documentation-pages/project_1/test_image.jpeg",
         )
+        self.assertEqual(response["ETag"], '"6553f100-1000"')
+        self.assertEqual(
+            response["Last-Modified"], "Tue, 14 Nov 2023 22:13:20 GMT"
+        )
+        self.assertEqual(response["Cache-Control"], "public, no-cache")
 
         mock_is_file.assert_called_once_with()
 
 
+class ViewDocsConditionalTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="user", password="password"
+        )  # nosec B106
+        self.project = Project.objects.create(
+            id=1,
+            owner=self.user,
+            name="Test Project",
+            access=ViewAccess.PUBLIC,
+        )
+        for target, return_value in (
+            ("app.views.Path.is_file", True),
+            (
+                "app.views.Path.stat",
+                Mock(st_mtime=1700000000.5, st_size=4096),
+            ),
+        ):
+            patcher = patch(target, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_if_none_match(self):
+        response = self.client.get(
+            "/view-docs/1/test_image.jpeg",
+            HTTP_IF_NONE_MATCH='"6553f100-1000"',
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.has_header("X-Accel-Redirect"))
+        self.assertEqual(response["ETag"], '"6553f100-1000"')
+
+    def test_if_none_match_changed(self):
+        response = self.client.get(
+            "/view-docs/1/test_image.jpeg",
+            HTTP_IF_NONE_MATCH='"6553f100-0fff"',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("X-Accel-Redirect"))
+
+    def test_if_modified_since(self):
+        response = self.client.get(
+            "/view-docs/1/test_image.jpeg",
+            HTTP_IF_MODIFIED_SINCE="Tue, 14 Nov 2023 22:13:20 GMT",
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since_earlier(self):
+        response = self.client.get(
+            "/view-docs/1/test_image.jpeg",
+            HTTP_IF_MODIFIED_SINCE="Tue, 14 Nov 2023 22:13:19 GMT",
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_members_not_shared(self):
+        self.project.access = ViewAccess.MEMBERS
+        self.project.save()
+        self.client.force_login(self.user)
+
+        response = self.client.get("/view-docs/1/test_image.jpeg")
+
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_no_access_not_revalidated(self):
+        self.project.access = ViewAccess.MEMBERS
+        self.project.save()
+
+        with patch("app.views.std_context", return_value={}):
+            response = self.client.get(
+                "/view-docs/1/test_image.jpeg",
+                HTTP_IF_NONE_MATCH='"6553f100-1000"',
+            )
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ViewDocsAccessTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            id=1, username="owner", password="password"
+        )  # nosec B106
+        self.user = User.objects.create_user(
+            id=2, username="user", password="password"
+        )  # nosec B106
+        self.project = Project.objects.create(
+            id=1,
+            owner=self.owner,
+            name="Test Project",
+            access=ViewAccess.PRIVATE,
+        )
+
+    def get(self, project_id="1"):
+        return self.client.get("/docs-access", HTTP_X_PROJECT_ID=project_id)
+
+    def test_no_project_id(self):
+        response = self.client.get("/docs-access")
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_project_id_not_digit(self):
+        self.assertEqual(self.get("1/../2").status_code, 401)
+
+    def test_project_id_not_digit_authenticated(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.get("1/../2").status_code, 403)
+
+    def test_project_nonexistent(self):
+        self.assertEqual(self.get("2").status_code, 401)
+
+    def test_project_nonexistent_authenticated(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.get("2").status_code, 403)
+
+    def test_original_uri_ignored(self):
+        # nginx resolves '/view-docs/2/../1/index.html' to project 1, so the
+        # public project 2 in the path as sent must not be checked
+        Project.objects.create(
+            id=2, owner=self.owner, name="Public", access=ViewAccess.PUBLIC
+        )
+
+        response = self.client.get(
+            "/docs-access",
+            HTTP_X_ORIGINAL_URI="/view-docs/2/../1/index.html",
+            HTTP_X_PROJECT_ID="1",
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_public(self):
+        self.project.access = ViewAccess.PUBLIC
+        self.project.save()
+
+        self.assertEqual(self.get().status_code, 204)
+
+    def test_members_not_authenticated(self):
+        self.project.access = ViewAccess.MEMBERS
+        self.project.save()
+
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_members(self):
+        self.project.access = ViewAccess.MEMBERS
+        self.project.save()
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.get().status_code, 204)
+
+    def test_private_no_access(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.get().status_code, 403)
+
+    def test_private_owner(self):
+        self.client.force_login(self.owner)
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b"")
+
+    def test_private_member(self):
+        self.project.member.add(self.user)
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.get().status_code, 204)
+
+    def test_member_removed(self):
+        self.project.member.add(self.user)
+        self.client.force_login(self.user)
+        self.assertEqual(self.get().status_code, 204)
+
+        self.project.member.remove(self.user)
+
+        self.assertEqual(self.get().status_code, 403)
+
+    def test_made_private(self):
+        self.project.access = ViewAccess.PUBLIC
+        self.project.save()
+        self.assertEqual(self.get().status_code, 204)
+
+        self.project.access = ViewAccess.PRIVATE
+        self.project.save()
+
+        self.assertEqual(self.get().status_code, 401)
+
+
 class DocumentNewTest(TestCase):
     def setUp(self):
         log_in(self)
@@ -2200,16 +2589,18 @@ class StdContextTest(TestCase):
         project_id = 1
         entry_templates = ["template1", "template2"]
 
-        mock_project_builder.return_value.entry_template_names.return_value = (
-            entry_templates
-        )
+        mock_project_builder.return_value.metadata_get.return_value = {
+            "entry_templates": entry_templates,
+            "setup_step": 2,
+        }
 
         result = views.std_context(project_id)
 
         self.assertEqual(result["entry_templates"], entry_templates)
+        self.assertEqual(result["project_setup_step"], 2)
 
         mock_project_builder.assert_called_once_with(project_id)
-        mock_project_builder.return_value.entry_template_names.assert_called_once_with()
+        mock_project_builder.return_value.metadata_get.assert_called_once_with()
 
     @patch("app.views.ProjectBuilder")
     def test_std_context_with_project_id_0(self, mock_project_builder):
@@ -2307,9 +2698,8 @@ class UserAccessibleProjectsTest(TestCase):
         self.assertEqual(len(documents), 1)
         self.assertEqual(documents[0]["doc_id"], project_id_1)
         self.assertEqual(documents[0]["project_name"], project_name_1)
-        current_datetime = datetime.now()
-        difference = current_datetime - documents[0]["doc_last_accessed"]
-        self.assertLess(difference, timedelta(minutes=5))
+        # Only the user's own last access is shown
+        self.assertIsNone(documents[0]["doc_last_accessed"])
 
     def test_member(self):
         project_id_1 = 1
@@ -2344,7 +2734,7 @@ class UserAccessibleProjectsTest(TestCase):
         self.assertEqual(len(documents), 1)
         self.assertEqual(documents[0]["doc_id"], project_id_1)
         self.assertEqual(documents[0]["project_name"], project_name_1)
-        current_datetime = datetime.now()
+        current_datetime = timezone.now()
         difference = current_datetime - documents[0]["doc_last_accessed"]
         self.assertLess(difference, timedelta(minutes=5))
 
@@ -2383,11 +2773,125 @@ class UserAccessibleProjectsTest(TestCase):
         self.assertEqual(len(documents), 1)
         self.assertEqual(documents[0]["doc_id"], project_id_1)
         self.assertEqual(documents[0]["project_name"], project_name_1)
-        current_datetime = datetime.now()
+        current_datetime = timezone.now()
         difference = current_datetime - documents[0]["doc_last_accessed"]
         self.assertLess(difference, timedelta(minutes=5))
 
 
+class UserAccessibleProjectsPageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            id=1, username="user", password="password"
+        )  # nosec B106
+        self.request = HttpRequest()
+        self.request.user = self.user
+        now = timezone.now()
+        for project_id, name, accessed in (
+            (1, "Alpha", None),
+            (2, "Beta", now - timedelta(days=2)),
+            (3, "Gamma", now - timedelta(days=1)),
+            (4, "Alpine", None),
+            (5, "Delta", now - timedelta(days=1)),
+        ):
+            project = Project.objects.create(
+                id=project_id, owner=self.user, name=name
+            )
+            if accessed is not None:
+                UserProjectAttribute.objects.create(
+                    user=self.user, project=project
+                )
+                UserProjectAttribute.objects.filter(project=project).update(
+                    last_accessed=accessed
+                )
+
+    def ids(self, documents):
+        return [document["doc_id"] for document in documents]
+
+    def test_order(self):
+        documents = views.user_accessible_projects(self.request)
+
+        self.assertEqual(self.ids(documents), [5, 3, 2, 4, 1])
+
+    def test_pages(self):
+        pages = []
+        after = ""
+        while True:
+            documents = views.user_accessible_projects(
+                self.request, after=after, page_size=2
+            )
+            if not documents:
+                break
+            pages.append(self.ids(documents))
+            after = views.projects_cursor(documents[-1])
+
+        self.assertEqual(pages, [[5, 3], [2, 4], [1]])
+
+    def test_invalid_cursor(self):
+        documents = views.user_accessible_projects(
+            self.request, after="yesterday|x", page_size=2
+        )
+
+        self.assertEqual(self.ids(documents), [5, 3])
+
+    def test_search(self):
+        documents = views.user_accessible_projects(self.request, search="al")
+
+        self.assertEqual(self.ids(documents), [4, 1])
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            views.user_accessible_projects(self.request, page_size=2)
+
+    def test_landing_page(self):
+        self.client.force_login(self.user)
+
+        with patch.object(c, "LANDING_PAGE_SIZE", 2):
+            response = self.client.get("/member")
+            next_cursor = response.context["next_cursor"]
+            next_response = self.client.get("/member", {"after": next_cursor})
+
+        self.assertEqual(
+            self.ids(response.context["available_projects"]), [5, 3]
+        )
+        self.assertContains(response, 'id="id_next_page"')
+        self.assertEqual(
+            self.ids(next_response.context["available_projects"]), [2, 4]
+        )
+        self.assertEqual(
+            self.ids(next_response.context["side_bar_projects"]),
+            [5, 3, 2, 4, 1],
+        )
+
+    def test_landing_page_past_never_accessed(self):
+        self.client.force_login(self.user)
+        pages = []
+        after = ""
+
+        with patch.object(c, "LANDING_PAGE_SIZE", 2):
+            while True:
+                response = self.client.get("/member", {"after": after})
+                pages.append(self.ids(response.context["available_projects"]))
+                after = response.context["next_cursor"]
+                if not after:
+                    break
+
+        self.assertEqual(pages, [[5, 3], [2, 4], [1]])
+        # Never accessed projects are shown in the main column too
+        self.assertContains(response, "Other documents")
+        self.assertContains(response, "/project-documents/1", count=2)
+
+    def test_landing_page_search(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get("/member", {"search": "Alp"})
+
+        self.assertEqual(
+            self.ids(response.context["available_projects"]), [4, 1]
+        )
+        self.assertEqual(response.context["next_cursor"], "")
+        self.assertContains(response, "Projects matching")
+
+
 class StartNewProjectStep2InputGUITestCase(TestCase):
     def setUp(self):
         self.group1 = ProjectGroup.objects.create(id=1, name="Group 1")
@@ -19,6 +19,11 @@ urlpatterns = [
         views.project_build_asap,
         name="project_build_asap",
     ),
+    path(
+        "project-build-progress/<project_id>/<job_id>",
+        views.project_build_progress,
+        name="project_build_progress",
+    ),
     path(
         "document-new/<project_id>",
         views.document_new,
@@ -59,6 +64,11 @@ urlpatterns = [
         views.view_docs,
         name="view_docs",
     ),
+    path(
+        "docs-access",
+        views.view_docs_access,
+        name="view_docs_access",
+    ),
     path(
         "project-documents/<project_id>",
         views.project_documents,
@@ -9,8 +9,13 @@ Functions:
     start_new_project: start a new project, import from git or from clean slate.
     setup_documents: build up the documents for the static site.
     project_build_asap: build the static site ad hoc
+    project_build_progress: progress of a queued build, as json
     project_documents: main page for document editing.
-    view_docs: provides static site via NGINX X-Accel-Redirect
+    view_docs: provides static site via NGINX X-Accel-Redirect, queuing a
+               rebuild if the static site is out of date.
+    view_docs_access: access check for NGINX auth_request, for static sites.
+    docs_access: decides if the reader may see a project's static site.
+    docs_access_unknown: refuses access to a project that does not exist.
     document_new: create a new document.
     document_update: edit of main documents.
     entry_update: create a new entry or update a preexisting one.
@@ -19,6 +24,8 @@ Functions:
                                    repository.
     std_context: provides a standard collection of values for views.
     user_accessible_projects: provides a list of projects a user has access to.
+    projects_cursor: cursor for the page of projects after a project.
+    projects_cursor_parse: reads a cursor made by projects_cursor.
     placeholders: gets placeholders (used in document_update to convert
                   placeholders to their values).
     build_documents: builds the static webpages via mkdocs.
@@ -28,6 +35,7 @@ Functions:
     custom_500: custom 500 (internal server error) page.
 """
 
+import os
 from fnmatch import fnmatch
 from typing import Any, TextIO, Optional, Dict
 from datetime import datetime
@@ -37,28 +45,42 @@ from functools import wraps
 from pathlib import Path
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse, HttpRequest
+from django.http import HttpResponse, HttpRequest, JsonResponse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
 from django.db.models.query import QuerySet
-from django.db.models import F
+from django.db.models import F, Q, Exists, OuterRef, Subquery
 from django.db.models import QuerySet
 from django.contrib.auth.models import User
 from django.forms.models import model_to_dict
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
-from app.decorators import project_access
+from app.decorators import project_access, request_project
 
 # TODO - may not work in production
 from django.contrib.staticfiles.views import serve
 
-from .models import Project, ProjectGroup, ViewAccess, project_timestamp
+from .models import (
+    Project,
+    ProjectGroup,
+    ViewAccess,
+    BuildJob,
+    BuildStatus,
+    ProjectAccess,
+    UserProjectAttribute,
+    project_timestamp,
+)
 
 import app.functions.constants as c
 from app.functions.project_builder import ProjectBuilder
 
 
 from app.functions.mkdocs_control import MkdocsControl
+from app.functions.build_queue import BuildQueue
+from app.functions.build_progress import BuildProgress
+from app.functions.access_control import can_access
 from app.functions.custom_exceptions import RepositoryAccessException
 from app.functions.text_manipulation import (
     snake_to_sentense,
@@ -108,7 +130,8 @@ def member_landing_page(request: HttpRequest) -> HttpResponse:
     """Landing page for members
 
     If no documents related to user, will help user set this up. If user has
-    access to documents, these will be displayed here.
+    access to documents, these will be displayed here, a page at a time and
+    optionally filtered by name. The side bar lists all of them.
 
     Args:
         request (HttpRequest): request from user
@@ -117,22 +140,45 @@ def member_landing_page(request: HttpRequest) -> HttpResponse:
         HttpResponse: for loading the correct webpage
     """
     projects: list[dict[str, Any]] = []
+    side_bar_projects: list[dict[str, Any]] = []
     viewed_documents: bool = False
+    other_documents: bool = False
+    search: str = ""
+    next_cursor: str = ""
     context: dict[str, Any] = {}
 
     if request.method != "GET":
         return custom_405(request)
 
-    projects = user_accessible_projects(request)
+    search = request.GET.get("search", "").strip()
+    projects = user_accessible_projects(
+        request,
+        search=search,
+        after=request.GET.get("after", ""),
+        page_size=c.LANDING_PAGE_SIZE,
+    )
+
+    # A full page may be followed by more
+    if len(projects) == c.LANDING_PAGE_SIZE:
+        next_cursor = projects_cursor(projects[-1])
+
+    side_bar_projects = user_accessible_projects(request)
 
     viewed_documents = any(
         record.get("doc_last_accessed") is not None for record in projects
     )
+    other_documents = any(
+        record.get("doc_last_accessed") is None for record in projects
+    )
 
     context = {
         "page_title": "Safety documents",
         "available_projects": projects,
+        "side_bar_projects": side_bar_projects,
         "viewed_documents": viewed_documents,
+        "other_documents": other_documents,
+        "search": search,
+        "next_cursor": next_cursor,
     }
 
     return render(request, "member_landing_page.html", context | std_context())
@@ -423,7 +469,7 @@ def setup_documents(  # type: ignore[return]
                 "page_title": "Edit placeholders",
                 "form": PlaceholdersForm(project_id),
                 "project_id": project_id,
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "project_side_bars": True,
             }
 
@@ -445,7 +491,7 @@ def setup_documents(  # type: ignore[return]
                 context = {
                     "page_title": "Documents published",
                     "project_id": project_id,
-                    "project_name": Project.objects.get(id=project_id).name,
+                    "project_name": request_project(request, project_id).name,
                     "project_side_bars": True,
                 }
 
@@ -459,7 +505,7 @@ def setup_documents(  # type: ignore[return]
                     "page_title": "Edit placeholders",
                     "form": form,
                     "project_id": project_id,
-                    "project_name": Project.objects.get(id=project_id).name,
+                    "project_name": request_project(request, project_id).name,
                     "project_side_bars": True,
                 }
 
@@ -481,7 +527,9 @@ def project_build_asap(  # type: ignore[return]
 
     This function allows the user to build the static site ad hoc. This is
     useful if the user has made changes to the documents and wants to see the
-    changes immediately.
+    changes immediately. The build is queued for the build worker, and the
+    page follows its progress (see project_build_progress), so the request
+    does not wait for the build.
 
     Args:
         request (HttpRequest): request from user
@@ -491,14 +539,13 @@ def project_build_asap(  # type: ignore[return]
         HttpResponse: for loading the webpage
     """
     context: dict[str, Any] = {}
-    build_output: str = ""
-    mkdocs_control: MkdocsControl = MkdocsControl(project_id)
+    build_job: BuildJob
 
     if request.method == "GET":
         context = {
             "page_title": "Build documents",
             "project_id": project_id,
-            "project_name": Project.objects.get(id=project_id).name,
+            "project_name": request_project(request, project_id).name,
             "project_side_bars": True,
         }
 
@@ -508,13 +555,14 @@ def project_build_asap(  # type: ignore[return]
             context | std_context(project_id),
         )
     elif request.method == "POST":
-        build_output = mkdocs_control.build_documents(force=True)
+        build_job = BuildQueue().add(project_id, force=True)
 
         context = {
             "page_title": "Build documents",
             "project_id": project_id,
-            "build_output": build_output,
-            "project_name": Project.objects.get(id=project_id).name,
+            "build_job_id": build_job.id,
+            "build_progress_poll_ms": c.BUILD_PROGRESS_POLL_MS,
+            "project_name": request_project(request, project_id).name,
             "project_side_bars": True,
         }
 
@@ -525,6 +573,63 @@ def project_build_asap(  # type: ignore[return]
         )
 
 
+@project_access
+def project_build_progress(
+    request: HttpRequest,
+    project_id: int,
+    _: int,
+    job_id: str,
+) -> HttpResponse:
+    """Progress of a queued build
+
+    Returns the build output and phase markers written since the offset given
+    in the query string, as json. The page polls this until the build has
+    finished, when the final build output is included.
+
+    Args:
+        request (HttpRequest): request from user
+        project_id (int): primary key of project
+        job_id (str): primary key of the build job
+
+    Returns:
+        HttpResponse: json with status, finished, events, offset and output.
+    """
+    offset_string: str = request.GET.get("offset", "0")
+    build_job: Optional[BuildJob] = None
+    finished: bool = False
+    events: list[dict[str, Any]] = []
+    offset: int = 0
+
+    if request.method != "GET":
+        return custom_405(request)
+
+    if not job_id.isdigit():
+        return custom_404(request)
+
+    build_job = BuildJob.objects.filter(
+        id=int(job_id), project_id=project_id
+    ).first()
+
+    if build_job is None:
+        return custom_404(request)
+
+    # The job is read first, so a finished job's progress is complete
+    finished = build_job.status in (BuildStatus.COMPLETE, BuildStatus.FAILED)
+    events, offset = BuildProgress(project_id, build_job.id).read(
+        int(offset_string) if offset_string.isdigit() else 0
+    )
+
+    return JsonResponse(
+        {
+            "status": build_job.get_status_display(),
+            "finished": finished,
+            "events": events,
+            "offset": offset,
+            "output": build_job.output if finished else "",
+        }
+    )
+
+
 @project_access
 def project_documents(
     request: HttpRequest,
@@ -551,7 +656,7 @@ def project_documents(
     if request.method != "GET":
         return custom_405(request)
 
-    project = Project.objects.get(id=project_id)
+    project = request_project(request, project_id)
     members = project.member.all()
     groups = ProjectGroup.objects.filter(project_access=project)
 
@@ -583,7 +688,8 @@ def view_docs(
     X-Accel-Redirect. Depending on if the project's documents have private,
     member or public access, the user will be able to view the documents.
     Hence, access to the static pages are also dependent on if the user is
-    authenticated.
+    authenticated. Responses carry an ETag and Last-Modified, and a
+    conditional request for an unchanged file gets a 304 Not Modified.
 
     Args:
         request (HttpRequest): request from user
@@ -594,16 +700,16 @@ def view_docs(
         HttpResponse: for loading the correct webpage
     """
     project_id_int: int
-    accessible_projects: list[dict[str, str]] = []
+    access_status: int = 0
     internal_path: str = ""
     mkdocs_control: Optional[MkdocsControl] = None
-    file: Optional[TextIO] = None
-    document_content = ""
-    context: dict[str, Any] = {}
     content_type: str = "invalid"
     file_extension: str = ""
     key: str = ""
     value: str = ""
+    file_stat: os.stat_result
+    etag: str = ""
+    last_modified: int = 0
     response: Optional[HttpResponse] = None
 
     if project_id.isdigit():
@@ -611,30 +717,32 @@ def view_docs(
     else:
         return custom_404(request)
 
-    if not Project.objects.filter(id=project_id_int).exists():
+    project = Project.objects.filter(id=project_id_int).first()
+
+    if project is None:
         messages.error(request, f"'Project { project_id }' does not exist")
         return custom_404(request)
 
-    project = Project.objects.get(id=project_id)
+    access_status = docs_access(request, project)
 
-    if project.access == ViewAccess.MEMBERS:
-        if not request.user.is_authenticated:
-            messages.error(
-                request,
-                f"You do not have access to 'project { project_id }'. "
-                "This is a members only project.",
-            )
-            return custom_403(request)
+    if access_status == 401 and project.access == ViewAccess.MEMBERS:
+        messages.error(
+            request,
+            f"You do not have access to 'project { project_id }'. "
+            "This is a members only project.",
+        )
+        return custom_403(request)
 
-    elif project.access == ViewAccess.PRIVATE:
-        accessible_projects = user_accessible_projects(request)
-        if not any(
-            doc for doc in accessible_projects if doc["doc_id"] == project_id
-        ):
-            messages.error(
-                request, f"You do not have access to 'project { project_id }'."
-            )
-            return custom_403(request)
+    elif access_status != 204:
+        messages.error(
+            request, f"You do not have access to 'project { project_id }'."
+        )
+        return custom_403(request)
+
+    # The path is as sent by the client, so could lead to another project
+    if ".." in Path(doc_path).parts:
+        messages.error(request, f"File '{ doc_path }' does not exist.")
+        return custom_404(request)
 
     internal_path = str(
         Path(c.DOCUMENTATION_PAGES) / f"project_{project_id}" / doc_path
@@ -642,35 +750,123 @@ def view_docs(
 
     file_extension = Path(internal_path).suffix[1:]
 
+    # Stale pages are served as is, with a rebuild queued for the build worker
     if file_extension == "html":
         mkdocs_control = MkdocsControl(project_id)
-        mkdocs_control.build_documents()
+        if mkdocs_control.build_required():
+            BuildQueue().add(project_id_int)
 
     if not Path(internal_path).is_file():
-        messages.error(request, f"File '{ doc_path }' does not exist.")
+        if project.last_built is None:
+            messages.error(
+                request,
+                f"The documents for 'project { project_id }' are being "
+                "built. Please try again shortly.",
+            )
+        else:
+            messages.error(request, f"File '{ doc_path }' does not exist.")
         return custom_404(request)
 
-    if file_extension == "html":
-        file = open(internal_path, "r")
-        document_content = file.read()
-        context = {
-            "document_content": document_content,
-            "project_id": project_id,
-        }
-        return render(
-            request,
-            "document_serve.html",
-            context | std_context(project_id_int),
-        )
-    else:
+    # The same validators as nginx gives the file, so a revalidation is
+    # answered here, without the file being sent, whichever set them
+    file_stat = Path(internal_path).stat()
+    etag = f'"{ int(file_stat.st_mtime):x}-{ file_stat.st_size:x}"'
+    last_modified = int(file_stat.st_mtime)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+    if response is None:
         for key, value in c.MIME_TYPES.items():
             if file_extension == key:
                 content_type = value
                 break
 
+        # Pages already include the platform bar (see SiteChrome), so nginx
+        # serves every file as stored
         response = HttpResponse(content_type=content_type)
         response["X-Accel-Redirect"] = internal_path
-        return response
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+
+    # Always revalidated, as access and content can change at any time
+    if project.access == ViewAccess.PUBLIC:
+        patch_cache_control(response, public=True, no_cache=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+def view_docs_access(request: HttpRequest) -> HttpResponse:
+    """Access check for nginx, for members only and private static sites
+
+    nginx asks this view, in an auth_request subrequest, if the reader may
+    see a file of a project's static site, then serves the file itself. The
+    project is in the X-Project-Id header, as matched by nginx from the
+    normalised path it serves the file from. The path as sent by the client
+    must not be used, as eg '/view-docs/1/../2/index.html' would be checked
+    against project 1 but served from project 2.
+
+    Args:
+        request (HttpRequest): subrequest from nginx
+
+    Returns:
+        HttpResponse: with no content, and status 204 if the reader has
+                      access, 401 if they need to log in, or 403 if they do
+                      not have access. There is no 404 for an unknown project,
+                      as nginx can only pass 401 and 403 on from an
+                      auth_request (anything else is a 500), so it is a 401
+                      or 403 as for a project the reader cannot see.
+    """
+    project_id: str = request.headers.get("X-Project-Id", "")
+    project: Optional[Project] = None
+
+    if not project_id.isdigit():
+        return HttpResponse(status=docs_access_unknown(request))
+
+    project = Project.objects.filter(id=int(project_id)).first()
+    if project is None:
+        return HttpResponse(status=docs_access_unknown(request))
+
+    return HttpResponse(status=docs_access(request, project))
+
+
+def docs_access(request: HttpRequest, project: Project) -> int:
+    """Decides if the reader may see a project's static site
+
+    Args:
+        request (HttpRequest): request from user
+        project (Project): the project
+
+    Returns:
+        int: 204 if the reader has access, 401 if they need to log in, or 403
+             if they do not have access.
+    """
+    if project.access == ViewAccess.PUBLIC:
+        return 204
+
+    if not request.user.is_authenticated:
+        return 401
+
+    if project.access == ViewAccess.MEMBERS:
+        return 204
+
+    return 204 if can_access(request.user, project) else 403
+
+
+def docs_access_unknown(request: HttpRequest) -> int:
+    """Refuses a reader access to a project that does not exist
+
+    Args:
+        request (HttpRequest): request from user
+
+    Returns:
+        int: 401 if the reader needs to log in, otherwise 403.
+    """
+    return 403 if request.user.is_authenticated else 401
 
 
 @project_access
@@ -703,7 +899,7 @@ def document_new(  # type: ignore[return]
     if request.method == "GET":
         context = {
             "page_title": "Create a new safety document",
-            "project_name": Project.objects.get(id=project_id).name,
+            "project_name": request_project(request, project_id).name,
             "form": DocumentNewForm(project_id),
             "project_id": project_id,
         }
@@ -729,7 +925,7 @@ def document_new(  # type: ignore[return]
 
             context = {
                 "page_title": "New document created",
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "submitted": True,
                 "project_id": project_id,
                 "document_name_new": document_name_new,
@@ -742,7 +938,7 @@ def document_new(  # type: ignore[return]
         else:
             context = {
                 "page_title": "Create a new safety document",
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "form": form,
                 "project_id": project_id,
             }
@@ -1001,7 +1197,7 @@ def entry_update(  # type: ignore[return]
         if id_new == "new":
             context = {
                 "page_title": f"Create new { kebab_to_sentense(entry_type) }",
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "project_id": project_id,
                 "form": EntryUpdateForm(project_id, entry_type),
                 "entry_type": entry_type,
@@ -1018,7 +1214,7 @@ def entry_update(  # type: ignore[return]
             form_initial = project.form_initial(entry_type, int(id_new))
             context = {
                 "page_title": f"Update { kebab_to_sentense(entry_type) }",
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "project_id": project_id,
                 "form": EntryUpdateForm(
                     project_id,
@@ -1048,7 +1244,7 @@ def entry_update(  # type: ignore[return]
 
             context = {
                 "page_title": f"{ kebab_to_sentense(entry_type) } saved",
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "project_id": project_id,
                 "entry_update_outcome": entry_update_outcome,
                 "entry_type": entry_type,
@@ -1069,7 +1265,7 @@ def entry_update(  # type: ignore[return]
 
             context = {
                 "page_title": page_title,
-                "project_name": Project.objects.get(id=project_id).name,
+                "project_name": request_project(request, project_id).name,
                 "form": form,
                 "project_id": project_id,
                 "entry_type": entry_type,
@@ -1120,7 +1316,7 @@ def entry_select(
 
     context = {
         "page_title": f"Select { kebab_to_sentense(entry_type) } to edit",
-        "project_name": Project.objects.get(id=project_id).name,
+        "project_name": request_project(request, project_id).name,
         "project_id": project_id,
         "entries": entries,
         "entry_type": entry_type,
@@ -1168,7 +1364,7 @@ def std_context(project_id: int = 0) -> dict[str, Any]:
     Returns:
         dict[str,Any]: context that is comment across the different views
     """
-    project: Optional[ProjectBuilder] = None
+    metadata: dict[str, Any] = {}
     entry_templates: list[str] = []
     std_context_dict: dict[str, Any] = {}
     project_setup_step: int = 0
@@ -1177,9 +1373,10 @@ def std_context(project_id: int = 0) -> dict[str, Any]:
         raise ValueError("project_id must be an integer")
 
     if project_id > 0:
-        project = ProjectBuilder(project_id)
-        entry_templates = project.entry_template_names()
-        project_setup_step = project.configuration_get()["setup_step"]
+        # Cached for the process, see ProjectBuilder.metadata_get
+        metadata = ProjectBuilder(project_id).metadata_get()
+        entry_templates = metadata["entry_templates"]
+        project_setup_step = metadata["setup_step"]
 
     std_context_dict = {
         "entry_templates": entry_templates,
@@ -1191,104 +1388,122 @@ def std_context(project_id: int = 0) -> dict[str, Any]:
 
 def user_accessible_projects(
     request: HttpRequest,
+    search: str = "",
+    after: str = "",
+    page_size: Optional[int] = None,
 ) -> list[dict[str, Any]]:
-    """Finds all documents that the user has access to
+    """Finds the documents that the user has access to
 
-    Provides a list of all documents that the user has access to. This includes
+    Provides a list of documents that the user has access to. This includes
     documents that the user owns, documents that the user is a member of, and
-    documents that the user has access to through a project group.
+    documents that the user has access to through a project group. They are
+    ordered by when the user last accessed them, most recent first and never
+    accessed last, then by newest project. Filtering, ordering and paging are
+    all done by the database, using the ProjectAccess table.
 
     Args:
         request (HttpRequest): request from user
+        search (str): only include projects whose name starts with this.
+        after (str): the cursor of the last document of the previous page (see
+                     projects_cursor). Invalid cursors give the first page.
+        page_size (Optional[int]): the most documents to return. None returns
+                                   all of them.
 
     Returns:
-        list[None | dict[str, Any]]: a list of documents
+        list[dict[str, Any]]: a list of documents, with doc_id, project_name
+                              and doc_last_accessed.
     """
     user_id: int = (
         int(str(request.user.id)) if request.user.id is not None else 0
     )
-    documents_owner: QuerySet[Any] = Project.objects.none()
-    documents_member: QuerySet[Any] = Project.objects.none()
-    project_group: QuerySet[Any] = ProjectGroup.objects.none()
-    record: Any = {}
-    documents_combined: list[dict[str, Any]] = []
-    documents_sorted: list[dict[str, Any]] = []
-    i: int = 0
-
-    documents_owner = Project.objects.values(
-        doc_id=F("id"),
-        project_name=F("name"),
-        doc_last_accessed=F("userprojectattribute__last_accessed"),
-    ).filter(owner=user_id)
-
-    documents_member = Project.objects.values(
-        doc_id=F("id"),
-        project_name=F("name"),
-        doc_last_accessed=F("userprojectattribute__last_accessed"),
-    ).filter(member=user_id)
-
-    project_group = (
-        ProjectGroup.objects.values(
-            doc_id=F("project_access__id"),
-            project_name=F("project_access__name"),
-            doc_last_accessed=F(
-                "project_access__userprojectattribute__last_accessed"
-            ),
+    documents: QuerySet[Any] = Project.objects.none()
+    cursor: Optional[tuple[Optional[datetime], int]] = projects_cursor_parse(
+        after
+    )
+
+    documents = Project.objects.filter(
+        Exists(
+            ProjectAccess.objects.filter(
+                user_id=user_id, project_id=OuterRef("id")
+            )
         )
-        .filter(member=user_id)
-        .order_by(
-            "project_access__name",
-            "project_access__id",
+    ).annotate(
+        doc_last_accessed=Subquery(
+            UserProjectAttribute.objects.filter(
+                user_id=user_id, project_id=OuterRef("id")
+            ).values("last_accessed")[:1]
         )
-        .distinct("project_access__name")
     )
 
-    if documents_owner:
-        for record in list(documents_owner):
-            documents_combined.append(record)
+    if search:
+        documents = documents.filter(name__istartswith=search)
+
+    if cursor is not None and cursor[0] is not None:
+        documents = documents.filter(
+            Q(doc_last_accessed__lt=cursor[0])
+            | Q(doc_last_accessed=cursor[0], id__lt=cursor[1])
+            | Q(doc_last_accessed__isnull=True)
+        )
+    elif cursor is not None:
+        documents = documents.filter(
+            doc_last_accessed__isnull=True, id__lt=cursor[1]
+        )
 
-    if documents_member:
-        for record in documents_member:
-            documents_combined.append(record)
+    documents = documents.order_by(
+        F("doc_last_accessed").desc(nulls_last=True), "-id"
+    ).values("doc_last_accessed", doc_id=F("id"), project_name=F("name"))
 
-    if project_group:
-        for record in project_group:
-            documents_combined.append(record)
+    if page_size is not None:
+        documents = documents[:page_size]
+
+    return list(documents)
 
-    documents_combined = list(
-        {tuple(sorted(d.items())): d for d in documents_combined}.values()
-    )
 
-    for i in range(len(documents_combined)):
-        if documents_combined[i]["doc_last_accessed"] != None:
-            documents_combined[i]["doc_last_accessed"] = documents_combined[i][
-                "doc_last_accessed"
-            ].replace(tzinfo=None)
-
-    documents_sorted = sorted(
-        documents_combined,
-        key=lambda x: (
-            x["doc_last_accessed"] or datetime.min,
-            x["doc_id"],
-        ),
-        reverse=True,
+def projects_cursor(document: dict[str, Any]) -> str:
+    """Cursor for the page of documents after a document
+
+    Args:
+        document (dict[str, Any]): a document from user_accessible_projects.
+
+    Returns:
+        str: the cursor, for the 'after' argument of user_accessible_projects.
+    """
+    last_accessed: Optional[datetime] = document["doc_last_accessed"]
+
+    return (
+        f"{ last_accessed.isoformat() if last_accessed else '' }"
+        f"|{ document['doc_id'] }"
     )
 
-    documents_sorted = [
-        item
-        for item in documents_sorted
-        if item
-        != {
-            "doc_id": None,
-            "project_name": None,
-            "doc_last_accessed": None,
-        }
-    ]
 
-    """if documents_sorted == [{}]:
-        documents_sorted = []"""
+def projects_cursor_parse(
+    after: str,
+) -> Optional[tuple[Optional[datetime], int]]:
+    """Reads a cursor made by projects_cursor
+
+    Args:
+        after (str): the cursor.
+
+    Returns:
+        Optional[tuple[Optional[datetime], int]]: the last accessed time and
+                                                  project id, or None if the
+                                                  cursor is not valid.
+    """
+    last_accessed: str = ""
+    doc_id: str = ""
+
+    last_accessed, _, doc_id = after.partition("|")
+
+    if not doc_id.isdigit():
+        return None
+
+    if not last_accessed:
+        return None, int(doc_id)
 
-    return documents_sorted
+    try:
+        return datetime.fromisoformat(last_accessed), int(doc_id)
+    except ValueError:
+        return None
 
 
 def start_new_project_step_2_input_GUI(
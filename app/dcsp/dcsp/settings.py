@@ -170,3 +170,11 @@ EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD")
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
+
+# Processes used to extract docstrings from project code during a build. 0 or
+# 1 extracts in the build process itself.
+DOCSTRING_WORKERS = int(os.environ.get("DOCSTRING_WORKERS", "0"))
+
+# Also write brotli (.br) copies of built sites, for nginx brotli_static. Needs
+# the brotli package, and nginx built with the brotli module.
+PRECOMPRESS_BROTLI = os.environ.get("PRECOMPRESS_BROTLI", "False") == "True"
@@ -32,4 +32,10 @@ if [ $? -ne 0 ]; then
   exit 1
 fi
 
+echo "--- Stopping build worker (if running) ---\n"
+pkill -f build_worker
+
+echo "--- Restarting build worker ---\n"
+python3 manage.py build_worker &
+
 echo "--- MMR.sh successfully ran ---\n"
\ No newline at end of file